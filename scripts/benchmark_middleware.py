@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+요청당 응답 처리 오버헤드 벤치마크
+기존 구성 (JSONResponse + content-type을 덮어쓰는 http 미들웨어 + convert_objectid)과
+새 구성 (BSONJSONResponse 기본 응답 클래스, 미들웨어 없음)을
+/health 와 /api/problem/{id} 에 대해 ASGI 수준에서 비교합니다 (네트워크 제외).
+
+사용 예:
+    python benchmark_middleware.py --requests 3000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+# AI 디렉토리를 Python 경로에 추가
+AI_DIR = Path(__file__).parent
+sys.path.insert(0, str(AI_DIR))
+
+from benchmark_serialization import make_problem
+from json_response import BSONJSONResponse, bson_response, convert_objectid
+
+PROBLEM = make_problem(0, steps=10)
+
+
+def build_legacy_app():
+    """기존 main.py 구성"""
+    app = FastAPI(default_response_class=JSONResponse)
+
+    @app.middleware("http")
+    async def add_charset_middleware(request, call_next):
+        response = await call_next(request)
+        if hasattr(response, 'headers'):
+            response.headers['content-type'] = 'application/json; charset=utf-8'
+        return response
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok", "message": "Server is healthy"}
+
+    @app.get("/api/problem/{problem_id}")
+    async def get_problem(problem_id: str):
+        return {"problem": convert_objectid(PROBLEM)}
+
+    return app
+
+
+def build_current_app():
+    """새 main.py 구성"""
+    app = FastAPI(default_response_class=BSONJSONResponse)
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok", "message": "Server is healthy"}
+
+    @app.get("/api/problem/{problem_id}")
+    async def get_problem(problem_id: str):
+        return bson_response({"problem": PROBLEM})
+
+    return app
+
+
+async def measure(app, path, requests):
+    """요청당 평균 처리 시간(µs)"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # 워밍업 및 응답 헤더 확인
+        response = await client.get(path)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json; charset=utf-8"
+
+        started = time.perf_counter()
+        for _ in range(requests):
+            await client.get(path)
+        return (time.perf_counter() - started) / requests * 1_000_000
+
+
+async def run(requests):
+    legacy_app = build_legacy_app()
+    current_app = build_current_app()
+
+    print("🚀 요청당 응답 처리 오버헤드 벤치마크")
+    print("=" * 60)
+    for path in ["/health", "/api/problem/P00000"]:
+        legacy_us = await measure(legacy_app, path, requests)
+        current_us = await measure(current_app, path, requests)
+        print(f"\n📍 {path}")
+        print(f"   🐢 미들웨어 + JSONResponse: {legacy_us:.1f}µs/요청")
+        print(f"   ⚡ BSONJSONResponse (미들웨어 없음): {current_us:.1f}µs/요청")
+        print(f"   📉 절감: {legacy_us - current_us:.1f}µs/요청 ({(1 - current_us / legacy_us) * 100:.0f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="응답 처리 오버헤드 벤치마크")
+    parser.add_argument("--requests", type=int, default=3000, help="경로별 요청 수")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+문제 문서 JSON 직렬화 마이크로 벤치마크
+기존 경로 (convert_objectid → FastAPI jsonable_encoder → json.dumps)와
+새 경로 (json_response.dumps, orjson 한 번)를 content/explanation이 큰 문제 문서로 비교합니다.
+
+사용 예:
+    python benchmark_serialization.py --docs 200 --steps 40 --repeat 5
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from bson.objectid import ObjectId
+from fastapi.encoders import jsonable_encoder
+
+# AI 디렉토리를 Python 경로에 추가
+AI_DIR = Path(__file__).parent
+sys.path.insert(0, str(AI_DIR))
+
+from json_response import convert_objectid, dumps
+
+
+def make_problem(index, steps):
+    """content/explanation 블록이 중첩된 큰 문제 문서 생성"""
+    now = datetime(2025, 8, 1, 9, 0, 0)
+    return {
+        "_id": ObjectId(),
+        "problemId": f"P{index:05d}",
+        "unitId": ObjectId(),
+        "grade": 1,
+        "chapter": 2,
+        "context": {"source": "benchmark", "tags": ["정수", "유리수", "덧셈"]},
+        "cognitiveType": "이해",
+        "level": "중",
+        "diagnosticTest": True,
+        "type": "객관식",
+        "tags": ["1.5", "정수와 유리수의 덧셈, 뺄셈"],
+        "content": {
+            "korean": {
+                "stem": "다음 중 계산 결과가 가장 큰 것은? " * 5,
+                "choices": [{"id": ObjectId(), "text": f"({-i}) + ({i + 3})"} for i in range(5)],
+            },
+            "english": {
+                "stem": "Which of the following has the largest value? " * 5,
+                "choices": [{"id": ObjectId(), "text": f"({-i}) + ({i + 3})"} for i in range(5)],
+            },
+        },
+        "correctAnswer": "3",
+        "explanation": {
+            "korean": [
+                {"step": s, "text": f"{s}단계: 부호가 다른 두 수의 덧셈은 절댓값의 차에 절댓값이 큰 수의 부호를 붙입니다.",
+                 "refs": [ObjectId(), ObjectId()], "updatedAt": now + timedelta(minutes=s)}
+                for s in range(steps)
+            ],
+            "english": [
+                {"step": s, "text": f"Step {s}: subtract absolute values and keep the sign of the larger one.",
+                 "refs": [ObjectId()], "updatedAt": now + timedelta(minutes=s)}
+                for s in range(steps)
+            ],
+        },
+        "createdAt": now,
+        "updatedAt": now,
+    }
+
+
+def legacy_serialize(doc):
+    """기존 경로: convert_objectid 후 FastAPI JSONResponse와 같은 방식으로 인코딩"""
+    content = jsonable_encoder({"problem": convert_objectid(doc)})
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def orjson_serialize(doc):
+    """새 경로: BSONJSONResponse.render와 동일"""
+    return dumps({"problem": doc})
+
+
+def measure(func, docs, repeat):
+    """가장 빠른 반복의 문서당 평균 시간(ms) 반환"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for doc in docs:
+            func(doc)
+        best = min(best, time.perf_counter() - started)
+    return best / len(docs) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="문제 문서 직렬화 벤치마크")
+    parser.add_argument("--docs", type=int, default=200, help="문서 수")
+    parser.add_argument("--steps", type=int, default=40, help="explanation 단계 수 (문서 크기)")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수")
+    args = parser.parse_args()
+
+    docs = [make_problem(i, args.steps) for i in range(args.docs)]
+    size_kb = len(orjson_serialize(docs[0])) / 1024
+
+    # 두 경로의 결과가 같은지 확인
+    assert json.loads(legacy_serialize(docs[0])) == json.loads(orjson_serialize(docs[0]))
+
+    print("🚀 문제 문서 직렬화 벤치마크")
+    print("=" * 60)
+    print(f"📄 문서 {args.docs}개, 문서당 약 {size_kb:.1f}KB")
+
+    legacy_ms = measure(legacy_serialize, docs, args.repeat)
+    orjson_ms = measure(orjson_serialize, docs, args.repeat)
+
+    print(f"🐢 convert_objectid + jsonable_encoder + json.dumps: {legacy_ms:.3f}ms/문서")
+    print(f"⚡ orjson (bson_default): {orjson_ms:.3f}ms/문서")
+    print(f"📈 속도 향상: {legacy_ms / orjson_ms:.1f}배")
+
+
+if __name__ == "__main__":
+    main()
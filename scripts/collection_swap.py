@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+블루/그린 컬렉션 재적재
+새 데이터를 임시(staging) 컬렉션에 인덱스 없이 unordered insert_many로 넣고,
+인덱스를 만든 뒤 renameCollection(dropTarget=True)으로 기존 컬렉션과 한 번에 교체합니다.
+교체 전까지 읽기는 기존 컬렉션을 그대로 보므로 재적재 중에도 빈 컬렉션이 노출되지 않고,
+적재나 인덱스 생성(unique 위반 등)이 실패하면 기존 컬렉션은 그대로 남습니다.
+기존 컬렉션의 옵션($jsonSchema validator 등)과 인덱스는 임시 컬렉션에 그대로 옮겨 교체 후에도 유지합니다.
+"""
+
+import logging
+import time
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+INSERT_BATCH_SIZE = 1000
+
+# 시드 컬렉션별 (원본 파일의 배열 키, 인덱스 목록)
+SEED_COLLECTIONS: Dict[str, Dict[str, Any]] = {
+    "concepts": {
+        "key": "concepts",
+        "indexes": [("conceptId", {"unique": True}), ("unitId", {}), ("unitCode", {})],
+    },
+    "diagnostic_tests": {
+        "key": "sets",
+        "indexes": [("test.testId", {"unique": True}), ("test.userId", {}), ("problems.unitId", {})],
+    },
+    "unit_tests": {
+        "key": "units",
+        "indexes": [("code", {"unique": True}), ("problems.problemId", {}), ("problems.unitId", {})],
+    },
+}
+
+
+def staging_name(name: str) -> str:
+    return f"{name}__staging"
+
+
+def _batches(documents: Iterable[Dict[str, Any]], size: int) -> Iterable[List[Dict[str, Any]]]:
+    iterator = iter(documents)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _index_key(keys) -> Tuple:
+    """create_index 인자 / list_indexes key 문서를 같은 형태로 비교"""
+    if isinstance(keys, str):
+        return ((keys, 1),)
+    items = keys.items() if hasattr(keys, "items") else keys
+    return tuple((field, direction) for field, direction in items)
+
+
+def _target_settings(db, name: str) -> Tuple[Dict[str, Any], List[Tuple[Any, Dict[str, Any]]]]:
+    """기존 컬렉션의 (옵션, [(인덱스 키, 인덱스 옵션)]) — 없으면 빈 값"""
+    if name not in db.list_collection_names():
+        return {}, []
+    target = db[name]
+    indexes = []
+    for info in target.list_indexes():
+        if info["name"] == "_id_":
+            continue
+        options = {key: value for key, value in info.items() if key not in ("v", "key", "ns")}
+        indexes.append((list(info["key"].items()), options))
+    return dict(target.options()), indexes
+
+
+def swap_load(db, name: str, documents: Iterable[Dict[str, Any]],
+              indexes: Iterable[Tuple[Any, Dict[str, Any]]] = (), batch_size: int = INSERT_BATCH_SIZE) -> int:
+    """documents로 name 컬렉션을 원자적으로 교체하고 적재한 문서 수 반환 (실패 시 기존 컬렉션 유지)"""
+    staging = db[staging_name(name)]
+    # 이전 실행이 남긴 임시 컬렉션 정리
+    staging.drop()
+    options, target_indexes = _target_settings(db, name)
+    if options:
+        staging = db.create_collection(staging.name, **options)
+
+    started = time.time()
+    count = 0
+    try:
+        for batch in _batches(documents, batch_size):
+            count += len(staging.insert_many(batch, ordered=False).inserted_ids)
+        if count == 0:
+            raise ValueError(f"{name}: 적재할 문서가 없습니다.")
+
+        # 적재가 끝난 뒤 한 번에 인덱스 생성 (지정한 인덱스 먼저, 기존 컬렉션에만 있던 인덱스도 유지)
+        created = set()
+        for keys, index_options in list(indexes) + target_indexes:
+            if _index_key(keys) in created:
+                continue
+            staging.create_index(keys, **index_options)
+            created.add(_index_key(keys))
+
+        staging.rename(name, dropTarget=True)
+    except Exception:
+        staging.drop()
+        raise
+
+    logger.info(f"{name} 컬렉션 교체 완료: {count}개 ({time.time() - started:.2f}초)")
+    return count
+
+
+def swap_load_seed(db, name: str, documents: Iterable[Dict[str, Any]], batch_size: int = INSERT_BATCH_SIZE) -> int:
+    """SEED_COLLECTIONS에 정의된 인덱스로 시드 컬렉션 교체"""
+    return swap_load(db, name, documents, SEED_COLLECTIONS[name]["indexes"], batch_size)
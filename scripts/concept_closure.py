@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+개념 그래프 전이 폐쇄(도달 가능성) 인덱스
+모든 Concept에 대해 PRECEDES 역방향 선행 개념 집합(비트셋)과 최소 홉 수를 미리 계산하여
+메모리 매핑 가능한 파일로 저장합니다. 학습 경로 생성 시 "틀린 개념들의 선행 개념 합집합" 같은
+집합 연산을 그래프 탐색 없이 NumPy 행 OR 한 번으로 처리합니다.
+개념 그래프 스냅샷(concept_graph.py)은 내용 해시가 같은 파일이 있으면 선행 개념 조회에 이 인덱스를 사용합니다.
+
+rebuild_neo4j.py 실행 후 자동으로 생성되며, 단독으로도 실행할 수 있습니다:
+    python concept_closure.py [--output ../data/concept_closure.bin]
+
+파일 구조 (little-endian):
+    헤더      magic(4) format(u32) n(u32) row_bytes(u32) layers(u32) content_hash(16) names_len(u32)
+    이름      UTF-8 JSON 배열 (names_len 바이트, 8바이트 정렬 패딩)
+    행렬 A_k  k홉 이내 선행 개념 비트셋 (k = 1..layers)  각 n × row_bytes
+    행렬 A    전체 선행 개념 비트셋      n × row_bytes   (A[i]의 j번째 비트 = j가 i의 선행 개념)
+    행렬 D    전체 후행 개념 비트셋      n × row_bytes   (D[j]의 i번째 비트 = i가 j의 후행 개념)
+    행렬 H    최소 홉 수 (u8)            n × n           (H[i][j] = j에서 i까지 PRECEDES 홉 수, 0은 도달 불가)
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+MAGIC = b"CCLO"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sIIII16sI")
+MAX_HOPS_STORED = 255
+# k홉 이내 비트셋을 미리 저장하는 최대 k (진단 서비스의 PRECEDES*1..5 조회를 포함)
+HOP_LAYERS = 8
+DEFAULT_PATH = Path(__file__).resolve().parents[1] / "data" / "concept_closure.bin"
+
+
+def _pack_rows(matrix: np.ndarray, row_bytes: int) -> bytes:
+    """bool 행렬을 행마다 little-endian 비트셋(row_bytes 바이트)으로 압축"""
+    packed = np.packbits(matrix, axis=1, bitorder="little")
+    if packed.shape[1] < row_bytes:
+        packed = np.pad(packed, ((0, 0), (0, row_bytes - packed.shape[1])))
+    return packed.tobytes()
+
+
+def build_closure_file(snapshot, path: Path = DEFAULT_PATH, layers: int = HOP_LAYERS) -> Path:
+    """ConceptGraphSnapshot으로 전이 폐쇄 파일 생성 (임시 파일에 쓴 뒤 교체)"""
+    n = len(snapshot)
+    row_bytes = max(1, (n + 7) // 8)
+    names_blob = json.dumps(snapshot.names, ensure_ascii=False).encode("utf-8")
+    padding = (-(HEADER.size + len(names_blob))) % 8
+
+    # i마다 역방향 BFS 한 번으로 선행 개념과 최소 홉 수 계산 (H[i][j], 0은 도달 불가)
+    hops = np.zeros((n, n), dtype=np.uint8)
+    for i in range(n):
+        for j, d in snapshot._bfs([i], False, None).items():
+            hops[i, j] = min(d, MAX_HOPS_STORED)
+    reachable = hops > 0
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, n, row_bytes, layers,
+                            bytes.fromhex(snapshot.content_hash.ljust(32, "0")[:32]), len(names_blob)))
+        f.write(names_blob)
+        f.write(b"\0" * padding)
+        for k in range(1, layers + 1):
+            f.write(_pack_rows(reachable & (hops <= k), row_bytes))
+        f.write(_pack_rows(reachable, row_bytes))
+        f.write(_pack_rows(reachable.T, row_bytes))
+        f.write(hops.tobytes())
+    os.replace(tmp_path, path)
+    return path
+
+
+class ConceptClosure:
+    """메모리 매핑된 전이 폐쇄 인덱스 (행렬은 mmap 위의 NumPy 뷰)"""
+
+    def __init__(self, path: Path = DEFAULT_PATH):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, fmt, n, row_bytes, layers, content_hash, names_len = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or fmt != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"전이 폐쇄 파일 형식이 올바르지 않습니다: {self.path}")
+
+        self.n = n
+        self.row_bytes = row_bytes
+        self.layers = layers
+        self.content_hash = content_hash.hex()[:16]
+        names_start = HEADER.size
+        self.names: List[str] = json.loads(self._mm[names_start:names_start + names_len].decode("utf-8"))
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+
+        layers_at = names_start + names_len + (-(names_start + names_len)) % 8
+        matrix = n * row_bytes
+        buffer = np.frombuffer(self._mm, dtype=np.uint8)
+        self._layer_rows = buffer[layers_at:layers_at + layers * matrix].reshape(layers, n, row_bytes)
+        ancestors_at = layers_at + layers * matrix
+        self._ancestor_rows = buffer[ancestors_at:ancestors_at + matrix].reshape(n, row_bytes)
+        self._descendant_rows = buffer[ancestors_at + matrix:ancestors_at + 2 * matrix].reshape(n, row_bytes)
+        hops_at = ancestors_at + 2 * matrix
+        self._hops = buffer[hops_at:hops_at + n * n].reshape(n, n)
+
+    def close(self):
+        # mmap을 닫기 전에 NumPy 뷰를 먼저 해제
+        self._layer_rows = self._ancestor_rows = self._descendant_rows = self._hops = None
+        self._mm.close()
+        self._file.close()
+
+    def _unpack(self, rows: np.ndarray) -> np.ndarray:
+        """비트셋 행들의 OR → 길이 n bool 배열"""
+        if len(rows) == 0:
+            return np.zeros(self.n, dtype=bool)
+        merged = np.bitwise_or.reduce(rows, axis=0)
+        return np.unpackbits(merged, count=self.n, bitorder="little").astype(bool)
+
+    def _ancestor_rows_for(self, indices: List[int], max_hops: Optional[int]) -> np.ndarray:
+        """indices 행의 선행 개념 비트셋 (max_hops 이내만)"""
+        if max_hops is None:
+            return self._ancestor_rows[indices]
+        if max_hops <= 0:
+            return self._ancestor_rows[[]]
+        if max_hops <= self.layers:
+            return self._layer_rows[max_hops - 1][indices]
+        # 저장된 층보다 깊은 조회는 홉 수 행렬로 계산
+        hops = self._hops[indices]
+        return np.packbits((hops > 0) & (hops <= max_hops), axis=1, bitorder="little")
+
+    def _indices(self, names: Iterable[str]) -> List[int]:
+        return [self.index[name] for name in names if name in self.index]
+
+    def ancestor_mask(self, names: Iterable[str], max_hops: Optional[int] = None) -> np.ndarray:
+        """여러 개념의 선행 개념 합집합 (bool 배열, 행 OR 한 번)"""
+        return self._unpack(self._ancestor_rows_for(self._indices(names), max_hops))
+
+    def descendant_mask(self, names: Iterable[str]) -> np.ndarray:
+        """여러 개념의 후행 개념 합집합 (bool 배열, 행 OR 한 번)"""
+        return self._unpack(self._descendant_rows[self._indices(names)])
+
+    def mask_to_names(self, mask: np.ndarray) -> List[str]:
+        return [self.names[j] for j in np.flatnonzero(mask)]
+
+    def ancestor_hops(self, i: int, max_hops: Optional[int] = None) -> Dict[int, int]:
+        """인덱스 i의 선행 개념 인덱스 → 최소 홉 수 (ConceptGraphSnapshot._bfs 역방향 결과와 같은 형태)"""
+        row = self._hops[i]
+        selected = row > 0 if max_hops is None else (row > 0) & (row <= max_hops)
+        return {int(j): int(row[j]) for j in np.flatnonzero(selected)}
+
+    def ancestors(self, name: str, max_hops: Optional[int] = None) -> Dict[str, int]:
+        """개념 하나의 선행 개념 → 최소 홉 수"""
+        i = self.index.get(name)
+        if i is None:
+            return {}
+        return {self.names[j]: d for j, d in self.ancestor_hops(i, max_hops).items()}
+
+    def descendants(self, name: str) -> List[str]:
+        """개념 하나의 후행 개념 목록"""
+        return self.mask_to_names(self.descendant_mask([name]))
+
+    def union_ancestors(self, names: Iterable[str], max_hops: Optional[int] = None,
+                        exclude_inputs: bool = True) -> List[str]:
+        """틀린 개념들의 선행 개념 합집합 (입력 개념 자체는 기본적으로 제외)"""
+        indices = self._indices(names)
+        mask = self._unpack(self._ancestor_rows_for(indices, max_hops))
+        if exclude_inputs:
+            mask[indices] = False
+        return self.mask_to_names(mask)
+
+    def is_ancestor(self, ancestor: str, name: str) -> bool:
+        """ancestor가 name의 (전이적) 선행 개념인지"""
+        i, j = self.index.get(name), self.index.get(ancestor)
+        if i is None or j is None:
+            return False
+        return bool(self._hops[i, j] > 0)
+
+
+def load_closure(content_hash: str, path: Path = DEFAULT_PATH) -> Optional[ConceptClosure]:
+    """content_hash 그래프로 만든 전이 폐쇄 파일을 열어 반환 (파일이 없거나 다른 그래프의 것이면 None)"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    closure = ConceptClosure(path)
+    if closure.content_hash != content_hash:
+        closure.close()
+        return None
+    return closure
+
+
+def main():
+    """Neo4j에서 그래프를 읽어 전이 폐쇄 파일 생성"""
+    from dotenv import load_dotenv
+    from neo4j import GraphDatabase
+
+    parser = argparse.ArgumentParser(description="개념 그래프 전이 폐쇄 인덱스 생성")
+    parser.add_argument("--output", default=str(DEFAULT_PATH), help="출력 파일 경로")
+    args = parser.parse_args()
+
+    # AI/.env 파일 로드
+    env_path = Path(__file__).resolve().parents[1] / ".env"
+    if env_path.exists():
+        load_dotenv(env_path)
+
+    driver = GraphDatabase.driver(os.getenv("AURA_URI"), auth=(os.getenv("AURA_USER"), os.getenv("AURA_PASS")))
+    try:
+        build_closure_from_driver(driver, Path(args.output))
+    finally:
+        driver.close()
+
+
+def build_closure_from_driver(driver, path: Path = DEFAULT_PATH) -> Path:
+    """Neo4j 드라이버로 그래프를 읽어 전이 폐쇄 파일 생성 (rebuild_neo4j.py에서 호출)"""
+    try:
+        from .concept_graph import ConceptGraphSnapshot
+    except ImportError:
+        from concept_graph import ConceptGraphSnapshot
+
+    print("🧮 전이 폐쇄 인덱스 생성 중...")
+
+    def run_cypher(query, params=None):
+        with driver.session() as session:
+            return [record.data() for record in session.run(query, params or {})]
+
+    snapshot = ConceptGraphSnapshot.from_run_cypher(run_cypher)
+    path = build_closure_file(snapshot, path)
+    print(f"✅ 전이 폐쇄 인덱스 저장 완료: {path} (개념 {len(snapshot)}개, {path.stat().st_size / 1024:.1f}KB)")
+    return path
+
+
+if __name__ == "__main__":
+    main()
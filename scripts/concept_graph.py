@@ -0,0 +1,316 @@
+"""
+Concept/PRECEDES 그래프 메모리 스냅샷
+run_cypher로 전체 Concept 노드와 PRECEDES 관계를 한 번 읽어 정수 인덱스 기반 CSR 인접 배열로 보관하고,
+다단계 선행/후행 개념 조회를 Neo4j 왕복 없이 프로세스 안에서 처리합니다.
+
+방향 규칙 (Neo4j 관계 방향 그대로):
+- successors / descendants: (c)-[:PRECEDES]->(x) 방향으로 따라간 개념
+  예) descendants(name, 5) == MATCH (current {concept: name})-[:PRECEDES*1..5]->(x)
+- predecessors / ancestors: (x)-[:PRECEDES]->(c) 방향으로 거슬러 올라간 개념
+
+동기화 스크립트가 올리는 그래프 버전 스탬프(:GraphMeta)를 주기적으로 확인해 바뀌면 다시 읽고,
+다시 읽을 때는 run_cypher 결과 캐시를 거치지 않습니다 (캐시 TTL만큼 이전 그래프가 남지 않도록).
+내용 해시가 같은 전이 폐쇄 파일(concept_closure.py)이 있으면 선행 개념 조회는 BFS 대신 그 인덱스를 사용합니다.
+"""
+
+import hashlib
+import inspect
+import threading
+import time
+from array import array
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# main.py는 패키지(from .concept_graph)로, 동기화 스크립트/테스트는 scripts 경로에서 바로 불러옴
+try:
+    from .concept_closure import DEFAULT_PATH as DEFAULT_CLOSURE_PATH
+    from .concept_closure import load_closure
+    from .neo4j_client import GRAPH_META_KEY, GRAPH_VERSION_QUERY
+except ImportError:
+    from concept_closure import DEFAULT_PATH as DEFAULT_CLOSURE_PATH
+    from concept_closure import load_closure
+    from neo4j_client import GRAPH_META_KEY, GRAPH_VERSION_QUERY
+
+NODES_QUERY = """
+    MATCH (c:Concept)
+    RETURN c.concept as concept, c.unit as unit, c.grade as grade
+"""
+
+EDGES_QUERY = """
+    MATCH (a:Concept)-[:PRECEDES]->(b:Concept)
+    RETURN a.concept as source, b.concept as target
+"""
+
+
+def _accepts_use_cache(run_cypher: Callable) -> bool:
+    """run_cypher가 use_cache 인자를 받는지 (neo4j_client.run_cypher는 받고, 일반 run_cypher(query, params)는 받지 않음)"""
+    try:
+        parameters = inspect.signature(run_cypher).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(p.name == "use_cache" or p.kind == p.VAR_KEYWORD for p in parameters)
+
+
+def _build_csr(n: int, pairs: List[Tuple[int, int]]) -> Tuple[array, array]:
+    """(from, to) 쌍 목록으로 CSR 오프셋/대상 배열 생성"""
+    counts = [0] * (n + 1)
+    for src, _ in pairs:
+        counts[src + 1] += 1
+    for i in range(n):
+        counts[i + 1] += counts[i]
+    offsets = array('i', counts)
+    targets = array('i', [0] * len(pairs))
+    cursor = list(counts[:n])
+    for src, dst in sorted(pairs):
+        targets[cursor[src]] = dst
+        cursor[src] += 1
+    return offsets, targets
+
+
+class ConceptGraphSnapshot:
+    """불변 그래프 스냅샷 (정수 인덱스 + CSR 인접 배열)"""
+
+    def __init__(self, nodes: List[Dict[str, Any]], edges: Iterable[Tuple[str, str]], version: int = 1,
+                 graph_version: Any = None):
+        self.names: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.units: List[Optional[str]] = []
+        self.grades: List[Any] = []
+        for node in sorted(nodes, key=lambda n: n.get("concept") or ""):
+            name = node.get("concept")
+            if not name or name in self.index:
+                continue
+            self.index[name] = len(self.names)
+            self.names.append(name)
+            self.units.append(node.get("unit"))
+            self.grades.append(node.get("grade"))
+
+        pairs = sorted({
+            (self.index[src], self.index[dst])
+            for src, dst in edges
+            if src in self.index and dst in self.index
+        })
+        n = len(self.names)
+        self.out_offsets, self.out_targets = _build_csr(n, pairs)
+        self.in_offsets, self.in_sources = _build_csr(n, [(dst, src) for src, dst in pairs])
+        self.edge_count = len(pairs)
+
+        # 그래프 내용 해시 (변경 감지용)
+        digest = hashlib.sha256()
+        for i, name in enumerate(self.names):
+            digest.update(f"{name}\x1f{self.units[i]}\x1f{self.grades[i]}\x1e".encode("utf-8"))
+        for src, dst in pairs:
+            digest.update(f"{src},{dst};".encode("ascii"))
+        self.content_hash = digest.hexdigest()[:16]
+        self.version = version
+        # 읽을 당시의 :GraphMeta 버전 스탬프
+        self.graph_version = graph_version
+        # 같은 그래프로 만든 전이 폐쇄 인덱스 (ConceptGraphStore가 연결, 없으면 BFS)
+        self.closure = None
+        self.loaded_at = time.time()
+
+    @classmethod
+    def from_run_cypher(cls, run_cypher: Callable, version: int = 1,
+                        graph_version: Any = None) -> "ConceptGraphSnapshot":
+        """run_cypher로 전체 그래프를 두 번의 쿼리로 읽어 스냅샷 생성"""
+        nodes = run_cypher(NODES_QUERY) or []
+        edges = run_cypher(EDGES_QUERY) or []
+        return cls(nodes, [(e.get("source"), e.get("target")) for e in edges], version, graph_version)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def node(self, name: str) -> Optional[Dict[str, Any]]:
+        """개념 속성 (run_cypher 결과와 같은 형태)"""
+        i = self.index.get(name)
+        if i is None:
+            return None
+        return {"concept": self.names[i], "unit": self.units[i], "grade": self.grades[i]}
+
+    def _neighbors(self, i: int, outgoing: bool) -> array:
+        if outgoing:
+            return self.out_targets[self.out_offsets[i]:self.out_offsets[i + 1]]
+        return self.in_sources[self.in_offsets[i]:self.in_offsets[i + 1]]
+
+    def _bfs(self, starts: Iterable[int], outgoing: bool, max_hops: Optional[int]) -> Dict[int, int]:
+        """시작 노드들에서 최대 max_hops까지 도달한 노드 → 최소 홉 수"""
+        hops: Dict[int, int] = {}
+        seen = bytearray(len(self.names))
+        queue = deque()
+        for start in starts:
+            seen[start] = 1
+            queue.append((start, 0))
+        while queue:
+            i, depth = queue.popleft()
+            if max_hops is not None and depth >= max_hops:
+                continue
+            for j in self._neighbors(i, outgoing):
+                if not seen[j]:
+                    seen[j] = 1
+                    hops[j] = depth + 1
+                    queue.append((j, depth + 1))
+        return hops
+
+    def _ancestor_hops(self, i: int, max_hops: Optional[int]) -> Dict[int, int]:
+        """i의 선행 개념 → 최소 홉 수 (전이 폐쇄 인덱스가 있으면 그 행을 그대로 사용)"""
+        if self.closure is not None:
+            return self.closure.ancestor_hops(i, max_hops)
+        return self._bfs([i], False, max_hops)
+
+    def successors(self, name: str) -> List[str]:
+        """(name)-[:PRECEDES]->(x) 인 개념들"""
+        i = self.index.get(name)
+        return [] if i is None else [self.names[j] for j in self._neighbors(i, True)]
+
+    def predecessors(self, name: str) -> List[str]:
+        """(x)-[:PRECEDES]->(name) 인 개념들"""
+        i = self.index.get(name)
+        return [] if i is None else [self.names[j] for j in self._neighbors(i, False)]
+
+    def descendants(self, name: str, max_hops: Optional[int] = 5) -> Dict[str, int]:
+        """PRECEDES 방향으로 max_hops 이내에 도달하는 개념 → 최소 홉 수"""
+        i = self.index.get(name)
+        if i is None:
+            return {}
+        return {self.names[j]: d for j, d in self._bfs([i], True, max_hops).items()}
+
+    def ancestors(self, name: str, max_hops: Optional[int] = 5) -> Dict[str, int]:
+        """PRECEDES 역방향으로 max_hops 이내에 도달하는 개념 → 최소 홉 수"""
+        i = self.index.get(name)
+        if i is None:
+            return {}
+        return {self.names[j]: d for j, d in self._ancestor_hops(i, max_hops).items()}
+
+    def _node_list(self, indices: Iterable[int]) -> List[Dict[str, Any]]:
+        nodes = [self.node(self.names[j]) for j in indices]
+        return sorted(nodes, key=lambda n: (n["unit"] or "", n["concept"]))
+
+    def relations(self, names: Iterable[str], max_hops: Optional[int] = 5) -> Dict[str, Dict[str, Any]]:
+        """여러 개념의 직전 선행/직후 후행/k홉 선행 개념을 한 번에 조회 (없는 개념은 제외)"""
+        result: Dict[str, Dict[str, Any]] = {}
+        for name in dict.fromkeys(names):
+            i = self.index.get(name)
+            if i is None:
+                continue
+            ancestors = [
+                {**self.node(self.names[j]), "hops": d}
+                for j, d in self._ancestor_hops(i, max_hops).items()
+            ]
+            ancestors.sort(key=lambda n: (n["hops"], n["concept"]))
+            result[name] = {
+                **self.node(name),
+                "predecessors": self._node_list(self._neighbors(i, False)),
+                "successors": self._node_list(self._neighbors(i, True)),
+                "ancestors": ancestors,
+            }
+        return result
+
+
+class ConceptGraphStore:
+    """현재 스냅샷을 보관하고 주기적으로 다시 읽어 그래프가 바뀌었을 때만 버전을 올림
+    refresh_interval마다 전체를 다시 읽고, 그 사이에는 version_check_interval마다 버전 스탬프만 확인"""
+
+    def __init__(self, run_cypher: Optional[Callable] = None, refresh_interval: float = 300.0,
+                 version_check_interval: float = 30.0, closure_path=DEFAULT_CLOSURE_PATH):
+        self.run_cypher = run_cypher
+        self.closure_path = closure_path
+        self.refresh_interval = refresh_interval
+        self.version_check_interval = version_check_interval
+        self._snapshot: Optional[ConceptGraphSnapshot] = None
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._version_checked_at = 0.0
+        self._stale = True
+
+    def _read(self, query: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """결과 캐시를 거치지 않는 읽기 (캐시가 없는 일반 run_cypher는 그대로 호출)"""
+        if _accepts_use_cache(self.run_cypher):
+            return self.run_cypher(query, params, use_cache=False)
+        return self.run_cypher(query, params)
+
+    def _graph_version(self) -> Any:
+        """현재 :GraphMeta 버전 스탬프 (없으면 None)"""
+        rows = self._read(GRAPH_VERSION_QUERY, {"key": GRAPH_META_KEY})
+        return rows[0].get("version") if rows else None
+
+    @property
+    def version(self) -> int:
+        """현재 그래프 버전 (스냅샷이 없으면 0)"""
+        return self._snapshot.version if self._snapshot is not None else 0
+
+    def reload(self) -> ConceptGraphSnapshot:
+        """그래프를 다시 읽고 내용이 바뀐 경우에만 새 버전으로 교체"""
+        with self._lock:
+            current = self._snapshot
+            next_version = current.version + 1 if current is not None else 1
+            # 스탬프를 먼저 읽어 두면 읽는 도중 동기화가 끝나도 다음 확인에서 다시 읽힘
+            graph_version = self._graph_version()
+            snapshot = ConceptGraphSnapshot.from_run_cypher(self._read, next_version, graph_version)
+            if current is None or snapshot.content_hash != current.content_hash:
+                self._attach_closure(snapshot)
+                self._snapshot = snapshot
+                print(f"✅ 개념 그래프 스냅샷 v{snapshot.version}: 노드 {len(snapshot)}개, 관계 {snapshot.edge_count}개")
+            else:
+                current.graph_version = graph_version
+                # 버전 스탬프를 올린 뒤에 전이 폐쇄 파일이 만들어지므로 아직 없으면 다시 시도
+                if current.closure is None:
+                    self._attach_closure(current)
+            self._checked_at = self._version_checked_at = time.monotonic()
+            self._stale = False
+            return self._snapshot
+
+    def _attach_closure(self, snapshot: ConceptGraphSnapshot):
+        """같은 내용 해시로 만든 전이 폐쇄 파일이 있으면 스냅샷에 연결"""
+        if self.closure_path is None:
+            return
+        try:
+            snapshot.closure = load_closure(snapshot.content_hash, self.closure_path)
+        except Exception as e:
+            print(f"⚠️ 전이 폐쇄 인덱스 로드 실패, BFS 사용: {e}")
+
+    def _needs_reload(self, snapshot: Optional[ConceptGraphSnapshot]) -> bool:
+        """스냅샷이 없거나, 무효화됐거나, refresh_interval이 지났거나, 버전 스탬프가 바뀌었으면 True"""
+        now = time.monotonic()
+        if snapshot is None or self._stale or now - self._checked_at >= self.refresh_interval:
+            return True
+        if now - self._version_checked_at < self.version_check_interval:
+            return False
+        self._version_checked_at = now
+        try:
+            return self._graph_version() != snapshot.graph_version
+        except Exception as e:
+            print(f"⚠️ 개념 그래프 버전 확인 실패: {e}")
+            return False
+
+    def get(self) -> ConceptGraphSnapshot:
+        """현재 스냅샷 (필요하면 다시 읽음)"""
+        snapshot = self._snapshot
+        if self._needs_reload(snapshot):
+            try:
+                return self.reload()
+            except Exception as e:
+                if snapshot is None:
+                    raise
+                # 재로드 실패 시 기존 스냅샷 계속 사용
+                print(f"⚠️ 개념 그래프 재로드 실패, 기존 스냅샷 사용: {e}")
+                self._checked_at = self._version_checked_at = time.monotonic()
+                self._stale = False
+        return self._snapshot
+
+    def invalidate(self):
+        """다음 get() 호출 시 다시 읽도록 표시 (그래프 재구축/동기화 후 호출)"""
+        self._stale = True
+
+
+_store: Optional[ConceptGraphStore] = None
+
+
+def get_concept_graph(run_cypher: Callable) -> ConceptGraphSnapshot:
+    """프로세스 공용 그래프 스냅샷 반환 (학습 경로 서비스에서 run_cypher를 넘겨 사용)"""
+    global _store
+    if _store is None:
+        _store = ConceptGraphStore(run_cypher)
+    return _store.get()
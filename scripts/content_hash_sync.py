@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+내용 해시 기반 멱등 재적재
+문서마다 안정적인 내용 해시(contentHash)를 저장해 두고, 다시 적재할 때
+키와 해시만 읽는 projection 쿼리 한 번으로 비교하여 새 문서와 바뀐 문서만 씁니다.
+원본이 그대로면 쓰기가 전혀 없으므로 야간 재동기화가 빠르고 oplog가 늘지 않으며,
+기존 문서의 _id가 유지되어 다른 컬렉션의 참조(answer_attempt.unitid 등)도 깨지지 않습니다.
+바뀐 문서는 통째로 교체하므로 원본에서 빠진 필드도 함께 사라지고, _id와 최초 생성 시각(createdAt)은 유지됩니다.
+"""
+
+import hashlib
+import json
+import time
+from datetime import date, datetime, timezone
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+HASH_FIELD = "contentHash"
+# 새로 쓰거나 바뀐 문서에만 찍는 동기화 시각 (내용 해시에는 포함하지 않음, 파생 인덱스의 변경 감지용)
+SYNCED_FIELD = "syncedAt"
+SYNC_BATCH_SIZE = 1000
+# 교체할 때 기존 문서 값을 그대로 두는 필드
+PRESERVED_FIELDS = ("createdAt",)
+# 리포트에 남길 최대 오류 메시지 수
+MAX_REPORTED_ERRORS = 5
+
+
+def _json_default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def content_hash(doc: Dict[str, Any], exclude: Iterable[str] = ("_id", HASH_FIELD, SYNCED_FIELD)) -> str:
+    """키 순서와 무관한 문서 내용 해시 (_id, 해시 필드, 동기화 시각은 제외)"""
+    excluded = set(exclude)
+    body = {k: v for k, v in doc.items() if k not in excluded}
+    canonical = json.dumps(body, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=_json_default)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def with_content_hash(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """해시 필드를 채운 문서 (같은 dict를 수정해서 반환)"""
+    doc[HASH_FIELD] = content_hash(doc)
+    return doc
+
+
+def plan_sync(docs: Iterable[Dict[str, Any]], existing: Dict[Any, Optional[str]], key: str) -> Dict[str, Any]:
+    """원본 문서와 기존 {키: 해시}를 비교해 추가/변경/유지/삭제 대상 분류 (입력 내 중복 키는 마지막 문서 사용)"""
+    latest: Dict[Any, Dict[str, Any]] = {}
+    for doc in docs:
+        latest[doc[key]] = with_content_hash(doc)
+    inserts, updates, unchanged = [], [], 0
+    for doc_key, doc in latest.items():
+        if doc_key not in existing:
+            inserts.append(doc)
+        elif existing[doc_key] != doc[HASH_FIELD]:
+            updates.append(doc)
+        else:
+            unchanged += 1
+    removed = [doc_key for doc_key in existing if doc_key not in latest]
+    return {"inserts": inserts, "updates": updates, "unchanged": unchanged, "removed": removed}
+
+
+def _batches(items: List[Any], size: int) -> Iterable[List[Any]]:
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def sync_by_hash(collection, docs: Iterable[Dict[str, Any]], key: str, delete_missing: bool = False,
+                 batch_size: int = SYNC_BATCH_SIZE, make_op: Optional[Callable] = None) -> Dict[str, Any]:
+    """새 문서/바뀐 문서만 bulk_write (delete_missing=True면 원본에 없는 문서 삭제)
+    일부 쓰기가 실패해도 나머지 배치를 계속 쓰고, 실패 건수는 리포트의 failed/errors로 돌려줌"""
+    if make_op is None:
+        from pymongo import DeleteMany, InsertOne, ReplaceOne
+
+        def make_op(kind, doc_key, doc):
+            if kind == "insert":
+                return InsertOne(doc)
+            if kind == "update":
+                return ReplaceOne({key: doc_key}, {k: v for k, v in doc.items() if k != "_id"})
+            return DeleteMany({key: {"$in": doc_key}})
+
+    started = time.time()
+    # 키와 해시(+ 유지할 필드)만 읽는 projection 쿼리 한 번
+    projection = {"_id": 0, key: 1, HASH_FIELD: 1, **{field: 1 for field in PRESERVED_FIELDS}}
+    existing, preserved = {}, {}
+    for row in collection.find({}, projection):
+        if key not in row:
+            continue
+        existing[row[key]] = row.get(HASH_FIELD)
+        preserved[row[key]] = {field: row[field] for field in PRESERVED_FIELDS if field in row}
+    plan = plan_sync(docs, existing, key)
+    synced_at = datetime.now(timezone.utc)
+    for doc in plan["inserts"] + plan["updates"]:
+        doc[SYNCED_FIELD] = synced_at
+    for doc in plan["updates"]:
+        doc.update(preserved.get(doc[key], {}))
+
+    # (종류, 문서 수, 연산)
+    ops = [("insert", 1, make_op("insert", doc[key], doc)) for doc in plan["inserts"]]
+    ops += [("update", 1, make_op("update", doc[key], doc)) for doc in plan["updates"]]
+    if delete_missing and plan["removed"]:
+        ops += [("delete", len(batch), make_op("delete", batch, None)) for batch in _batches(plan["removed"], batch_size)]
+
+    failed = {"insert": 0, "update": 0, "delete": 0}
+    errors: List[str] = []
+    batches = list(_batches(ops, batch_size))
+    for position, batch in enumerate(batches):
+        try:
+            collection.bulk_write([op for _, _, op in batch], ordered=False)
+        except Exception as e:
+            details = getattr(e, "details", None)
+            if details is None:
+                # 배치 단위 오류가 아니면 (연결 끊김 등) 남은 배치도 쓰지 않고 중단
+                for kind, size, _ in (item for rest in batches[position:] for item in rest):
+                    failed[kind] += size
+                errors.append(str(e))
+                break
+            for error in details.get("writeErrors", []):
+                kind, size, _ = batch[error["index"]]
+                failed[kind] += size
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append(error.get("errmsg", str(error)))
+
+    deleted = len(plan["removed"]) if delete_missing else 0
+    return {
+        "inserted": len(plan["inserts"]) - failed["insert"],
+        "updated": len(plan["updates"]) - failed["update"],
+        "unchanged": plan["unchanged"],
+        "deleted": deleted - failed["delete"],
+        "stale": 0 if delete_missing else len(plan["removed"]),
+        "failed": sum(failed.values()),
+        "errors": errors,
+        "writes": len(ops),
+        "seconds": round(time.time() - started, 3),
+    }
+
+
+def print_sync_report(report: Dict[str, Any], label: str = ""):
+    print(f"\n📊 {label} 해시 비교 동기화 완료 ({report['seconds']}초)")
+    print(f"  ➕ 추가: {report['inserted']}개, 🔄 변경: {report['updated']}개, ⏭️ 변경 없음: {report['unchanged']}개")
+    if report["deleted"]:
+        print(f"  🗑️ 원본에 없어 삭제: {report['deleted']}개")
+    if report["stale"]:
+        print(f"  ⚠️ 원본에 없는 기존 문서 (유지): {report['stale']}개")
+    if report["failed"]:
+        print(f"  ❌ 쓰기 실패: {report['failed']}개 (다시 실행하면 실패한 문서만 재시도)")
+        for error in report["errors"]:
+            print(f"     - {error}")
+    if not report["writes"]:
+        print("  ✅ 원본 변경 없음 — 쓰기 없이 종료")
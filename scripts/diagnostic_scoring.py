@@ -0,0 +1,171 @@
+"""
+진단 채점 벡터화 엔진
+답안 목록을 (정답 여부, 소요 시간, 단원 인덱스, 개념 인덱스, 난이도, 제출 인덱스) 배열로 바꿔
+단원/개념별 정답률, 소요 시간 백분위, conceptErrorRates, unitLevels, 학습자 클래스를
+답안 수와 관계없이 몇 번의 NumPy 연산으로 계산합니다. 제출 하나와 수천 개를 같은 경로로 처리합니다.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# 정답률(%) 기준 수준 (전체 수준과 단원별 unitLevels에 공통 적용, accuracyRate와 같은 % 단위)
+LEVEL_THRESHOLDS = (80.0, 50.0)
+LEVEL_LABELS = ("상", "중", "하")
+
+# 학습자 클래스 규칙 (정답률 %, 평균 소요 시간) — DiagnosticService._determine_learner_class와 일괄 채점이 함께 쓰는 표
+# (최소 정답률 %, 최대 평균 소요 시간(초), 클래스), 위에서부터 처음 맞는 규칙 적용
+LEARNER_CLASS_RULES = (
+    (80.0, 90.0, "심화형"),
+    (80.0, np.inf, "안정형"),
+    (50.0, np.inf, "성장형"),
+)
+DEFAULT_LEARNER_CLASS = "기초형"
+
+# 오답으로 볼 단원 정답률(%) 상한
+WRONG_UNIT_ACCURACY = 60.0
+
+
+def determine_learner_class(accuracy_rate: float, avg_time: float) -> str:
+    """제출 하나의 학습자 클래스 (accuracy_rate는 % 단위, learner_classes의 단건 버전)"""
+    for min_accuracy, max_time, label in LEARNER_CLASS_RULES:
+        if accuracy_rate >= min_accuracy and avg_time <= max_time:
+            return label
+    return DEFAULT_LEARNER_CLASS
+
+
+class AnswerMatrix:
+    """여러 제출의 답안을 이어 붙인 열 배열과 단원/개념 이름 목록"""
+
+    def __init__(self, correct, duration, unit_idx, concept_idx, difficulty, submission_idx,
+                 units: List[str], concepts: List[str], submission_count: int):
+        self.correct = np.asarray(correct, dtype=bool)
+        self.duration = np.asarray(duration, dtype=np.float64)
+        self.unit_idx = np.asarray(unit_idx, dtype=np.int32)
+        self.concept_idx = np.asarray(concept_idx, dtype=np.int32)
+        self.difficulty = np.asarray(difficulty, dtype=np.float64)
+        self.submission_idx = np.asarray(submission_idx, dtype=np.int32)
+        self.units = units
+        self.concepts = concepts
+        self.submission_count = submission_count
+
+    @classmethod
+    def from_submissions(cls, submissions: Sequence[Dict[str, Any]],
+                         resolve: Optional[Callable[[str], Dict[str, Any]]] = None) -> "AnswerMatrix":
+        """제출 목록을 배열로 변환 (resolve(problemId) → {"unitTitle", "concept"}, 없으면 답안의 unit/concept 사용)"""
+        units: Dict[str, int] = {}
+        concepts: Dict[str, int] = {}
+        correct, duration, unit_idx, concept_idx, difficulty, submission_idx = [], [], [], [], [], []
+        for i, submission in enumerate(submissions):
+            for answer in submission.get("answers") or []:
+                info = resolve(str(answer.get("problemId"))) if resolve else answer
+                unit = info.get("unitTitle") or info.get("unit")
+                concept = info.get("concept")
+                correct.append(bool(answer.get("isCorrect")))
+                duration.append(float(answer.get("durationSeconds") or 0.0))
+                unit_idx.append(units.setdefault(unit, len(units)) if unit else -1)
+                concept_idx.append(concepts.setdefault(concept, len(concepts)) if concept else -1)
+                difficulty.append(float(answer.get("level") or info.get("level") or 0.0))
+                submission_idx.append(i)
+        return cls(correct, duration, unit_idx, concept_idx, difficulty, submission_idx,
+                   list(units), list(concepts), len(submissions))
+
+
+def group_quantile(groups: np.ndarray, values: np.ndarray, q: float, group_count: int) -> np.ndarray:
+    """그룹별 q 분위수 (선형 보간, 값이 없는 그룹은 nan) — 정렬 한 번으로 계산"""
+    order = np.lexsort((values, groups))
+    sorted_values = values[order]
+    counts = np.bincount(groups, minlength=group_count)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    result = np.full(group_count, np.nan)
+    has = counts > 0
+    position = starts[has] + q * (counts[has] - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.ceil(position).astype(np.int64)
+    weight = position - lower
+    result[has] = sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+    return result
+
+
+def level_labels(accuracy: np.ndarray) -> np.ndarray:
+    high, middle = LEVEL_THRESHOLDS
+    return np.select([accuracy >= high, accuracy >= middle], LEVEL_LABELS[:2], LEVEL_LABELS[2])
+
+
+def learner_classes(accuracy: np.ndarray, avg_time: np.ndarray,
+                    rule: Optional[Callable[[float, float], str]] = None) -> np.ndarray:
+    """제출별 학습자 클래스 (accuracy는 % 단위, rule이 있으면 제출마다 호출, 없으면 LEARNER_CLASS_RULES 벡터 연산)"""
+    if rule is not None:
+        return np.array([rule(float(acc), float(seconds)) for acc, seconds in zip(accuracy, avg_time)], dtype=object)
+    conditions = [(accuracy >= min_acc) & (avg_time <= max_time) for min_acc, max_time, _ in LEARNER_CLASS_RULES]
+    return np.select(conditions, [label for _, _, label in LEARNER_CLASS_RULES], DEFAULT_LEARNER_CLASS)
+
+
+def _pair_stats(submission_idx: np.ndarray, key_idx: np.ndarray, correct: np.ndarray, key_count: int):
+    """(제출, 단원/개념) 쌍별 답안 수와 정답 수 (등장한 쌍만)"""
+    valid = key_idx >= 0
+    pair = submission_idx[valid].astype(np.int64) * max(key_count, 1) + key_idx[valid]
+    pairs, inverse = np.unique(pair, return_inverse=True)
+    totals = np.bincount(inverse, minlength=len(pairs))
+    corrects = np.bincount(inverse, weights=correct[valid], minlength=len(pairs))
+    return pairs // max(key_count, 1), pairs % max(key_count, 1), totals, corrects
+
+
+def score(matrix: AnswerMatrix, learner_class: Optional[Callable[[float, float], str]] = None) -> List[Dict[str, Any]]:
+    """제출별 채점 결과 (입력 제출 순서, learner_class 미지정 시 LEARNER_CLASS_RULES)"""
+    n = matrix.submission_count
+    sub = matrix.submission_idx
+    totals = np.bincount(sub, minlength=n)
+    corrects = np.bincount(sub, weights=matrix.correct, minlength=n)
+    time_sums = np.bincount(sub, weights=matrix.duration, minlength=n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        accuracy = np.where(totals > 0, corrects / totals * 100, 0.0)
+        avg_time = np.where(totals > 0, time_sums / totals, 0.0)
+        difficulty = np.where(totals > 0, np.bincount(sub, weights=matrix.difficulty, minlength=n) / totals, 0.0)
+    p50 = group_quantile(sub, matrix.duration, 0.5, n)
+    p90 = group_quantile(sub, matrix.duration, 0.9, n)
+    classes = learner_classes(accuracy, avg_time, learner_class)
+    overall = level_labels(accuracy)
+
+    results = [{
+        "totalProblems": int(totals[i]),
+        "correctCount": int(corrects[i]),
+        "accuracyRate": round(float(accuracy[i]), 2),
+        "avgTime": round(float(avg_time[i]), 2),
+        "timeP50": None if np.isnan(p50[i]) else round(float(p50[i]), 2),
+        "timeP90": None if np.isnan(p90[i]) else round(float(p90[i]), 2),
+        "avgDifficulty": round(float(difficulty[i]), 2),
+        "overallLevel": str(overall[i]),
+        "class": str(classes[i]),
+        "conceptErrorRates": {},
+        "unitLevels": {},
+        "wrongUnits": [],
+    } for i in range(n)]
+
+    # 제출 × 개념 오답률
+    subs, keys, pair_totals, pair_corrects = _pair_stats(sub, matrix.concept_idx, matrix.correct, len(matrix.concepts))
+    error_rates = np.round(1 - pair_corrects / pair_totals, 4)
+    for s, k, rate in zip(subs.tolist(), keys.tolist(), error_rates.tolist()):
+        results[s]["conceptErrorRates"][matrix.concepts[k]] = rate
+
+    # 제출 × 단원 수준 및 오답 단원
+    subs, keys, pair_totals, pair_corrects = _pair_stats(sub, matrix.unit_idx, matrix.correct, len(matrix.units))
+    unit_accuracy = pair_corrects / pair_totals * 100
+    unit_levels = level_labels(unit_accuracy)
+    wrong = unit_accuracy < WRONG_UNIT_ACCURACY
+    for s, k, level, acc, is_wrong in zip(subs.tolist(), keys.tolist(), unit_levels.tolist(),
+                                          unit_accuracy.tolist(), wrong.tolist()):
+        results[s]["unitLevels"][matrix.units[k]] = level
+        if is_wrong:
+            results[s]["wrongUnits"].append((acc, matrix.units[k]))
+    # 오답 단원은 정답률이 낮은 순서
+    for result in results:
+        result["wrongUnits"] = [unit for _, unit in sorted(result["wrongUnits"])]
+    return results
+
+
+def score_submissions(submissions: Iterable[Dict[str, Any]],
+                      resolve: Optional[Callable[[str], Dict[str, Any]]] = None,
+                      learner_class: Optional[Callable[[float, float], str]] = None) -> List[Dict[str, Any]]:
+    """제출 목록 채점 (단건/일괄 공용)"""
+    return score(AnswerMatrix.from_submissions(list(submissions), resolve), learner_class)
@@ -10,6 +10,8 @@ import os
 from datetime import datetime
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure, BulkWriteError
+from collection_swap import swap_load_seed
+from json_stream import iter_seed_items
 import logging
 from dotenv import load_dotenv
 
@@ -76,39 +78,14 @@ class DirectMongoDBLoader:
         try:
             logger.info(f"개념 데이터 로드 시작: {file_path}")
             
-            with open(file_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-            
-            if 'concepts' not in data:
-                raise ValueError("개념 데이터에 'concepts' 키가 없습니다.")
-            
-            collection = self.db.concepts
-            
-            # 기존 인덱스 삭제
-            try:
-                collection.drop_indexes()
-                logger.info("기존 개념 컬렉션 인덱스 삭제 완료")
-            except Exception as e:
-                logger.warning(f"인덱스 삭제 중 경고: {e}")
-            
-            # 기존 데이터 삭제
-            collection.delete_many({})
-            logger.info("기존 개념 데이터 삭제 완료")
-            
-            # 새 데이터 삽입
-            result = collection.insert_many(data['concepts'])
-            logger.info(f"개념 데이터 저장 완료: {len(result.inserted_ids)}개")
-            
-            # 새 인덱스 생성
-            collection.create_index("conceptId", unique=True)
-            collection.create_index("unitId")
-            collection.create_index("unitCode")
-            logger.info("개념 컬렉션 새 인덱스 생성 완료")
+            with open(file_path, 'rb') as file:
+                inserted_count = swap_load_seed(self.db, "concepts", iter_seed_items(file, "concepts"))
+            logger.info(f"개념 데이터 저장 완료: {inserted_count}개")
             
             return {
                 "success": True,
-                "message": f"개념 데이터 저장 완료: {len(result.inserted_ids)}개",
-                "count": len(result.inserted_ids)
+                "message": f"개념 데이터 저장 완료: {inserted_count}개",
+                "count": inserted_count
             }
             
         except Exception as e:
@@ -124,31 +101,14 @@ class DirectMongoDBLoader:
         try:
             logger.info(f"진단테스트 데이터 로드 시작: {file_path}")
             
-            with open(file_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-            
-            if 'sets' not in data:
-                raise ValueError("진단테스트 데이터에 'sets' 키가 없습니다.")
-            
-            collection = self.db.diagnostic_tests
-            # 기존 데이터 삭제
-            collection.delete_many({})
-            logger.info("기존 진단테스트 데이터 삭제 완료")
-            
-            # 새 데이터 삽입
-            result = collection.insert_many(data['sets'])
-            logger.info(f"진단테스트 데이터 저장 완료: {len(result.inserted_ids)}개")
-            
-            # 인덱스 생성
-            collection.create_index("test.testId", unique=True)
-            collection.create_index("test.userId")
-            collection.create_index("problems.unitId")
-            logger.info("진단테스트 컬렉션 인덱스 생성 완료")
+            with open(file_path, 'rb') as file:
+                inserted_count = swap_load_seed(self.db, "diagnostic_tests", iter_seed_items(file, "sets"))
+            logger.info(f"진단테스트 데이터 저장 완료: {inserted_count}개")
             
             return {
                 "success": True,
-                "message": f"진단테스트 데이터 저장 완료: {len(result.inserted_ids)}개",
-                "count": len(result.inserted_ids)
+                "message": f"진단테스트 데이터 저장 완료: {inserted_count}개",
+                "count": inserted_count
             }
             
         except Exception as e:
@@ -164,31 +124,14 @@ class DirectMongoDBLoader:
         try:
             logger.info(f"단원테스트 데이터 로드 시작: {file_path}")
             
-            with open(file_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-            
-            if 'units' not in data:
-                raise ValueError("단원테스트 데이터에 'units' 키가 없습니다.")
-            
-            collection = self.db.unit_tests
-            # 기존 데이터 삭제
-            collection.delete_many({})
-            logger.info("기존 단원테스트 데이터 삭제 완료")
-            
-            # 새 데이터 삽입
-            result = collection.insert_many(data['units'])
-            logger.info(f"단원테스트 데이터 저장 완료: {len(result.inserted_ids)}개")
-            
-            # 인덱스 생성
-            collection.create_index("code", unique=True)
-            collection.create_index("problems.problemId")
-            collection.create_index("problems.unitId")
-            logger.info("단원테스트 컬렉션 인덱스 생성 완료")
+            with open(file_path, 'rb') as file:
+                inserted_count = swap_load_seed(self.db, "unit_tests", iter_seed_items(file, "units"))
+            logger.info(f"단원테스트 데이터 저장 완료: {inserted_count}개")
             
             return {
                 "success": True,
-                "message": f"단원테스트 데이터 저장 완료: {len(result.inserted_ids)}개",
-                "count": len(result.inserted_ids)
+                "message": f"단원테스트 데이터 저장 완료: {inserted_count}개",
+                "count": inserted_count
             }
             
         except Exception as e:
@@ -0,0 +1,238 @@
+"""
+Express 진단 결과 일괄 처리
+수업이 끝날 때 몰려오는 여러 ExpressDiagnosticRequest를 한 번에 받아,
+문제 → 개념 해석과 선행 개념 조회를 제출 전체가 공유하고
+진단 결과와 학습 경로를 insert_many 두 번으로 저장합니다.
+
+제출 형태 (단건 /api/learning-path/express/diagnostic 와 동일):
+    {"testId", "userId", "gradeRange", "answers": [{"problemId", "userAnswer", "isCorrect", "durationSeconds"}],
+     "totalProblems", "durationSec"}
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# main.py는 패키지(from .express_batch)로, 테스트/배치 스크립트는 scripts 경로에서 바로 불러옴
+# (/api/cache/stats와 같은 recommended_path_cache 인스턴스를 쓰도록 패키지 모듈을 우선)
+try:
+    from .diagnostic_scoring import score_submissions
+    from .recommended_path_cache import path_signature, recommended_path_cache
+except ImportError:
+    from diagnostic_scoring import score_submissions
+    from recommended_path_cache import path_signature, recommended_path_cache
+
+# 한 번의 일괄 요청에서 허용하는 최대 제출 수
+MAX_BATCH_SUBMISSIONS = 500
+# 정답률이 이 값 미만인 개념을 취약 개념으로 분류
+WEAK_ACCURACY = 0.6
+# 취약 개념마다 학습 경로에 넣을 선행 개념 깊이
+PREREQUISITE_HOPS = 2
+MINUTES_PER_CONCEPT = 15
+
+
+def _object_id_hex() -> str:
+    from bson import ObjectId
+    return str(ObjectId())
+
+
+def validate_submission(submission: Any) -> Optional[str]:
+    """제출 형식 오류 메시지 (정상이면 None)"""
+    if not isinstance(submission, dict):
+        return "제출 형식이 올바르지 않습니다."
+    for field in ("testId", "userId"):
+        if submission.get(field) in (None, ""):
+            return f"{field}가 필요합니다."
+    answers = submission.get("answers")
+    if not isinstance(answers, list) or not answers:
+        return "answers 목록이 필요합니다."
+    if any(not isinstance(answer, dict) or not answer.get("problemId") for answer in answers):
+        return "모든 답안에 problemId가 필요합니다."
+    return None
+
+
+class ExpressBatchProcessor:
+    """공유 조회 테이블로 여러 진단 제출을 분석하고 한 번에 저장"""
+
+    def __init__(self, index, snapshot, results_collection=None, paths_collection=None,
+                 id_factory: Callable[[], str] = _object_id_hex, path_cache=recommended_path_cache):
+        self.index = index
+        self.snapshot = snapshot
+        self.results_collection = results_collection
+        self.paths_collection = paths_collection
+        self.id_factory = id_factory
+        self.path_cache = path_cache
+
+    @staticmethod
+    def _weak_concepts(scores: Dict[str, Any]) -> List[str]:
+        """오답률이 높은 순서의 취약 개념 (정답률 WEAK_ACCURACY 미만)"""
+        weak = sorted(
+            (1 - error_rate, concept) for concept, error_rate in scores["conceptErrorRates"].items()
+            if 1 - error_rate < WEAK_ACCURACY
+        )
+        return [concept for _, concept in weak]
+
+    def _learning_path_nodes(self, weak_concepts: List[str], relations: Dict[str, Dict[str, Any]]):
+        """선행 개념(먼 것부터) → 취약 개념 순서의 학습 경로 노드 (취약 개념은 교육과정(이름) 순서로 배치)"""
+        weak_concepts = sorted(weak_concepts)
+        nodes: List[Dict[str, Any]] = []
+        seen = set()
+        for concept in weak_concepts:
+            relation = relations.get(concept)
+            prerequisites = sorted(relation["ancestors"], key=lambda n: -n["hops"]) if relation else []
+            for prereq in prerequisites:
+                if prereq["concept"] not in seen and prereq["concept"] not in weak_concepts:
+                    seen.add(prereq["concept"])
+                    nodes.append({"concept": prereq["concept"], "unit": prereq.get("unit"), "isPrerequisite": True})
+            if concept not in seen:
+                seen.add(concept)
+                unit = relation.get("unit") if relation else None
+                nodes.append({"concept": concept, "unit": unit, "isPrerequisite": False})
+        for priority, node in enumerate(nodes, 1):
+            node["priority"] = priority
+        return nodes
+
+    def analyze(self, submission: Dict[str, Any], scores: Dict[str, Any],
+                relations: Dict[str, Dict[str, Any]], now: datetime):
+        """제출 하나의 진단 결과 문서와 학습 경로 문서 생성 (scores는 diagnostic_scoring 결과)"""
+        answers = submission["answers"]
+        correct = scores["correctCount"]
+        weak_concepts = self._weak_concepts(scores)
+        if self.path_cache is None:
+            nodes = self._learning_path_nodes(weak_concepts, relations)
+        else:
+            # 같은 취약 개념 집합/정답률 구간/그래프 버전이면 캐시된 경로 재사용
+            signature = path_signature(weak_concepts, scores["accuracyRate"], getattr(self.snapshot, "version", None))
+            nodes = self.path_cache.get_or_compute(signature, lambda: self._learning_path_nodes(weak_concepts, relations))
+
+        path_id = self.id_factory()
+        path_name = f"{weak_concepts[0]} 보완 학습" if weak_concepts else "심화 학습"
+        learning_path = {
+            "pathId": path_id,
+            "pathName": path_name,
+            "totalConcepts": len(nodes),
+            "status": "active",
+            "nodes": nodes,
+        }
+        result_doc = {
+            "testId": submission["testId"],
+            "userId": submission["userId"],
+            "gradeRange": submission.get("gradeRange"),
+            "status": "completed",
+            "createdAt": now,
+            "diagnosticData": {
+                "answers": answers,
+                "totalProblems": submission.get("totalProblems", len(answers)),
+                "durationSec": submission.get("durationSec"),
+            },
+            "analysisResult": {
+                "analysisId": self.id_factory(),
+                "aiComment": f"{len(answers)}문제 중 {correct}문제를 맞혔습니다."
+                             + (f" {', '.join(weak_concepts[:3])} 개념 복습이 필요합니다." if weak_concepts else ""),
+                "class": scores["class"],
+                "overallLevel": scores["overallLevel"],
+                "conceptErrorRates": scores["conceptErrorRates"],
+                "unitLevels": scores["unitLevels"],
+                "gradeRange": submission.get("gradeRange"),
+                "recommendedPath": [
+                    {"unitTitle": node["concept"], "priority": node["priority"],
+                     "reason": "선행 개념" if node["isPrerequisite"] else "취약 개념"}
+                    for node in nodes
+                ],
+                "weakUnits": scores["wrongUnits"],
+                "weakConcepts": weak_concepts,
+            },
+            "learningPath": learning_path,
+        }
+        path_doc = {
+            **learning_path,
+            "userId": submission["userId"],
+            "testId": submission["testId"],
+            "createdAt": now,
+        }
+        response = {
+            "testId": submission["testId"],
+            "status": "ok",
+            "pathId": path_id,
+            "pathName": path_name,
+            "learningPath": learning_path,
+            "estimatedDuration": len(nodes) * MINUTES_PER_CONCEPT,
+        }
+        return result_doc, path_doc, response
+
+    def process(self, submissions: Iterable[Any]) -> List[Dict[str, Any]]:
+        """여러 제출 분석 및 저장, 제출 순서대로 항목별 결과 반환"""
+        submissions = list(submissions)
+        if len(submissions) > MAX_BATCH_SUBMISSIONS:
+            raise ValueError(f"한 번에 최대 {MAX_BATCH_SUBMISSIONS}개 제출까지 처리할 수 있습니다.")
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(submissions)
+        valid: List[int] = []
+        for i, submission in enumerate(submissions):
+            error = validate_submission(submission)
+            if error:
+                results[i] = {"index": i, "status": "error", "error": error}
+            else:
+                valid.append(i)
+
+        # 모든 제출의 문제를 한 번에 해석
+        problem_ids = [str(a["problemId"]) for i in valid for a in submissions[i]["answers"]]
+        resolved = {item["problemId"]: item for item in self.index.resolve_many(dict.fromkeys(problem_ids))}
+
+        # 모든 제출에 등장한 개념의 선행 개념을 스냅샷 한 번으로 조회
+        concepts = [item["concept"] for item in resolved.values() if item.get("concept")]
+        relations = self.snapshot.relations(concepts, PREREQUISITE_HOPS) if self.snapshot is not None else {}
+
+        # 모든 제출을 한 번의 벡터 연산으로 채점
+        scores = score_submissions([submissions[i] for i in valid], resolve=resolved.__getitem__)
+
+        now = datetime.now(timezone.utc)
+        result_docs, path_docs, owners = [], [], []
+        for i, submission_scores in zip(valid, scores):
+            result_doc, path_doc, response = self.analyze(submissions[i], submission_scores, relations, now)
+            result_docs.append(result_doc)
+            path_docs.append(path_doc)
+            owners.append(i)
+            results[i] = {"index": i, **response}
+
+        failed = self._insert(result_docs, path_docs)
+        for position in failed:
+            i = owners[position]
+            results[i] = {"index": i, "testId": submissions[i]["testId"], "status": "error",
+                          "error": "결과 저장에 실패했습니다."}
+        return results
+
+    def _insert(self, result_docs: List[Dict[str, Any]], path_docs: List[Dict[str, Any]]) -> set:
+        """결과를 먼저 저장하고 저장된 결과에 연결(resultId)된 경로만 저장, 저장에 실패한 문서 위치 반환
+        경로 저장에 실패한 결과는 다시 삭제해 한쪽만 남는 문서가 없도록 함"""
+        failed = self._insert_many(self.results_collection, result_docs)
+        saved = [position for position in range(len(path_docs)) if position not in failed]
+        for position in saved:
+            # insert_many가 채운 _id로 결과와 경로 연결
+            if "_id" in result_docs[position]:
+                path_docs[position]["resultId"] = result_docs[position]["_id"]
+        path_failed = {saved[i] for i in self._insert_many(self.paths_collection, [path_docs[p] for p in saved])}
+
+        orphan_ids = [result_docs[position]["_id"] for position in path_failed if "_id" in result_docs[position]]
+        if orphan_ids and self.results_collection is not None:
+            try:
+                self.results_collection.delete_many({"_id": {"$in": orphan_ids}})
+            except Exception as e:
+                print(f"⚠️ 경로 저장 실패 결과 정리 중 오류 ({self.results_collection.name}): {e}")
+        return failed | path_failed
+
+    @staticmethod
+    def _insert_many(collection, docs: List[Dict[str, Any]]) -> set:
+        """insert_many(ordered=False), 저장에 실패한 문서 위치 반환"""
+        if collection is None or not docs:
+            return set()
+        try:
+            collection.insert_many(docs, ordered=False)
+            return set()
+        except Exception as e:
+            print(f"⚠️ 일괄 저장 중 오류 ({collection.name}): {e}")
+            details = getattr(e, "details", None) or {}
+            write_errors = details.get("writeErrors")
+            if write_errors is None:
+                # 일괄 쓰기 자체가 실패하면 전체 실패로 처리
+                return set(range(len(docs)))
+            return {error["index"] for error in write_errors}
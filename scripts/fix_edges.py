@@ -3,6 +3,7 @@ from pathlib import Path
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
 import pandas as pd
+from neo4j_client import is_precedes_type
 
 # AI/.env 파일 로드
 env_path = Path(__file__).resolve().parents[1] / ".env"
@@ -18,7 +19,7 @@ AURA_PASS = os.getenv("AURA_PASS")
 driver = GraphDatabase.driver(AURA_URI, auth=(AURA_USER, AURA_PASS))
 
 def load_edges():
-    """관계 데이터 로드 (수정된 버전)"""
+    """관계 데이터 로드 (수정된 버전, MERGE로 재실행해도 관계가 중복되지 않음)"""
     print("🔗 관계 데이터 로드 중...")
     
     # CSV 파일 경로
@@ -58,11 +59,11 @@ def load_edges():
             relationship_type = row['type']
             
             # PRECEDES 관계 처리 (대소문자 구분 없이)
-            if relationship_type.upper() == 'PRECEDES':
+            if is_precedes_type(relationship_type):
                 query = """
                 MATCH (source:Concept {concept: $source_concept})
                 MATCH (target:Concept {concept: $target_concept})
-                CREATE (source)-[:PRECEDES]->(target)
+                MERGE (source)-[:PRECEDES]->(target)
                 """
                 
                 try:
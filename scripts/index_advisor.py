@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+인덱스 어드바이저
+MongoDB 프로파일러(system.profile)에 기록된 실제 쿼리 형태와 $indexStats 사용 횟수를 읽어
+1. 기존 인덱스로 처리되지 않는 쿼리 형태마다 복합 인덱스를 제안하고 (등호 → 정렬 → 범위 순서)
+2. 한 번도 쓰이지 않은 인덱스를 표시하고
+3. 매니페스트(index_manifest.py)와 실제 인덱스의 차이를 적용합니다.
+
+    python index_advisor.py [--manifest nerdmath] [--profile 100] [--apply] [--drop-unused] [--create-suggested]
+
+--profile N: 느린 쿼리(N ms 이상) 프로파일링을 켭니다. 트래픽이 쌓인 뒤 다시 실행하면 제안이 나옵니다.
+$indexStats 사용 횟수는 서버 재시작 시 초기화되므로 재시작 직후에는 --drop-unused를 쓰지 마세요.
+두 매니페스트는 같은 데이터베이스(MONGODB_DB)의 일부 컬렉션(progress, vocabulary 등)을 함께 쓰므로
+어느 매니페스트에든 정의된 인덱스는 매니페스트 밖 인덱스(삭제 대상)로 보지 않습니다.
+"""
+
+import argparse
+import os
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# AI 디렉토리를 Python 경로에 추가
+AI_DIR = Path(__file__).parent
+sys.path.insert(0, str(AI_DIR))
+
+from index_manifest import (ASCENDING, MANIFESTS, TEXT, existing_indexes, index_name, normalize_keys,
+                            plan_index_diff)
+
+PROFILE_LIMIT = 5000
+# 이 횟수 이상 나온 쿼리 형태만 인덱스 제안
+MIN_QUERY_COUNT = 5
+
+RANGE_OPERATORS = {"$gt", "$gte", "$lt", "$lte", "$ne", "$nin", "$regex", "$exists"}
+EQUALITY_OPERATORS = {"$eq", "$in"}
+
+
+def _classify_filter(query: Dict[str, Any]) -> Optional[Tuple[List[str], List[str]]]:
+    """filter 문서 → (등호 필드, 범위 필드), $or/$text 등 단순하지 않은 쿼리는 None"""
+    equality, ranges = [], []
+    for field, condition in (query or {}).items():
+        if field.startswith("$"):
+            return None
+        if isinstance(condition, dict) and any(op.startswith("$") for op in condition):
+            if set(condition) <= EQUALITY_OPERATORS:
+                equality.append(field)
+            elif set(condition) <= RANGE_OPERATORS | EQUALITY_OPERATORS | {"$options"}:
+                ranges.append(field)
+            else:
+                return None
+        else:
+            equality.append(field)
+    return sorted(equality), sorted(ranges)
+
+
+def _command_query(command: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """프로파일러 command → (filter, sort), find/count/distinct/aggregate 선두 $match·$sort만 해석"""
+    if "find" in command:
+        return command.get("filter") or {}, command.get("sort") or {}
+    if "count" in command or "distinct" in command:
+        return command.get("query") or {}, {}
+    if "aggregate" in command:
+        query, sort = {}, {}
+        for stage in command.get("pipeline", []):
+            if "$match" in stage and not query and not sort:
+                query = stage["$match"]
+            elif "$sort" in stage and not sort:
+                sort = stage["$sort"]
+            else:
+                break
+        return query, sort
+    return None
+
+
+def query_shape(entry: Dict[str, Any]) -> Optional[Tuple[str, Tuple[str, ...], Tuple[Tuple[str, int], ...], Tuple[str, ...]]]:
+    """system.profile 항목 → (컬렉션, 등호 필드, 정렬, 범위 필드), 해석할 수 없으면 None"""
+    command = entry.get("command") or {}
+    parsed = _command_query(command)
+    if parsed is None:
+        return None
+    query, sort = parsed
+    classified = _classify_filter(query)
+    if classified is None:
+        return None
+    equality, ranges = classified
+    collection = entry.get("ns", "").split(".", 1)[-1]
+    sort_keys = tuple((field, int(direction)) for field, direction in sort.items() if field != "$natural")
+    sort_fields = {field for field, _ in sort_keys}
+    ranges = tuple(field for field in ranges if field not in sort_fields)
+    if not equality and not sort_keys and not ranges:
+        return None
+    return collection, tuple(equality), sort_keys, ranges
+
+
+def suggest_index(equality: Iterable[str], sort: Iterable[Tuple[str, int]], ranges: Iterable[str]) -> List[Tuple[str, int]]:
+    """등호 → 정렬 → 범위(ESR) 순서의 복합 인덱스 키"""
+    keys = [(field, ASCENDING) for field in equality]
+    used = {field for field, _ in keys}
+    for field, direction in sort:
+        if field not in used:
+            keys.append((field, direction))
+            used.add(field)
+    keys += [(field, ASCENDING) for field in ranges if field not in used]
+    return keys
+
+
+def index_supports(index_keys, equality: Iterable[str], sort: Iterable[Tuple[str, int]], ranges: Iterable[str]) -> bool:
+    """인덱스가 해당 쿼리 형태의 등호 조건과 정렬을 모두 처리하는지 (등호 필드 순서 무관, 정렬은 전체 역방향 허용)"""
+    keys = list(normalize_keys(index_keys))
+    if any(direction == TEXT for _, direction in keys):
+        return False
+    equality, sort = set(equality), list(sort)
+    prefix = keys[:len(equality)]
+    if {field for field, _ in prefix} != equality:
+        return False
+    rest = keys[len(equality):]
+    sort = [(field, direction) for field, direction in sort if field not in equality]
+    if sort:
+        head = rest[:len(sort)]
+        reversed_sort = [(field, -direction) for field, direction in sort]
+        if head != sort and head != reversed_sort:
+            return False
+    elif not equality:
+        # 범위 조건만 있는 쿼리는 첫 필드가 범위 필드여야 함
+        return bool(rest) and rest[0][0] in set(ranges)
+    return True
+
+
+def collect_shapes(profile_entries: Iterable[Dict[str, Any]]) -> Dict[Tuple, Dict[str, Any]]:
+    """쿼리 형태별 횟수 / 총 소요 시간 / 컬렉션 스캔 횟수 집계"""
+    shapes: Dict[Tuple, Dict[str, Any]] = defaultdict(lambda: {"count": 0, "millis": 0, "collscans": 0})
+    for entry in profile_entries:
+        shape = query_shape(entry)
+        if shape is None:
+            continue
+        stats = shapes[shape]
+        stats["count"] += 1
+        stats["millis"] += entry.get("millis", 0)
+        stats["collscans"] += 1 if "COLLSCAN" in entry.get("planSummary", "") else 0
+    return dict(shapes)
+
+
+def manifest_keys(name: str, manifests: Iterable[Dict[str, List]] = None) -> set:
+    """모든 매니페스트가 name 컬렉션에 정의한 인덱스 키 (정규화)"""
+    manifests = MANIFESTS.values() if manifests is None else manifests
+    return {normalize_keys(keys) for manifest in manifests for keys in manifest.get(name, [])}
+
+
+def advise_collection(name: str, manifest: List, existing: Dict[str, Tuple], usage: Dict[str, int],
+                      shapes: Dict[Tuple, Dict[str, Any]], min_count: int = MIN_QUERY_COUNT,
+                      protected: Iterable[Tuple] = ()) -> Dict[str, Any]:
+    """컬렉션 하나의 매니페스트 차이 / 인덱스 제안 / 미사용 인덱스
+    protected: 다른 매니페스트에 정의된 인덱스 키 (extra에서 제외해 --drop-unused로 삭제되지 않게 함)"""
+    plan = plan_index_diff(manifest, existing)
+    protected = set(protected)
+    available = list(existing.values()) + [normalize_keys(keys) for keys in manifest]
+    suggested = {}
+    for (collection, equality, sort, ranges), stats in shapes.items():
+        if collection != name or stats["count"] < min_count:
+            continue
+        if any(index_supports(keys, equality, sort, ranges) for keys in available):
+            continue
+        keys = tuple(suggest_index(equality, sort, ranges))
+        current = suggested.setdefault(keys, {"count": 0, "millis": 0, "collscans": 0})
+        for field in current:
+            current[field] += stats[field]
+    unused = [index for index, ops in usage.items() if ops == 0 and index in existing]
+    return {
+        "create": plan["create"],
+        "extra": [index for index in plan["extra"] if existing[index] not in protected],
+        "unused": unused,
+        "suggested": sorted(([list(keys), stats] for keys, stats in suggested.items()),
+                            key=lambda item: item[1]["millis"], reverse=True),
+    }
+
+
+def read_profile(db, limit: int = PROFILE_LIMIT) -> List[Dict[str, Any]]:
+    """최근 프로파일러 기록 (이 데이터베이스의 조회/명령만)"""
+    return list(db.system.profile.find(
+        {"op": {"$in": ["query", "command"]}, "ns": {"$regex": f"^{db.name}\\."}},
+        {"ns": 1, "command": 1, "planSummary": 1, "millis": 1},
+    ).sort("ts", -1).limit(limit))
+
+
+def index_usage(collection) -> Dict[str, int]:
+    """$indexStats 인덱스별 사용 횟수 (_id 제외)"""
+    return {stat["name"]: int(stat["accesses"]["ops"])
+            for stat in collection.aggregate([{"$indexStats": {}}]) if stat["name"] != "_id_"}
+
+
+def advise(db, manifest: Dict[str, List], profile_limit: int = PROFILE_LIMIT,
+           min_count: int = MIN_QUERY_COUNT) -> Dict[str, Dict[str, Any]]:
+    shapes = collect_shapes(read_profile(db, profile_limit))
+    present = set(db.list_collection_names())
+    report = {}
+    for name, indexes in manifest.items():
+        if name not in present:
+            continue
+        collection = db[name]
+        report[name] = advise_collection(name, indexes, existing_indexes(collection), index_usage(collection),
+                                         shapes, min_count, manifest_keys(name))
+    return report
+
+
+def apply_advice(db, report: Dict[str, Dict[str, Any]], drop_unused: bool = False, create_suggested: bool = False):
+    """매니페스트에 없는 인덱스 생성, 매니페스트 밖이면서 쓰이지 않는 인덱스 삭제(drop_unused), 제안 인덱스 생성(create_suggested)"""
+    for name, advice in report.items():
+        collection = db[name]
+        to_create = list(advice["create"]) + ([keys for keys, _ in advice["suggested"]] if create_suggested else [])
+        for keys in to_create:
+            collection.create_index(keys, name=index_name(keys))
+            print(f"✅ 인덱스 '{index_name(keys)}' 생성 ({name})")
+        if drop_unused:
+            for index in advice["extra"]:
+                if index in advice["unused"]:
+                    collection.drop_index(index)
+                    print(f"🗑️ 미사용 인덱스 '{index}' 삭제 ({name})")
+
+
+def _format_keys(keys) -> str:
+    return "{" + ", ".join(f"{field}: {direction}" for field, direction in keys) + "}"
+
+
+def print_advice(report: Dict[str, Dict[str, Any]]):
+    for name, advice in report.items():
+        if not any(advice[part] for part in ("create", "extra", "unused", "suggested")):
+            continue
+        print(f"\n📂 {name}")
+        for keys in advice["create"]:
+            print(f"  ➕ 매니페스트 인덱스 없음: {_format_keys(keys)}")
+        for keys, stats in advice["suggested"]:
+            print(f"  💡 제안: {_format_keys(keys)} — 쿼리 {stats['count']}회, {stats['millis']}ms, "
+                  f"컬렉션 스캔 {stats['collscans']}회")
+        for index in advice["extra"]:
+            marker = "미사용" if index in advice["unused"] else "사용 중"
+            print(f"  ⚠️ 매니페스트에 없는 인덱스: {index} ({marker})")
+        for index in advice["unused"]:
+            if index not in advice["extra"]:
+                print(f"  💤 매니페스트 인덱스지만 사용 기록 없음: {index}")
+
+
+def main():
+    from dotenv import load_dotenv
+    from pymongo import MongoClient
+
+    parser = argparse.ArgumentParser(description="프로파일러/$indexStats 기반 인덱스 어드바이저")
+    parser.add_argument("--manifest", choices=sorted(MANIFESTS), default="nerdmath", help="비교할 인덱스 매니페스트")
+    parser.add_argument("--profile", type=int, metavar="SLOWMS", help="느린 쿼리 프로파일링 켜기 (ms 기준)")
+    parser.add_argument("--limit", type=int, default=PROFILE_LIMIT, help="읽을 프로파일러 기록 수")
+    parser.add_argument("--min-count", type=int, default=MIN_QUERY_COUNT, help="인덱스를 제안할 최소 쿼리 횟수")
+    parser.add_argument("--apply", action="store_true", help="매니페스트 차이 적용 (없는 인덱스 생성)")
+    parser.add_argument("--drop-unused", action="store_true", help="--apply 시 매니페스트 밖의 미사용 인덱스 삭제")
+    parser.add_argument("--create-suggested", action="store_true", help="--apply 시 제안 인덱스도 생성")
+    args = parser.parse_args()
+
+    load_dotenv(AI_DIR / ".env")
+    client = MongoClient(os.getenv("MONGODB_URI"))
+    try:
+        db = client[os.getenv("MONGODB_DB", "nerdmath")]
+        if args.profile is not None:
+            db.command("profile", 1, slowms=args.profile)
+            print(f"🔍 프로파일링 켜짐 ({args.profile}ms 이상)")
+
+        report = advise(db, MANIFESTS[args.manifest], args.limit, args.min_count)
+        print_advice(report)
+        if args.apply:
+            apply_advice(db, report, args.drop_unused, args.create_suggested)
+            print("\n🎉 인덱스 차이 적용 완료!")
+        else:
+            print("\n💡 --apply로 적용할 수 있습니다 (제안 인덱스는 index_manifest.py에 추가하는 것을 권장)")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
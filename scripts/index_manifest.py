@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+선언적 인덱스 매니페스트
+컬렉션별로 유지해야 할 인덱스를 한곳에 정의하고, 실제 인덱스와 비교해 생성/삭제 대상을 계산합니다.
+핫 쿼리는 사용자 + 시간 정렬 형태가 대부분이므로 단일 필드 인덱스를 여러 개 두는 대신
+등호 필드 → 정렬 필드 순서의 복합 인덱스 하나로 조회/정렬을 함께 처리합니다.
+복합 인덱스의 앞부분과 같은 단일 필드 인덱스(userld 등)는 따로 두지 않아 쓰기 비용을 줄입니다.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+ASCENDING = 1
+DESCENDING = -1
+TEXT = "text"
+
+IndexKeys = List[Tuple[str, Any]]
+
+# setup_nerdmath_collections.py (테이블 정의서 스키마, 필드명 오타 userld 등은 스키마 그대로)
+NERDMATH_INDEXES: Dict[str, List[IndexKeys]] = {
+    "diagnostic_test": [
+        [("testid", ASCENDING)],
+        [("userld", ASCENDING), ("startedAt", DESCENDING)],
+    ],
+    "answer_attempt": [
+        [("answerld", ASCENDING)],
+        # 사용자별 최근 풀이 조회/정렬
+        [("userld", ASCENDING), ("scoredAt", DESCENDING)],
+        [("problemld", ASCENDING)],
+        [("unitid", ASCENDING)],
+        # 숙련도 추적기의 checkpoint 이후 scoredAt 순 스캔
+        [("scoredAt", DESCENDING)],
+    ],
+    "diagnostic_analysis": [
+        [("analysisId", ASCENDING)],
+        [("testid", ASCENDING)],
+        [("userld", ASCENDING), ("generatedAt", DESCENDING)],
+    ],
+    "unit": [
+        [("unitId", ASCENDING)],
+        [("grade", ASCENDING), ("chapter", ASCENDING), ("orderInGrade", ASCENDING)],
+        # 문제-개념 인덱스 변경 감지(최신 syncedAt) 조회
+        [("syncedAt", DESCENDING)],
+    ],
+    "problem": [
+        [("problemId", ASCENDING)],
+        [("unitId", ASCENDING), ("level", ASCENDING)],
+        [("grade", ASCENDING), ("chapter", ASCENDING)],
+        [("diagnosticTest", ASCENDING), ("unitId", ASCENDING)],
+        [("tags", ASCENDING)],
+        [("content.text", TEXT)],
+        # 문제-개념 인덱스 변경 감지(최신 syncedAt) 조회
+        [("syncedAt", DESCENDING)],
+    ],
+    "problem_set": [
+        [("setId", ASCENDING)],
+        [("userld", ASCENDING), ("createdAt", DESCENDING)],
+        [("unitld", ASCENDING)],
+    ],
+    "concept": [
+        [("conceptId", ASCENDING)],
+        [("unitId", ASCENDING)],
+        # 문제-개념 인덱스 변경 감지(최신 syncedAt) 조회
+        [("syncedAt", DESCENDING)],
+    ],
+    "vocabulary": [
+        [("vocald", ASCENDING)],
+        [("unitId", ASCENDING), ("type", ASCENDING)],
+        [("word", TEXT)],
+    ],
+    "progress": [
+        [("progressId", ASCENDING)],
+        [("userld", ASCENDING), ("unitId", ASCENDING)],
+        [("userld", ASCENDING), ("updatedAt", DESCENDING)],
+    ],
+    "activity_log": [
+        [("logld", ASCENDING)],
+        [("userld", ASCENDING), ("date", DESCENDING)],
+    ],
+    "gamification_state": [
+        [("gamifild", ASCENDING)],
+        [("userld", ASCENDING)],
+        [("totalXp", DESCENDING)],
+    ],
+    "xp_transactions": [
+        [("transactionld", ASCENDING)],
+        [("userld", ASCENDING), ("at", DESCENDING)],
+    ],
+    "learning_time_log": [
+        [("learningTimeld", ASCENDING)],
+        [("userld", ASCENDING), ("startedAt", DESCENDING)],
+        [("contentid", ASCENDING)],
+    ],
+    "bookmark": [
+        [("bookmarkid", ASCENDING)],
+        [("userld", ASCENDING), ("bookmarkedAt", DESCENDING)],
+        [("problemld", ASCENDING)],
+    ],
+}
+
+# setup_mongodb_collections.py (초기 스키마)
+LEGACY_INDEXES: Dict[str, List[IndexKeys]] = {
+    "users": [
+        [("email", ASCENDING)],
+        [("phoneNumber", ASCENDING)],
+        [("createdAt", DESCENDING)],
+    ],
+    "guardian_info": [
+        [("userId", ASCENDING)],
+    ],
+    "user_auth": [
+        [("userId", ASCENDING)],
+        [("refreshToken", ASCENDING)],
+    ],
+    "email_verification": [
+        [("email", ASCENDING)],
+        [("verificationCode", ASCENDING)],
+        [("expiresAt", ASCENDING)],
+    ],
+    "password_reset": [
+        [("email", ASCENDING)],
+        [("resetToken", ASCENDING)],
+        [("expiresAt", ASCENDING)],
+    ],
+    "diagnostic_tests": [
+        [("testId", ASCENDING)],
+        [("userId", ASCENDING), ("createdAt", DESCENDING)],
+    ],
+    "answer_attempts": [
+        [("attemptId", ASCENDING)],
+        [("userId", ASCENDING), ("attemptTime", DESCENDING)],
+        [("problemId", ASCENDING)],
+    ],
+    "diagnostic_analysis": [
+        [("analysisId", ASCENDING)],
+        [("userId", ASCENDING), ("createdAt", DESCENDING)],
+        [("testId", ASCENDING)],
+    ],
+    "units": [
+        [("unitId", ASCENDING)],
+        [("unitCode", ASCENDING)],
+        [("grade", ASCENDING), ("subject", ASCENDING)],
+    ],
+    "concepts": [
+        [("conceptId", ASCENDING)],
+        [("unitId", ASCENDING)],
+    ],
+    "learning_time_logs": [
+        [("logId", ASCENDING)],
+        [("userId", ASCENDING), ("startTime", DESCENDING)],
+        [("conceptId", ASCENDING)],
+    ],
+    "problems": [
+        [("problemId", ASCENDING)],
+        [("conceptId", ASCENDING), ("difficulty", ASCENDING)],
+        [("unitId", ASCENDING)],
+        [("problemText", TEXT)],
+    ],
+    "problem_sets": [
+        [("setId", ASCENDING)],
+    ],
+    "vocabulary": [
+        [("vocaId", ASCENDING)],
+        [("term", TEXT)],
+        [("conceptId", ASCENDING)],
+    ],
+    "progress": [
+        [("progressId", ASCENDING)],
+        [("userId", ASCENDING), ("conceptId", ASCENDING)],
+    ],
+    "activity_logs": [
+        [("logId", ASCENDING)],
+        [("userId", ASCENDING), ("timestamp", DESCENDING)],
+        [("activityType", ASCENDING)],
+    ],
+    "gamification_state": [
+        [("gamifiId", ASCENDING)],
+        [("userId", ASCENDING)],
+        [("level", DESCENDING)],
+    ],
+    "xp_transactions": [
+        [("transactionId", ASCENDING)],
+        [("userId", ASCENDING), ("timestamp", DESCENDING)],
+    ],
+    "bookmarks": [
+        [("bookmarkId", ASCENDING)],
+        [("userId", ASCENDING), ("createdAt", DESCENDING)],
+        [("itemId", ASCENDING)],
+    ],
+}
+
+MANIFESTS = {"nerdmath": NERDMATH_INDEXES, "legacy": LEGACY_INDEXES}
+
+
+def index_name(keys: IndexKeys) -> str:
+    """기존 setup 스크립트와 같은 이름 규칙 (필드명_..._idx)"""
+    return f"{'_'.join(str(field) for field, _ in keys)}_idx"
+
+
+def normalize_keys(keys) -> Tuple[Tuple[str, Any], ...]:
+    """list_indexes()의 key 문서와 매니페스트 항목을 같은 형태로 비교"""
+    items = keys.items() if hasattr(keys, "items") else keys
+    return tuple((str(field), direction if direction == TEXT else int(direction)) for field, direction in items)
+
+
+def existing_indexes(collection) -> Dict[str, Tuple[Tuple[str, Any], ...]]:
+    """{이름: 키} (_id 인덱스 제외, text 인덱스는 _fts 대신 원래 필드로 복원)"""
+    indexes = {}
+    for info in collection.list_indexes():
+        if info["name"] == "_id_":
+            continue
+        if "weights" in info:
+            indexes[info["name"]] = tuple((field, TEXT) for field in info["weights"])
+        else:
+            indexes[info["name"]] = normalize_keys(info["key"])
+    return indexes
+
+
+def plan_index_diff(manifest: List[IndexKeys], existing: Dict[str, Tuple[Tuple[str, Any], ...]]) -> Dict[str, Any]:
+    """매니페스트와 실제 인덱스 비교 → 생성할 키 목록 / 매니페스트에 없는 인덱스 이름 / 유지되는 이름"""
+    by_keys = {keys: name for name, keys in existing.items()}
+    create, keep = [], []
+    for keys in manifest:
+        name = by_keys.get(normalize_keys(keys))
+        if name is None:
+            create.append(list(keys))
+        else:
+            keep.append(name)
+    extra = [name for name in existing if name not in keep]
+    return {"create": create, "extra": extra, "keep": keep}
+
+
+def sync_collection_indexes(collection, manifest: List[IndexKeys], drop_extra: bool = False) -> Dict[str, Any]:
+    """매니페스트 인덱스를 생성 (drop_extra=True면 매니페스트에 없는 인덱스 삭제)"""
+    plan = plan_index_diff(manifest, existing_indexes(collection))
+    for keys in plan["create"]:
+        collection.create_index(keys, name=index_name(keys))
+    if drop_extra:
+        for name in plan["extra"]:
+            collection.drop_index(name)
+    return plan
+
+
+def sync_manifest(db, manifest: Dict[str, List[IndexKeys]], drop_extra: bool = False) -> Dict[str, Dict[str, Any]]:
+    """매니페스트 전체 적용, 컬렉션별 결과 출력 후 반환"""
+    results = {}
+    for collection_name, indexes in manifest.items():
+        try:
+            plan = sync_collection_indexes(db[collection_name], indexes, drop_extra)
+        except Exception as e:
+            print(f"❌ 컬렉션 '{collection_name}' 인덱스 동기화 실패: {e}")
+            continue
+        results[collection_name] = plan
+        for keys in plan["create"]:
+            print(f"✅ 인덱스 '{index_name(keys)}' 생성 완료 ({collection_name})")
+        if plan["keep"]:
+            print(f"⚠️ 인덱스 {len(plan['keep'])}개 이미 존재함 ({collection_name})")
+        if plan["extra"]:
+            action = "삭제" if drop_extra else "매니페스트에 없음 (유지)"
+            print(f"🗑️ {action}: {', '.join(plan['extra'])} ({collection_name})")
+    return results
@@ -0,0 +1,213 @@
+"""
+프로세스 내 비동기 작업 큐
+진단 분석처럼 오래 걸리는 작업을 asyncio 워커 풀에 넣고 작업 ID를 바로 돌려준 뒤,
+상태 조회 API 또는 웹훅(callbackUrl)으로 결과를 전달합니다.
+완료된 작업은 JOB_RESULT_TTL 동안만 보관합니다.
+"""
+
+import asyncio
+import os
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "1000"))
+JOB_RESULT_TTL = float(os.getenv("JOB_RESULT_TTL", "3600"))
+WEBHOOK_TIMEOUT = float(os.getenv("WEBHOOK_TIMEOUT", "10"))
+WEBHOOK_RETRIES = int(os.getenv("WEBHOOK_RETRIES", "3"))
+WEBHOOK_CONCURRENCY = int(os.getenv("WEBHOOK_CONCURRENCY", "8"))
+# 콜백을 허용할 호스트 (쉼표 구분, ".example.com"은 하위 도메인 허용), 비어 있으면 콜백 사용 불가
+WEBHOOK_ALLOWED_HOSTS = [host.strip().lower() for host in os.getenv("WEBHOOK_ALLOWED_HOSTS", "").split(",") if host.strip()]
+
+
+class QueueFullError(Exception):
+    """작업 큐가 가득 차 새 작업을 받을 수 없음"""
+
+
+def validate_callback_url(url: Any, allowed_hosts: Optional[List[str]] = None) -> Optional[str]:
+    """callbackUrl 검사, 문제가 있으면 오류 메시지 반환 (https + 허용 호스트만, 내부 주소로의 요청 방지)"""
+    allowed_hosts = WEBHOOK_ALLOWED_HOSTS if allowed_hosts is None else allowed_hosts
+    if not isinstance(url, str):
+        return "callbackUrl은 문자열이어야 합니다."
+    try:
+        parts = urlsplit(url)
+        host = (parts.hostname or "").lower()
+        parts.port
+    except ValueError:
+        return "callbackUrl 형식이 올바르지 않습니다."
+    if parts.scheme != "https":
+        return "callbackUrl은 https만 허용됩니다."
+    if parts.username or parts.password:
+        return "callbackUrl에 사용자 정보를 넣을 수 없습니다."
+    for allowed in allowed_hosts:
+        if host == allowed or (allowed.startswith(".") and host.endswith(allowed)):
+            return None
+    return f"허용되지 않은 callbackUrl 호스트입니다: {host or '(없음)'}"
+
+
+def summarize_result(result: Any) -> Dict[str, Any]:
+    """항목별 결과(status: ok/error)로 작업 상태 결정 — 전부 실패면 failed, 일부 실패면 partial"""
+    items = result if isinstance(result, list) else [result]
+    statuses = [item.get("status") for item in items if isinstance(item, dict) and "status" in item]
+    failures = sum(1 for status in statuses if status == "error")
+    if not statuses or not failures:
+        return {"status": "succeeded", "failures": 0, "error": None}
+    if failures == len(statuses):
+        errors = [item.get("error") for item in items if isinstance(item, dict) and item.get("status") == "error"]
+        return {"status": "failed", "failures": failures, "error": errors[0] if len(errors) == 1 else f"{failures}개 항목 실패"}
+    return {"status": "partial", "failures": failures, "error": f"{failures}/{len(statuses)}개 항목 실패"}
+
+
+class JobQueue:
+    """asyncio 워커 풀 + 작업 상태 저장소"""
+
+    def __init__(self, workers: int = JOB_WORKERS, max_size: int = JOB_QUEUE_SIZE,
+                 result_ttl: float = JOB_RESULT_TTL, webhook_sender: Optional[Callable] = None):
+        self.workers = workers
+        self.max_size = max_size
+        self.result_ttl = result_ttl
+        self.webhook_sender = webhook_sender or send_webhook
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+        # 웹훅은 워커와 별도 태스크로 전송 (느린 콜백 호스트가 다음 작업 처리를 막지 않도록)
+        self._deliveries = set()
+        self._delivery_slots: Optional[asyncio.Semaphore] = None
+        self.stats = {"submitted": 0, "succeeded": 0, "partial": 0, "failed": 0, "webhooks_failed": 0}
+
+    def start(self):
+        """워커 시작 (서버 lifespan에서 호출)"""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._delivery_slots = asyncio.Semaphore(WEBHOOK_CONCURRENCY)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        print(f"✅ 작업 큐 시작 (워커 {self.workers}개)")
+
+    async def stop(self):
+        """워커 종료 (대기 중인 작업과 전송 중인 웹훅은 버림)"""
+        tasks = self._tasks + list(self._deliveries)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        self._deliveries.clear()
+        self._queue = None
+
+    def submit(self, kind: str, func: Callable, *args, callback_url: Optional[str] = None) -> Dict[str, Any]:
+        """작업 등록 후 상태 반환 (func는 동기 함수이며 워커 스레드에서 실행)"""
+        if self._queue is None:
+            raise RuntimeError("작업 큐가 시작되지 않았습니다.")
+        self._purge_expired()
+        job_id = uuid.uuid4().hex
+        job = {
+            "jobId": job_id,
+            "kind": kind,
+            "status": "queued",
+            "result": None,
+            "error": None,
+            "failures": 0,
+            "callbackUrl": callback_url,
+            "createdAt": time.time(),
+            "startedAt": None,
+            "finishedAt": None,
+        }
+        try:
+            self._queue.put_nowait((job_id, func, args))
+        except asyncio.QueueFull:
+            raise QueueFullError("작업 큐가 가득 찼습니다. 잠시 후 다시 시도해주세요.")
+        self.jobs[job_id] = job
+        self.stats["submitted"] += 1
+        return self.public(job)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.jobs.get(job_id)
+        return self.public(job) if job is not None else None
+
+    @staticmethod
+    def public(job: Dict[str, Any]) -> Dict[str, Any]:
+        """외부 응답용 작업 상태 (callbackUrl 제외)"""
+        return {key: value for key, value in job.items() if key != "callbackUrl"}
+
+    async def _worker(self):
+        while True:
+            job_id, func, args = await self._queue.get()
+            job = self.jobs.get(job_id)
+            try:
+                if job is None:
+                    continue
+                job["status"] = "running"
+                job["startedAt"] = time.time()
+                try:
+                    job["result"] = await asyncio.to_thread(func, *args)
+                    summary = summarize_result(job["result"])
+                    job.update(summary)
+                    self.stats[summary["status"]] += 1
+                except Exception as e:
+                    job["error"] = str(e)
+                    job["status"] = "failed"
+                    self.stats["failed"] += 1
+                    print(f"❌ 작업 실패 ({job['kind']} {job_id}): {e}")
+                job["finishedAt"] = time.time()
+
+                if job["callbackUrl"]:
+                    task = asyncio.create_task(self._deliver(job_id, job["callbackUrl"], self.public(job)))
+                    self._deliveries.add(task)
+                    task.add_done_callback(self._deliveries.discard)
+            finally:
+                self._queue.task_done()
+
+    async def _deliver(self, job_id: str, url: str, payload: Dict[str, Any]):
+        async with self._delivery_slots:
+            try:
+                delivered = await self.webhook_sender(url, payload)
+            except Exception as e:
+                print(f"⚠️ 웹훅 전송 중 오류 ({job_id}): {e}")
+                delivered = False
+        if not delivered:
+            self.stats["webhooks_failed"] += 1
+
+    def _purge_expired(self):
+        """보관 기간이 지난 완료 작업 제거"""
+        cutoff = time.time() - self.result_ttl
+        expired = [job_id for job_id, job in self.jobs.items()
+                   if job["finishedAt"] is not None and job["finishedAt"] < cutoff]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "tracked": len(self.jobs),
+            "workers": len(self._tasks),
+            "webhooks_pending": len(self._deliveries),
+        }
+
+
+async def send_webhook(url: str, payload: Dict[str, Any]) -> bool:
+    """작업 결과를 callbackUrl로 POST (실패 시 지수 백오프로 재시도)"""
+    import httpx
+    import orjson
+
+    error = validate_callback_url(url)
+    if error:
+        print(f"⚠️ 웹훅 전송 거부: {error}")
+        return False
+    body = orjson.dumps(payload, default=str)
+    async with httpx.AsyncClient(timeout=WEBHOOK_TIMEOUT) as client:
+        for attempt in range(WEBHOOK_RETRIES):
+            try:
+                response = await client.post(url, content=body, headers={"Content-Type": "application/json; charset=utf-8"})
+                if response.status_code < 500:
+                    return response.is_success
+            except httpx.HTTPError as e:
+                print(f"⚠️ 웹훅 전송 실패 ({attempt + 1}/{WEBHOOK_RETRIES}): {e}")
+            await asyncio.sleep(2 ** attempt)
+    return False
+
+
+# 프로세스 공용 작업 큐
+job_queue = JobQueue()
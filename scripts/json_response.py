@@ -0,0 +1,56 @@
+"""
+BSON 문서용 JSON 응답
+orjson으로 ObjectId, datetime 등을 한 번에 직렬화하여
+convert_objectid의 재귀 복사와 FastAPI의 이중 인코딩을 생략합니다.
+"""
+
+from typing import Any
+
+import orjson
+from bson.decimal128 import Decimal128
+from bson.objectid import ObjectId
+from fastapi.responses import JSONResponse
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def bson_default(obj: Any) -> Any:
+    """orjson이 직접 처리하지 못하는 BSON 타입 변환 (datetime은 orjson이 처리)"""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, Decimal128):
+        return str(obj.to_decimal())
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """BSON 문서를 포함한 값을 UTF-8 JSON 바이트로 직렬화"""
+    return orjson.dumps(content, default=bson_default, option=ORJSON_OPTIONS)
+
+
+class BSONJSONResponse(JSONResponse):
+    """ObjectId/datetime을 포함한 MongoDB 문서를 그대로 받는 JSON 응답"""
+
+    # 한글 응답을 위해 charset을 응답 클래스에 고정 (미들웨어로 헤더를 덮어쓰지 않음)
+    media_type = "application/json; charset=utf-8"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def bson_response(content: Any, status_code: int = 200) -> BSONJSONResponse:
+    """핸들러에서 직접 반환하여 FastAPI의 jsonable_encoder 단계를 건너뜀"""
+    return BSONJSONResponse(content=content, status_code=status_code)
+
+
+def convert_objectid(obj):
+    """ObjectId를 문자열로 변환하는 기존 재귀 함수 (벤치마크 비교용)"""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    elif isinstance(obj, dict):
+        return {key: convert_objectid(value) for key, value in obj.items()}
+    elif isinstance(obj, list):
+        return [convert_objectid(item) for item in obj]
+    return obj
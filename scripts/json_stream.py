@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+대용량 JSON / NDJSON 시드 파일 스트리밍 파서
+파일 전체를 json.load 하지 않고 고정 크기 청크로 읽으면서
+{"concepts": [...]} 같은 최상위 객체의 배열 항목, 최상위 배열 항목, NDJSON 줄을 하나씩 돌려줍니다.
+버퍼에는 현재 청크와 파싱 중인 항목 하나만 남으므로 메모리 사용량이 파일 크기와 무관합니다.
+"""
+
+import codecs
+import json
+from typing import Any, Iterable, Iterator, Optional, Tuple
+
+CHUNK_SIZE = 64 * 1024
+# 첫 줄이 이 길이 안에서 완전한 JSON이면 NDJSON으로 판단
+NDJSON_PROBE_LIMIT = 1024 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+def read_chunks(file, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """텍스트/바이너리 파일을 문자열 청크로 읽기 (바이너리는 UTF-8, BOM 제거)"""
+    decoder = None
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        if isinstance(chunk, bytes):
+            decoder = decoder or codecs.getincrementaldecoder("utf-8-sig")()
+            chunk = decoder.decode(chunk)
+        if chunk:
+            yield chunk
+    if decoder is not None:
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+
+class JSONStream:
+    """청크 단위 버퍼 위에서 값 하나씩 raw_decode"""
+
+    def __init__(self, chunks: Iterable[str]):
+        self.chunks = iter(chunks)
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """다음 청크를 이어 붙임 (이미 읽은 부분은 버림)"""
+        if self.eof:
+            return False
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """공백을 건너뛴 다음 문자 (파일 끝이면 빈 문자열)"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"JSON 형식 오류: '{char}' 대신 '{found or 'EOF'}'")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """다음 JSON 값 하나 (청크 경계에 걸리면 더 읽어서 다시 파싱)"""
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # 숫자/리터럴이 버퍼 끝에서 잘렸을 수 있으므로 더 읽어서 확인
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+    def array_items(self) -> Iterator[Any]:
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            separator = self.peek()
+            self.pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(f"JSON 형식 오류: 배열 항목 뒤에 '{separator or 'EOF'}'")
+
+    def probe_first_line(self) -> Tuple[Optional[Any], bool]:
+        """(첫 줄이 그 자체로 완전한 JSON 값이면 그 값, 아니면 None / 다음 줄에 내용이 더 있는지) — 버퍼 위치는 유지"""
+        self.peek()
+        while "\n" not in self.buf[self.pos:] and len(self.buf) - self.pos < NDJSON_PROBE_LIMIT:
+            if not self._fill():
+                break
+        line, _, rest = self.buf[self.pos:].partition("\n")
+        if not rest.strip() and not self.eof:
+            self._fill()
+            rest = self.buf[self.pos:].partition("\n")[2]
+        try:
+            return json.loads(line), bool(rest.strip())
+        except json.JSONDecodeError:
+            return None, bool(rest.strip())
+
+
+def iter_json_items(chunks: Iterable[str], key: Optional[str] = None) -> Iterator[Any]:
+    """최상위 배열 또는 최상위 객체의 key 배열 항목을 하나씩 반환"""
+    stream = JSONStream(chunks)
+    first = stream.peek()
+    if first == "[":
+        yield from stream.array_items()
+        return
+    stream.expect("{")
+    while stream.peek() != "}":
+        name = stream.value()
+        stream.expect(":")
+        if name == key and stream.peek() == "[":
+            yield from stream.array_items()
+            return
+        # 다른 키의 값은 읽고 버림
+        stream.value()
+        if stream.peek() == ",":
+            stream.pos += 1
+    raise ValueError(f"'{key}' 키가 없습니다.")
+
+
+def iter_ndjson(chunks: Iterable[str]) -> Iterator[Any]:
+    """NDJSON(줄마다 JSON 값) 항목을 하나씩 반환"""
+    stream = JSONStream(chunks)
+    while stream.peek():
+        yield stream.value()
+
+
+def iter_seed_items(file, key: Optional[str] = None, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """시드 파일 항목 스트리밍 (NDJSON / 최상위 배열 / {key: [...]} 자동 판별)"""
+    stream = JSONStream(read_chunks(file, chunk_size))
+    if stream.peek() == "{":
+        first_line, has_more = stream.probe_first_line()
+        # 첫 줄이 완전한 객체이고 다음 줄이 이어지면 NDJSON (한 줄짜리 파일은 {key: [...]} 객체로 취급)
+        if isinstance(first_line, dict) and (has_more or key is None) and not isinstance(first_line.get(key), list):
+            while stream.peek():
+                yield stream.value()
+            return
+    # 이미 버퍼에 읽어 둔 내용부터 이어서 파싱
+    yield from iter_json_items(_resume(stream), key)
+
+
+def _resume(stream: JSONStream) -> Iterator[str]:
+    yield stream.buf[stream.pos:]
+    yield from stream.chunks
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+베이지안 지식 추적(BKT) 숙련도 엔진
+answer_attempt 컬렉션의 채점 기록(userld, unitid, isCorrect, scoredAt)을 시간 순서대로 받아
+사용자 × 개념 숙련도 행렬을 시도 하나당 O(1)로 갱신합니다.
+진단마다 풀이 이력을 다시 집계하지 않고, 학습 경로 생성 시 mastery_vector()를 그대로 사용합니다.
+
+상태는 .npz 파일로 저장하고 마지막으로 반영한 _id(삽입 순서) 이후 기록만 이어서 반영합니다:
+    python knowledge_tracing.py [--state ../data/mastery_state.npz] [--full]
+"""
+
+import argparse
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+AI_DIR = Path(__file__).parent
+
+DEFAULT_STATE_PATH = AI_DIR.parent / "data" / "mastery_state.npz"
+
+# BKT 기본 파라미터 (개념별 파라미터가 없을 때 사용)
+P_INIT = 0.3     # 처음부터 알고 있을 확률
+P_LEARN = 0.15   # 한 번 풀 때마다 새로 익힐 확률
+P_SLIP = 0.1     # 알면서 틀릴 확률
+P_GUESS = 0.2    # 모르면서 맞힐 확률
+
+# 이 값 미만이면 취약 개념
+MASTERY_THRESHOLD = 0.6
+# 서버에서 새 채점 기록을 확인하는 최소 간격(초)
+SYNC_INTERVAL = 30.0
+# 서버가 숙련도 상태를 파일로 저장하는 최소 간격(초)
+SAVE_INTERVAL = 300.0
+# 여러 서버가 거의 동시에 넣은 기록은 _id 순서가 뒤바뀔 수 있으므로 이만큼 겹쳐 읽고 _id로 중복 제거
+ID_OVERLAP = timedelta(minutes=5)
+
+
+class MasteryTracker:
+    """사용자 × 개념 숙련도 행렬 (행/열은 필요할 때 두 배씩 확장)"""
+
+    def __init__(self, p_init: float = P_INIT, p_learn: float = P_LEARN,
+                 p_slip: float = P_SLIP, p_guess: float = P_GUESS, capacity: int = 64):
+        self.p_init = p_init
+        self.p_learn = p_learn
+        self.p_slip = p_slip
+        self.p_guess = p_guess
+        self.users: Dict[Any, int] = {}
+        self.concepts: Dict[str, int] = {}
+        self.mastery = np.full((capacity, capacity), p_init, dtype=np.float32)
+        self.attempts = np.zeros((capacity, capacity), dtype=np.uint32)
+        # API 응답용 최신 scoredAt
+        self.checkpoint: Optional[datetime] = None
+        # 이어 읽기 기준: 마지막으로 반영한 _id와 겹쳐 읽는 구간에서 이미 반영한 _id
+        self.last_id: Any = None
+        self.applied_ids: Dict[str, Any] = {}
+
+    def _grow(self, rows: int, cols: int):
+        old_rows, old_cols = self.mastery.shape
+        if rows <= old_rows and cols <= old_cols:
+            return
+        new_rows = max(old_rows, 1)
+        while new_rows < rows:
+            new_rows *= 2
+        new_cols = max(old_cols, 1)
+        while new_cols < cols:
+            new_cols *= 2
+        mastery = np.full((new_rows, new_cols), self.p_init, dtype=np.float32)
+        attempts = np.zeros((new_rows, new_cols), dtype=np.uint32)
+        mastery[:old_rows, :old_cols] = self.mastery
+        attempts[:old_rows, :old_cols] = self.attempts
+        self.mastery, self.attempts = mastery, attempts
+
+    def _index(self, user_id: Any, concept: str):
+        u = self.users.get(user_id)
+        c = self.concepts.get(concept)
+        # 행렬을 먼저 키운 뒤 이름을 등록 (동시에 읽는 요청이 범위를 벗어난 행/열을 보지 않도록)
+        self._grow(len(self.users) + (u is None), len(self.concepts) + (c is None))
+        if u is None:
+            u = self.users[user_id] = len(self.users)
+        if c is None:
+            c = self.concepts[concept] = len(self.concepts)
+        return u, c
+
+    def update(self, user_id: Any, concept: str, is_correct: bool) -> float:
+        """채점 한 건 반영 (관측 후 사후 확률 → 학습 전이) 후 새 숙련도 반환"""
+        u, c = self._index(user_id, concept)
+        p = float(self.mastery[u, c])
+        if is_correct:
+            known = p * (1 - self.p_slip)
+            posterior = known / (known + (1 - p) * self.p_guess)
+        else:
+            known = p * self.p_slip
+            posterior = known / (known + (1 - p) * (1 - self.p_guess))
+        p = posterior + (1 - posterior) * self.p_learn
+        self.mastery[u, c] = p
+        self.attempts[u, c] += 1
+        return p
+
+    def apply_attempts(self, attempts: Iterable[Dict[str, Any]],
+                       concept_of: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None) -> int:
+        """answer_attempt 문서들을 순서대로 반영, 반영한 건수 반환 (이미 반영한 _id는 건너뜀)"""
+        concept_of = concept_of or (lambda attempt: str(attempt["unitid"]) if attempt.get("unitid") else None)
+        applied = 0
+        for attempt in attempts:
+            attempt_id = attempt.get("_id")
+            if attempt_id is not None:
+                if str(attempt_id) in self.applied_ids:
+                    continue
+                self.applied_ids[str(attempt_id)] = attempt_id
+                if self.last_id is None or attempt_id > self.last_id:
+                    self.last_id = attempt_id
+            concept = concept_of(attempt)
+            if concept is None or attempt.get("userld") is None:
+                continue
+            self.update(attempt["userld"], concept, bool(attempt.get("isCorrect")))
+            scored_at = attempt.get("scoredAt")
+            if scored_at is not None and (self.checkpoint is None or scored_at > self.checkpoint):
+                self.checkpoint = scored_at
+            applied += 1
+        return applied
+
+    def forget_ids_before(self, floor: Any):
+        """겹쳐 읽는 구간보다 오래된 _id는 중복 확인 목록에서 제거"""
+        self.applied_ids = {key: value for key, value in self.applied_ids.items() if value >= floor}
+
+    @property
+    def concept_names(self) -> List[str]:
+        return list(self.concepts)
+
+    def mastery_vector(self, user_id: Any) -> np.ndarray:
+        """concept_names 순서의 숙련도 벡터 (처음 보는 사용자는 p_init)"""
+        u = self.users.get(user_id)
+        if u is None:
+            return np.full(len(self.concepts), self.p_init, dtype=np.float32)
+        return self.mastery[u, :len(self.concepts)].copy()
+
+    def mastery_of(self, user_id: Any, concepts: Iterable[str]) -> Dict[str, float]:
+        """지정한 개념들의 숙련도 (기록이 없는 개념은 p_init)"""
+        u = self.users.get(user_id)
+        result = {}
+        for concept in concepts:
+            c = self.concepts.get(concept)
+            result[concept] = float(self.mastery[u, c]) if u is not None and c is not None else self.p_init
+        return result
+
+    def weak_concepts(self, user_id: Any, threshold: float = MASTERY_THRESHOLD) -> List[str]:
+        """한 번 이상 풀어 본 개념 중 숙련도가 threshold 미만인 개념 (낮은 순)"""
+        u = self.users.get(user_id)
+        if u is None:
+            return []
+        n = len(self.concepts)
+        vector = self.mastery[u, :n]
+        seen = self.attempts[u, :n] > 0
+        candidates = np.flatnonzero(seen & (vector < threshold))
+        names = self.concept_names
+        return [names[c] for c in candidates[np.argsort(vector[candidates], kind="stable")]]
+
+    def save(self, path: Path = DEFAULT_STATE_PATH):
+        """숙련도 상태를 .npz로 저장 (임시 파일에 쓴 뒤 교체)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        rows, cols = len(self.users), len(self.concepts)
+        tmp_path = path.with_name(path.stem + ".tmp.npz")
+        np.savez_compressed(
+            tmp_path,
+            mastery=self.mastery[:rows, :cols],
+            attempts=self.attempts[:rows, :cols],
+            users=np.array([str(user) for user in self.users], dtype=object),
+            user_is_int=np.array([isinstance(user, int) for user in self.users], dtype=bool),
+            concepts=np.array(self.concept_names, dtype=object),
+            params=np.array([self.p_init, self.p_learn, self.p_slip, self.p_guess]),
+            checkpoint=np.array(self.checkpoint.isoformat() if self.checkpoint else ""),
+            last_id=np.array(str(self.last_id) if self.last_id is not None else ""),
+            applied_ids=np.array(list(self.applied_ids), dtype=object),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_STATE_PATH) -> "MasteryTracker":
+        with np.load(path, allow_pickle=True) as data:
+            p_init, p_learn, p_slip, p_guess = data["params"].tolist()
+            tracker = cls(p_init, p_learn, p_slip, p_guess, capacity=1)
+            users = [int(user) if is_int else user
+                     for user, is_int in zip(data["users"].tolist(), data["user_is_int"].tolist())]
+            tracker.users = {user: i for i, user in enumerate(users)}
+            tracker.concepts = {concept: i for i, concept in enumerate(data["concepts"].tolist())}
+            tracker._grow(len(users), len(tracker.concepts))
+            mastery = data["mastery"]
+            tracker.mastery[:mastery.shape[0], :mastery.shape[1]] = mastery
+            tracker.attempts[:mastery.shape[0], :mastery.shape[1]] = data["attempts"]
+            checkpoint = str(data["checkpoint"])
+            tracker.checkpoint = datetime.fromisoformat(checkpoint) if checkpoint else None
+            if "last_id" in data.files and str(data["last_id"]):
+                tracker.last_id = _restore_id(str(data["last_id"]))
+                tracker.applied_ids = {key: _restore_id(key) for key in data["applied_ids"].tolist()}
+        return tracker
+
+
+def _restore_id(value: str) -> Any:
+    """저장된 _id 문자열 복원 (ObjectId 형식이면 ObjectId로)"""
+    try:
+        from bson import ObjectId
+    except ImportError:
+        return value
+    return ObjectId(value) if ObjectId.is_valid(value) else value
+
+
+def _default_id_floor(last_id: Any) -> Any:
+    """마지막 _id 생성 시각에서 ID_OVERLAP만큼 이전의 ObjectId"""
+    from bson import ObjectId
+    return ObjectId.from_datetime(last_id.generation_time - ID_OVERLAP)
+
+
+def sync_from_answer_attempts(tracker: MasteryTracker, collection, batch_size: int = 5000,
+                              id_floor: Optional[Callable[[Any], Any]] = None) -> int:
+    """마지막으로 반영한 _id 이후 기록을 삽입 순서로 읽어 반영
+    scoredAt 기준과 달리 같은 시각의 기록이나 늦게 도착한(scoredAt이 과거인) 기록도 빠지지 않음"""
+    query = {}
+    if tracker.last_id is not None:
+        floor = (id_floor or _default_id_floor)(tracker.last_id)
+        tracker.forget_ids_before(floor)
+        query = {"_id": {"$gte": floor}}
+    cursor = collection.find(
+        query, {"_id": 1, "userld": 1, "unitid": 1, "isCorrect": 1, "scoredAt": 1}
+    ).sort("_id", 1).batch_size(batch_size)
+    return tracker.apply_attempts(cursor)
+
+
+_tracker: Optional[MasteryTracker] = None
+_synced_at = 0.0
+_saved_at = 0.0
+_lock = threading.Lock()
+_sync_lock = threading.Lock()
+
+
+def _sync_shared(collection, state_path: Path):
+    """공용 추적기에 새 기록 반영, SAVE_INTERVAL마다 상태 저장 (_sync_lock을 잡은 상태에서 호출)"""
+    global _synced_at, _saved_at
+    try:
+        applied = sync_from_answer_attempts(_tracker, collection)
+        if applied and (not _saved_at or time.monotonic() - _saved_at >= SAVE_INTERVAL):
+            _tracker.save(state_path)
+            _saved_at = time.monotonic()
+    except Exception as e:
+        print(f"⚠️ 채점 기록 반영 실패, 기존 숙련도 사용: {e}")
+    _synced_at = time.monotonic()
+
+
+def get_mastery_tracker(collection=None, state_path: Path = DEFAULT_STATE_PATH, wait: bool = False) -> MasteryTracker:
+    """프로세스 공용 숙련도 추적기 (저장된 상태에서 시작해 SYNC_INTERVAL마다 새 기록만 반영)
+    다른 스레드가 반영 중이면 기다리지 않고 현재 상태를 반환 (wait=True면 끝날 때까지 대기)"""
+    global _tracker
+    with _lock:
+        if _tracker is None:
+            _tracker = MasteryTracker.load(state_path) if Path(state_path).exists() else MasteryTracker()
+    if collection is not None and time.monotonic() - _synced_at >= SYNC_INTERVAL:
+        if _sync_lock.acquire(blocking=wait):
+            try:
+                if time.monotonic() - _synced_at >= SYNC_INTERVAL:
+                    _sync_shared(collection, state_path)
+            finally:
+                _sync_lock.release()
+    return _tracker
+
+
+def start_mastery_warmup(collection, state_path: Path = DEFAULT_STATE_PATH) -> threading.Thread:
+    """서버 시작 시 상태 로드와 밀린 기록 반영을 백그라운드 스레드에서 시작 (요청 경로에서 전체 이력을 다시 읽지 않도록)"""
+    thread = threading.Thread(target=get_mastery_tracker, args=(collection, state_path, True), daemon=True)
+    thread.start()
+    return thread
+
+
+def main():
+    from dotenv import load_dotenv
+    from pymongo import MongoClient
+
+    parser = argparse.ArgumentParser(description="answer_attempt 기반 숙련도(BKT) 갱신")
+    parser.add_argument("--state", default=str(DEFAULT_STATE_PATH), help="숙련도 상태 파일 경로")
+    parser.add_argument("--full", action="store_true", help="저장된 상태를 무시하고 처음부터 다시 계산")
+    args = parser.parse_args()
+
+    load_dotenv(AI_DIR / ".env")
+    state_path = Path(args.state)
+    if state_path.exists() and not args.full:
+        tracker = MasteryTracker.load(state_path)
+        print(f"📁 숙련도 상태 로드: 사용자 {len(tracker.users)}명, 개념 {len(tracker.concepts)}개, "
+              f"기준 시각 {tracker.checkpoint}, 마지막 _id {tracker.last_id}")
+    else:
+        tracker = MasteryTracker()
+
+    client = MongoClient(os.getenv("MONGODB_URI"))
+    try:
+        db = client[os.getenv("MONGODB_DB", "nerdmath")]
+        applied = sync_from_answer_attempts(tracker, db.answer_attempt)
+        tracker.save(state_path)
+        print(f"✅ 채점 기록 {applied}건 반영 (사용자 {len(tracker.users)}명, 개념 {len(tracker.concepts)}개) "
+              f"→ {state_path} ({datetime.now(timezone.utc).isoformat()})")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
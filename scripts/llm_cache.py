@@ -0,0 +1,229 @@
+"""
+LLM 응답 캐시
+(problem_id, 프롬프트 이름, 프롬프트 내용 해시, 모델, 정규화된 질문)을 키로
+프로세스 내 LRU 캐시와 MongoDB 캐시 두 단계로 GPT 응답을 재사용하고,
+두 단계 모두 없으면 배치로 사전 생성된 응답(precomputed_answers)을 조회합니다.
+프롬프트 파일 내용이 바뀌면 해시가 달라지므로 기존 캐시는 자동으로 무효화됩니다.
+"""
+
+import asyncio
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+# 질문 끝의 의미 없는 문장부호
+_TRAILING_PUNCT = re.compile(r"[\s\.\?\!。？！~]+$")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_question(question: Optional[str]) -> str:
+    """질문 문자열 정규화 (유니코드 NFKC, 공백 압축, 소문자, 끝 문장부호 제거)"""
+    if not question:
+        return ""
+    text = unicodedata.normalize("NFKC", str(question)).strip().lower()
+    text = _WHITESPACE.sub(" ", text)
+    return _TRAILING_PUNCT.sub("", text)
+
+
+def prompt_fingerprint(prompt_text: str) -> str:
+    """프롬프트 내용 해시 (프롬프트 파일 변경 감지용)"""
+    return hashlib.sha256(prompt_text.encode("utf-8")).hexdigest()[:16]
+
+
+def make_cache_key(problem_id: str, prompt_name: str, prompt_text: str, model: str, question: str) -> str:
+    """캐시 키 생성"""
+    raw = "\x1f".join([
+        str(problem_id),
+        prompt_name,
+        prompt_fingerprint(prompt_text),
+        model,
+        normalize_question(question),
+    ])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMAnswerCache:
+    """메모리 LRU + MongoDB 2단계 LLM 응답 캐시"""
+
+    def __init__(self, collection=None, max_memory_items: int = 2000, memory_ttl: int = 3600,
+                 mongo_ttl: int = 7 * 24 * 3600, max_mongo_items: int = 50000,
+                 eviction_check_interval: int = 100):
+        self.collection = collection
+        self.precomputed_collection = None
+        self.max_memory_items = max_memory_items
+        self.memory_ttl = memory_ttl
+        self.mongo_ttl = mongo_ttl
+        self.max_mongo_items = max_mongo_items
+        self.eviction_check_interval = eviction_check_interval
+
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_since_check = 0
+        self._evicting = False
+        self._indexes_ready = False
+        self.stats = {"memory_hits": 0, "mongo_hits": 0, "precomputed_hits": 0,
+                      "misses": 0, "writes": 0, "evictions": 0}
+
+    def set_collection(self, collection):
+        """MongoDB 캐시 컬렉션 연결 (연결 후 인덱스 보장)"""
+        self.collection = collection
+        self._indexes_ready = False
+
+    def set_precomputed_collection(self, collection):
+        """사전 생성 응답 컬렉션 연결 (precompute_answers.py 배치 결과)"""
+        self.precomputed_collection = collection
+
+    def _ensure_indexes(self):
+        if self.collection is None or self._indexes_ready:
+            return
+        try:
+            self.collection.create_index("key", unique=True)
+            # expiresAt 시각이 지나면 MongoDB가 자동 삭제
+            self.collection.create_index("expiresAt", expireAfterSeconds=0)
+            self.collection.create_index("createdAt")
+            self._indexes_ready = True
+        except Exception as e:
+            print(f"⚠️ LLM 캐시 인덱스 생성 실패: {e}")
+
+    def _memory_get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            return value
+
+    def _memory_set(self, key: str, value: Dict[str, Any]):
+        with self._lock:
+            self._memory[key] = (time.monotonic() + self.memory_ttl, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """캐시 조회 (메모리 → MongoDB → 사전 생성 응답 순)"""
+        value = self._memory_get(key)
+        if value is not None:
+            self.stats["memory_hits"] += 1
+            return value
+
+        if self.collection is not None:
+            try:
+                doc = self.collection.find_one(
+                    {"key": key, "expiresAt": {"$gt": datetime.utcnow()}},
+                    {"_id": 0, "answer": 1}
+                )
+                if doc:
+                    self.stats["mongo_hits"] += 1
+                    self._memory_set(key, doc["answer"])
+                    return doc["answer"]
+            except Exception as e:
+                print(f"⚠️ LLM 캐시 조회 실패: {e}")
+
+        if self.precomputed_collection is not None:
+            try:
+                doc = self.precomputed_collection.find_one({"key": key}, {"_id": 0, "answer": 1})
+                if doc:
+                    self.stats["precomputed_hits"] += 1
+                    self._memory_set(key, doc["answer"])
+                    return doc["answer"]
+            except Exception as e:
+                print(f"⚠️ 사전 생성 응답 조회 실패: {e}")
+
+        self.stats["misses"] += 1
+        return None
+
+    def set(self, key: str, answer: Dict[str, Any], meta: Optional[Dict[str, Any]] = None):
+        """캐시 저장 (메모리 + MongoDB)"""
+        self._memory_set(key, answer)
+        self.stats["writes"] += 1
+
+        if self.collection is None:
+            return
+        try:
+            self._ensure_indexes()
+            now = datetime.utcnow()
+            doc = {
+                "key": key,
+                "answer": answer,
+                "createdAt": now,
+                "expiresAt": now + timedelta(seconds=self.mongo_ttl),
+            }
+            if meta:
+                doc.update(meta)
+            self.collection.replace_one({"key": key}, doc, upsert=True)
+
+            self._writes_since_check += 1
+            if self._writes_since_check >= self.eviction_check_interval:
+                self._writes_since_check = 0
+                self._schedule_eviction()
+        except Exception as e:
+            print(f"⚠️ LLM 캐시 저장 실패: {e}")
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        """비동기 핸들러용 조회 (메모리 적중은 바로 반환, MongoDB 조회는 워커 스레드에서)"""
+        value = self._memory_get(key)
+        if value is not None:
+            self.stats["memory_hits"] += 1
+            return value
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, answer: Dict[str, Any], meta: Optional[Dict[str, Any]] = None):
+        """비동기 핸들러용 저장 (MongoDB 쓰기는 워커 스레드에서)"""
+        await asyncio.to_thread(self.set, key, answer, meta)
+
+    def _schedule_eviction(self):
+        """상한 초과 정리는 백그라운드 스레드에서 한 번에 하나만 실행 (요청 경로에서 count/find/delete 하지 않음)"""
+        with self._lock:
+            if self._evicting:
+                return
+            self._evicting = True
+        threading.Thread(target=self._run_eviction, daemon=True).start()
+
+    def _run_eviction(self):
+        try:
+            self._evict_mongo_overflow()
+        except Exception as e:
+            print(f"⚠️ LLM 캐시 정리 실패: {e}")
+        finally:
+            self._evicting = False
+
+    def _evict_mongo_overflow(self):
+        """MongoDB 캐시 문서 수가 상한을 넘으면 오래된 문서부터 삭제"""
+        overflow = self.collection.estimated_document_count() - self.max_mongo_items
+        if overflow <= 0:
+            return
+        old_ids = [doc["_id"] for doc in
+                   self.collection.find({}, {"_id": 1}).sort("createdAt", 1).limit(overflow)]
+        if old_ids:
+            result = self.collection.delete_many({"_id": {"$in": old_ids}})
+            self.stats["evictions"] += result.deleted_count
+
+    def clear_memory(self):
+        """메모리 캐시 비우기"""
+        with self._lock:
+            self._memory.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """적중/미스 통계"""
+        hits = self.stats["memory_hits"] + self.stats["mongo_hits"] + self.stats["precomputed_hits"]
+        total = hits + self.stats["misses"]
+        return {
+            **self.stats,
+            "memory_items": len(self._memory),
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+        }
+
+
+# 프로세스 공용 캐시 인스턴스
+answer_cache = LLMAnswerCache()
@@ -0,0 +1,111 @@
+"""
+공유 비동기 OpenAI 클라이언트
+프로세스당 하나의 AsyncOpenAI 클라이언트와 keep-alive HTTP 커넥션 풀을 재사용하고,
+동시 LLM 호출 수를 세마포어로 제한합니다.
+"""
+
+import asyncio
+import os
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+# 환경변수로 조정 가능한 풀/동시성 설정
+DEFAULT_MODEL = "gpt-4o"
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "200"))
+OPENAI_MAX_KEEPALIVE = int(os.getenv("OPENAI_MAX_KEEPALIVE", "50"))
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "200"))
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+
+_client: Optional[AsyncOpenAI] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def get_async_client() -> AsyncOpenAI:
+    """프로세스 공용 AsyncOpenAI 클라이언트 반환 (최초 호출 시 생성)"""
+    global _client
+    if _client is None:
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=OPENAI_MAX_KEEPALIVE,
+            ),
+            timeout=httpx.Timeout(OPENAI_TIMEOUT, connect=10.0),
+        )
+        _client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            base_url=os.getenv("OPENAI_BASE_URL") or None,
+            http_client=http_client,
+            max_retries=OPENAI_MAX_RETRIES,
+        )
+    return _client
+
+
+def get_semaphore() -> asyncio.Semaphore:
+    """동시 LLM 호출 수 제한용 세마포어 반환"""
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+    return _semaphore
+
+
+# 프롬프트별 사용자 입력 라벨 (통합 API와 사전 생성 배치가 같은 입력을 만들도록 공유)
+PROMPT_INPUT_LABELS = {
+    "solve_prompt_v1": "사용자 질문",
+    "concept_prompt_v1": "개념 설명 요청",
+    "rag_prompt_v1": "추천 요청",
+}
+
+
+def build_problem_text(problem: Dict, prompt_name: str, user_text: str) -> str:
+    """문제 본문과 사용자 입력으로 GPT 사용자 메시지 구성"""
+    return f"문제: {problem['content']['question']}\n\n{PROMPT_INPUT_LABELS[prompt_name]}: {user_text}"
+
+
+def build_messages(system_prompt: str, user_text: str) -> List[Dict[str, str]]:
+    """시스템 프롬프트와 사용자 입력으로 메시지 목록 구성"""
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_text},
+    ]
+
+
+async def chat_json(system_prompt: str, user_text: str, model: Optional[str] = None) -> str:
+    """JSON 응답 형식으로 채팅 완성을 요청하고 응답 본문 문자열을 반환"""
+    client = get_async_client()
+    async with get_semaphore():
+        response = await client.chat.completions.create(
+            model=model or DEFAULT_MODEL,
+            messages=build_messages(system_prompt, user_text),
+            response_format={"type": "json_object"},
+        )
+    return response.choices[0].message.content
+
+
+async def stream_chat_json(system_prompt: str, user_text: str, model: Optional[str] = None) -> AsyncIterator[str]:
+    """JSON 응답 형식으로 스트리밍 채팅 완성을 요청하고 토큰 조각을 순서대로 반환"""
+    client = get_async_client()
+    async with get_semaphore():
+        stream = await client.chat.completions.create(
+            model=model or DEFAULT_MODEL,
+            messages=build_messages(system_prompt, user_text),
+            response_format={"type": "json_object"},
+            stream=True,
+        )
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+
+
+async def close_async_client():
+    """서버 종료 시 커넥션 풀 정리"""
+    global _client, _semaphore
+    if _client is not None:
+        await _client.close()
+    _client = None
+    _semaphore = None
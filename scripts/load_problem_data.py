@@ -7,6 +7,7 @@
 import os
 import sys
 import json
+import argparse
 from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
@@ -17,6 +18,9 @@ from bson import ObjectId
 AI_DIR = Path(__file__).parent
 sys.path.insert(0, str(AI_DIR))
 
+from problem_bulk_loader import (BULK_BATCH_SIZE, BULK_WORKERS, bulk_upsert, print_report,
+                                 require_problem_fields, validate_parallel)
+
 # .env 파일 로드
 load_dotenv(AI_DIR / ".env")
 
@@ -201,6 +205,32 @@ class ProblemDataLoader:
             print(f"❌ MongoDB 저장 실패: {e}")
             return False
     
+    def save_problems_bulk(self, problems, workers=BULK_WORKERS, batch_size=BULK_BATCH_SIZE, overwrite=True):
+        """필수 필드를 검증하고 problemId 기준으로 배치 upsert를 동시에 실행"""
+        if not problems:
+            print("❌ 저장할 문제가 없습니다.")
+            return False
+        
+        try:
+            items = ((f"problemId {problem.get('problemId', 'unknown')}", problem) for problem in problems)
+            # 이미 변환된 문서는 필드 확인만 하므로 프로세스 풀로 보내지 않고 바로 검증
+            # (문서를 피클링해 넘기는 비용이 검증보다 큼, 프로세스 풀은 load_problem_to_import의 원본 줄 파싱용)
+            valid_problems, errors = validate_parallel(items, require_problem_fields, workers=1)
+            print(f"✅ 검증 통과 {len(valid_problems)}개, 오류 {len(errors)}개")
+            
+            # upsert가 problemId 인덱스를 쓰도록 인덱스를 먼저 생성
+            self.create_problem_indexes()
+            
+            report = bulk_upsert(self.db.problem, valid_problems, batch_size=batch_size,
+                                 workers=workers, overwrite=overwrite)
+            print_report(report, errors)
+            print(f"📈 총 problem 컬렉션 문서 수: {self.db.problem.estimated_document_count()}")
+            return len(report["errors"]) < report["total"]
+            
+        except Exception as e:
+            print(f"❌ MongoDB 일괄 저장 실패: {e}")
+            return False
+    
     def create_problem_indexes(self):
         """problem 컬렉션에 인덱스 생성"""
         try:
@@ -260,8 +290,8 @@ class ProblemDataLoader:
             print(f"❌ 인덱스 생성 실패: {e}")
             return False
     
-    def load_and_save_all_problems(self):
-        """모든 문제 데이터를 로드하고 MongoDB에 저장"""
+    def load_and_save_all_problems(self, bulk=False, workers=BULK_WORKERS, batch_size=BULK_BATCH_SIZE, overwrite=True):
+        """모든 문제 데이터를 로드하고 MongoDB에 저장 (bulk=True면 병렬 일괄 upsert 모드)"""
         try:
             # 1. 단원테스트 문제 로드
             unit_problems = self.load_unit_test_problems()
@@ -276,6 +306,8 @@ class ProblemDataLoader:
             print(f"  - 진단테스트: {len(diagnostic_problems)}개")
             
             # 4. MongoDB에 저장
+            if all_problems and bulk:
+                return self.save_problems_bulk(all_problems, workers, batch_size, overwrite)
             if all_problems:
                 success = self.save_problems_to_mongodb(all_problems)
                 if success:
@@ -297,6 +329,13 @@ class ProblemDataLoader:
 
 def main():
     """메인 함수"""
+    parser = argparse.ArgumentParser(description="단원테스트/진단테스트 문제 → problem 컬렉션 저장")
+    parser.add_argument("--bulk", action="store_true", help="병렬 검증 + 일괄 upsert 모드")
+    parser.add_argument("--workers", type=int, default=BULK_WORKERS, help="검증 프로세스 / 동시 배치 수")
+    parser.add_argument("--batch-size", type=int, default=BULK_BATCH_SIZE, help="bulk_write 배치 크기")
+    parser.add_argument("--skip-existing", action="store_true", help="이미 있는 problemId는 덮어쓰지 않음")
+    args = parser.parse_args()
+    
     print("🚀 Problem 데이터 MongoDB 저장 시작")
     print("=" * 60)
     
@@ -308,7 +347,7 @@ def main():
             print("❌ MongoDB 연결 실패")
             return
         
-        success = loader.load_and_save_all_problems()
+        success = loader.load_and_save_all_problems(args.bulk, args.workers, args.batch_size, not args.skip_existing)
         
         if success:
             print("\n🎉 Problem 데이터 MongoDB 저장 완료!")
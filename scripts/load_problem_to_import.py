@@ -8,16 +8,20 @@ problem_to_import.txt 파일의 데이터를 MongoDB nerdmath 데이터베이스
 import os
 import sys
 import json
+import argparse
 from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
 from pymongo import MongoClient
-from pymongo.errors import DuplicateKeyError
 
 # AI 디렉토리를 Python 경로에 추가
 AI_DIR = Path(__file__).parent
 sys.path.insert(0, str(AI_DIR))
 
+from problem_bulk_loader import (BULK_BATCH_SIZE, BULK_WORKERS, bulk_upsert, clean_problem,
+                                 parse_problem_line, print_report, validate_parallel)
+from content_hash_sync import print_sync_report, sync_by_hash, with_content_hash
+
 # .env 파일 로드
 load_dotenv(AI_DIR / ".env")
 
@@ -81,97 +85,11 @@ class ProblemImportLoader:
             return []
     
     def validate_and_clean_problem(self, problem, line_num):
-        """문제 데이터 검증 및 정리"""
+        """문제 데이터 검증 및 정리 (테이블 정의서 기준 필수 필드/타입)"""
         try:
-            # 1. 필수 필드 검증 (테이블 정의서 기준)
-            required_fields = [
-                "problemId", "unitId", "grade", "chapter", "context", 
-                "cognitiveType", "level", "diagnosticTest", "type", 
-                "tags", "content", "correctAnswer", "explanation", 
-                "createdAt", "updatedAt"
-            ]
-            
-            missing_fields = []
-            for field in required_fields:
-                if field not in problem:
-                    missing_fields.append(field)
-            
-            if missing_fields:
-                print(f"⚠️ 라인 {line_num}: 필수 필드 누락 - {missing_fields}")
-                return None
-            
-            # 2. 데이터 타입 검증 및 변환
-            cleaned_problem = {}
-            
-            # problemId: string (ObjectId가 아닌)
-            cleaned_problem["problemId"] = str(problem["problemId"])
-            
-            # unitId: string (unit 컬렉션과 연결)
-            cleaned_problem["unitId"] = str(problem["unitId"])
-            
-            # grade: number
-            cleaned_problem["grade"] = int(problem["grade"])
-            
-            # chapter: number
-            cleaned_problem["chapter"] = int(problem["chapter"])
-            
-            # context: object
-            cleaned_problem["context"] = problem["context"]
-            
-            # cognitiveType: string
-            cleaned_problem["cognitiveType"] = str(problem["cognitiveType"])
-            
-            # level: string
-            cleaned_problem["level"] = str(problem["level"])
-            
-            # diagnosticTest: bool
-            cleaned_problem["diagnosticTest"] = bool(problem["diagnosticTest"])
-            
-            # type: string
-            cleaned_problem["type"] = str(problem["type"])
-            
-            # tags: array
-            cleaned_problem["tags"] = list(problem["tags"])
-            
-            # content: object
-            cleaned_problem["content"] = problem["content"]
-            
-            # correctAnswer: string
-            cleaned_problem["correctAnswer"] = str(problem["correctAnswer"])
-            
-            # explanation: object
-            cleaned_problem["explanation"] = problem["explanation"]
-            
-            # imageUrl: string (선택적)
-            if "imageUrl" in problem:
-                cleaned_problem["imageUrl"] = str(problem["imageUrl"])
-            
-            # createdAt, updatedAt: date
-            try:
-                cleaned_problem["createdAt"] = datetime.fromisoformat(
-                    problem["createdAt"].replace("Z", "+00:00")
-                )
-                cleaned_problem["updatedAt"] = datetime.fromisoformat(
-                    problem["updatedAt"].replace("Z", "+00:00")
-                )
-            except Exception as e:
-                print(f"⚠️ 라인 {line_num}: 날짜 변환 오류 - {e}")
-                return None
-            
-            # 3. 추가 필드들 (선택적)
-            if "diagnosticUnit" in problem:
-                cleaned_problem["diagnosticUnit"] = str(problem["diagnosticUnit"])
-            
-            if "promptVersion" in problem:
-                cleaned_problem["promptVersion"] = str(problem["promptVersion"])
-            
-            if "subunit" in problem:
-                cleaned_problem["subunit"] = str(problem["subunit"])
-            
-            return cleaned_problem
-            
-        except Exception as e:
-            print(f"⚠️ 라인 {line_num}: 데이터 검증/정리 오류 - {e}")
+            return clean_problem(problem)
+        except ValueError as e:
+            print(f"⚠️ 라인 {line_num}: {e}")
             return None
     
     def check_unit_references(self, problems):
@@ -213,38 +131,9 @@ class ProblemImportLoader:
             existing_count = problem_collection.count_documents({})
             print(f"📊 기존 problem 컬렉션 문서 수: {existing_count}")
             
-            # 문제 데이터 저장
-            saved_count = 0
-            skipped_count = 0
-            duplicate_count = 0
-            
-            for i, problem in enumerate(problems, 1):
-                try:
-                    # 중복 확인 (problemId 기준)
-                    existing = problem_collection.find_one({"problemId": problem["problemId"]})
-                    if existing:
-                        print(f"⚠️ 문제 ID 중복: {problem['problemId']}")
-                        duplicate_count += 1
-                        continue
-                    
-                    # MongoDB에 저장
-                    result = problem_collection.insert_one(problem)
-                    if result.inserted_id:
-                        saved_count += 1
-                        if saved_count % 10 == 0:
-                            print(f"💾 {saved_count}개 문제 저장 완료...")
-                    
-                except DuplicateKeyError:
-                    print(f"⚠️ 중복 키 오류: {problem['problemId']}")
-                    duplicate_count += 1
-                except Exception as e:
-                    print(f"❌ 문제 저장 실패 (ID: {problem.get('problemId', 'unknown')}): {e}")
-                    skipped_count += 1
-            
-            print(f"\n📊 문제 저장 완료!")
-            print(f"✅ 새로 저장된 문제: {saved_count}개")
-            print(f"⚠️ 건너뛴 문제: {skipped_count}개")
-            print(f"🔄 중복 문제: {duplicate_count}개")
+            # 내용 해시를 비교해 새 문제/바뀐 문제만 저장 (problem 컬렉션은 다른 적재 스크립트와 공유하므로 삭제는 하지 않음)
+            report = sync_by_hash(problem_collection, problems, "problemId")
+            print_sync_report(report, "problem")
             print(f"📈 총 problem 컬렉션 문서 수: {problem_collection.count_documents({})}")
             
             return True
@@ -338,6 +227,38 @@ class ProblemImportLoader:
             print(f"❌ 문제 데이터 처리 실패: {e}")
             return False
     
+    def load_and_save_problems_bulk(self, workers=BULK_WORKERS, batch_size=BULK_BATCH_SIZE, overwrite=True):
+        """병렬 검증 + problemId 기준 일괄 upsert 모드"""
+        file_path = AI_DIR / "data" / "problem_to_import.txt"
+        
+        try:
+            print(f"📖 problem_to_import.txt 병렬 검증 중 (워커 {workers}개): {file_path}")
+            with open(file_path, 'r', encoding='utf-8') as f:
+                lines = ((f"라인 {line_num}", line) for line_num, line in enumerate(f, 1) if line.strip())
+                problems, errors = validate_parallel(lines, parse_problem_line, workers)
+            print(f"✅ 검증 통과 {len(problems)}개, 오류 {len(errors)}개")
+            
+            # unit 참조 무결성 확인
+            valid_problems = self.check_unit_references(problems)
+            if not valid_problems:
+                print("❌ 유효한 unit 참조가 없습니다.")
+                return False
+            
+            # upsert가 problemId 인덱스를 쓰도록 인덱스를 먼저 생성
+            self.create_problem_indexes()
+            
+            # 해시 비교 재적재와 같은 contentHash를 함께 저장
+            valid_problems = [with_content_hash(problem) for problem in valid_problems]
+            report = bulk_upsert(self.db.problem, valid_problems, batch_size=batch_size,
+                                 workers=workers, overwrite=overwrite)
+            print_report(report, errors)
+            print(f"📈 총 problem 컬렉션 문서 수: {self.db.problem.estimated_document_count()}")
+            return len(report["errors"]) < report["total"]
+            
+        except Exception as e:
+            print(f"❌ 문제 데이터 일괄 처리 실패: {e}")
+            return False
+    
     def close(self):
         """MongoDB 연결 종료"""
         if self.client:
@@ -346,6 +267,13 @@ class ProblemImportLoader:
 
 def main():
     """메인 함수"""
+    parser = argparse.ArgumentParser(description="problem_to_import.txt → problem 컬렉션 저장")
+    parser.add_argument("--bulk", action="store_true", help="병렬 검증 + 일괄 upsert 모드")
+    parser.add_argument("--workers", type=int, default=BULK_WORKERS, help="검증 프로세스 / 동시 배치 수")
+    parser.add_argument("--batch-size", type=int, default=BULK_BATCH_SIZE, help="bulk_write 배치 크기")
+    parser.add_argument("--skip-existing", action="store_true", help="이미 있는 problemId는 덮어쓰지 않음")
+    args = parser.parse_args()
+    
     print("🚀 Problem Import 데이터 MongoDB 저장 시작")
     print("=" * 60)
     
@@ -357,7 +285,10 @@ def main():
             print("❌ MongoDB 연결 실패")
             return
         
-        success = loader.load_and_save_problems()
+        if args.bulk:
+            success = loader.load_and_save_problems_bulk(args.workers, args.batch_size, not args.skip_existing)
+        else:
+            success = loader.load_and_save_problems()
         
         if success:
             print("\n🎉 Problem Import 데이터 MongoDB 저장 완료!")
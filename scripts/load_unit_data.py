@@ -11,12 +11,13 @@ from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
 from pymongo import MongoClient
-from bson import ObjectId
 
 # AI 디렉토리를 Python 경로에 추가
 AI_DIR = Path(__file__).parent
 sys.path.insert(0, str(AI_DIR))
 
+from content_hash_sync import print_sync_report, sync_by_hash
+
 # .env 파일 로드
 load_dotenv(AI_DIR / ".env")
 
@@ -72,7 +73,6 @@ class UnitDataLoader:
                         
                         # MongoDB 스키마에 맞게 데이터 변환
                         mongo_unit = {
-                            "_id": ObjectId(),  # 새로운 ObjectId 생성
                             "unitId": unit_data.get("unitId", ""),
                             "subject": unit_data.get("subject", "math"),
                             "title": unit_data.get("title", {}),
@@ -104,15 +104,9 @@ class UnitDataLoader:
             # MongoDB에 데이터 저장
             print("💾 MongoDB에 데이터 저장 시작...")
             
-            # 기존 데이터 삭제 (선택사항)
-            if existing_count > 0:
-                print("🗑️ 기존 unit 데이터 삭제 중...")
-                result = unit_collection.delete_many({})
-                print(f"   삭제된 문서 수: {result.deleted_count}")
-            
-            # 새 데이터 삽입
-            result = unit_collection.insert_many(units_data)
-            print(f"✅ {len(result.inserted_ids)}개의 unit 데이터 저장 완료!")
+            # 내용 해시를 비교해 새 문서/바뀐 문서만 저장하고 원본에 없는 문서는 삭제 (기존 _id 유지)
+            report = sync_by_hash(unit_collection, units_data, "unitId", delete_missing=True)
+            print_sync_report(report, "unit")
             
             # 저장된 데이터 확인
             final_count = unit_collection.count_documents({})
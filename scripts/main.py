@@ -1,37 +1,58 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from contextlib import asynccontextmanager
+from email.utils import formatdate
 import os
-from bson.objectid import ObjectId
+import asyncio
+import json
+from .json_response import BSONJSONResponse, bson_response, dumps as bson_dumps
 import datetime
 from pathlib import Path
 
-# MongoDB 연결을 지연시켜 서버 시작 속도 향상
-mongodb_available = False
-problems = None
-ping = lambda: False
+# MongoDB 클라이언트는 서버 시작 시 한 번 생성하고 헬스 모니터가 상태를 관리
+from .mongo_pool import mongo_pool
 
-def init_mongodb():
-    """MongoDB 연결을 필요할 때만 초기화"""
-    global mongodb_available, problems, ping
-    try:
-        from .db.mongo import init_mongodb as mongo_init, ping as mongo_ping
-        mongo_init()  # MongoDB 연결 초기화
-        ping = mongo_ping
-        mongodb_available = True
-        print("✅ MongoDB 연결 초기화 완료")
-    except Exception as e:
-        print(f"⚠️ MongoDB 연결 실패 (로컬 모드): {e}")
-        mongodb_available = False
-        problems = None
-        ping = lambda: False
+# 공유 문제 캐시 반환 (MongoDB 컬렉션 연결 포함)
+def get_problem_cache():
+    from .problem_cache import problem_cache
+    problem_cache.set_collection(mongo_pool.problems)
+    return problem_cache
+
+# 문제 하나 조회 (DB 장애 시 회로 차단기로 즉시 실패, 동기 pymongo 조회는 스레드에서 실행)
+async def lookup_problem(problem_id: str):
+    if not mongo_pool.available():
+        raise RuntimeError("MongoDB 연결이 불가능합니다")
+    with mongo_pool.guard():
+        return await asyncio.to_thread(get_problem_cache().get, problem_id)
+
+# 서버 시작/종료 시 MongoDB 연결, 작업 큐 워커와 공유 OpenAI 커넥션 풀 관리
+@asynccontextmanager
+async def lifespan(app):
+    from .job_queue import job_queue
+    mongo_pool.connect()
+    mongo_pool.start_monitor()
+    job_queue.start()
+    # 숙련도 상태 로드/밀린 채점 기록 반영은 첫 요청 전에 백그라운드에서
+    if mongo_pool.available():
+        from .knowledge_tracing import start_mastery_warmup
+        start_mastery_warmup(mongo_pool.db.answer_attempt)
+    yield
+    await job_queue.stop()
+    await mongo_pool.stop_monitor()
+    mongo_pool.close()
+    from .llm_client import close_async_client
+    await close_async_client()
 
 from .api.v1_ai import router as ai_router
 
 app = FastAPI(
     title="AI Math Tutor",
     version="1.0.0",
-    description="Simple AI Math Tutor API"
+    description="Simple AI Math Tutor API",
+    lifespan=lifespan,
+    # 문제/분석/학습경로 응답을 orjson으로 한 번에 직렬화 (charset=utf-8 포함)
+    default_response_class=BSONJSONResponse
 )
 
 # CORS 설정
@@ -43,46 +64,61 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 한글 인코딩을 위한 미들웨어
-@app.middleware("http")
-async def add_charset_middleware(request, call_next):
-    response = await call_next(request)
-    if hasattr(response, 'headers'):
-        response.headers['content-type'] = 'application/json; charset=utf-8'
-    return response
+# HTML 파일 서빙 (ETag/Last-Modified 조건부 요청 지원)
+STATIC_CACHE_CONTROL = "public, max-age=300"
+
+def serve_static_page(request: Request, filename: str):
+    path = Path(filename)
+    stat = path.stat()
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    last_modified = formatdate(stat.st_mtime, usegmt=True)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": last_modified,
+        "Cache-Control": STATIC_CACHE_CONTROL
+    }
+    
+    # 변경되지 않았으면 본문 없이 304 응답
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+            return Response(status_code=304, headers=headers)
+    elif request.headers.get("if-modified-since") == last_modified:
+        return Response(status_code=304, headers=headers)
+    
+    return FileResponse(path, media_type="text/html; charset=utf-8", headers=headers, stat_result=stat)
 
-# HTML 파일 서빙
 @app.get("/")
-async def root():
-    return FileResponse("chat_test.html")
+async def root(request: Request):
+    return serve_static_page(request, "chat_test.html")
 
 @app.get("/chat_test.html")
-async def get_chat_page():
-    return FileResponse("chat_test.html")
+async def get_chat_page(request: Request):
+    return serve_static_page(request, "chat_test.html")
 
 @app.get("/test_chatbot_frontend.html")
-async def get_test_page():
-    return FileResponse("test_chatbot_frontend.html")
+async def get_test_page(request: Request):
+    return serve_static_page(request, "test_chatbot_frontend.html")
 
 # 기본 헬스체크
 @app.get("/health")
 def health():
     return {"status": "ok", "message": "Server is healthy"}
 
-# MongoDB 상태 확인
+# MongoDB 상태 확인 (헬스 모니터가 기록한 상태를 바로 반환)
 @app.get("/api/db/health")
 async def db_health():
     try:
-        # MongoDB가 필요할 때만 초기화
-        if not mongodb_available:
-            init_mongodb()
-        
-        mongodb_status = "connected" if mongodb_available else "disconnected"
+        status = mongo_pool.status()
+        mongodb_status = "connected" if status["connected"] else "disconnected"
         
         return JSONResponse(
             content={
-                "status": "ok" if mongodb_available else "error",
+                "status": "ok" if status["connected"] else "error",
                 "mongodb": mongodb_status,
+                "circuit": status["circuit"],
+                "last_ping_ms": status["last_ping_ms"],
+                "last_error": status["last_error"],
                 "timestamp": datetime.datetime.now().isoformat()
             },
             media_type="application/json; charset=utf-8"
@@ -135,31 +171,163 @@ async def verify_token(request: dict):
 @app.get("/api/problems/{problem_id}")
 async def get_problem_by_id(problem_id: str):
     try:
-        # MongoDB가 필요할 때만 초기화
-        if not mongodb_available:
-            init_mongodb()
-        
-        if not mongodb_available:
+        # DB 장애 시 타임아웃을 기다리지 않고 바로 실패
+        if not mongo_pool.available():
             return {"error": "MongoDB 연결이 불가능합니다"}
         
-        # MongoDB에서 문제 조회
-        from .db.mongo import problems
-        if problems is None:
+        if mongo_pool.problems is None:
             return {"error": "MongoDB 컬렉션에 접근할 수 없습니다"}
         
-        # problem_id로 문제 검색
-        problem = problems.find_one({"problem_id": problem_id})
+        # problem_id 또는 _id로 문제 검색 (캐시, 한 번의 쿼리)
+        problem = await lookup_problem(problem_id)
         if not problem:
-            # 다른 필드로도 검색 시도
-            problem = problems.find_one({"_id": problem_id})
-            if not problem:
-                return {"error": f"문제 ID {problem_id}를 찾을 수 없습니다"}
+            return {"error": f"문제 ID {problem_id}를 찾을 수 없습니다"}
         
-        return {"problem": convert_objectid(problem)}
+        return bson_response({"problem": problem})
         
     except Exception as e:
         return {"error": f"문제 조회 중 오류: {str(e)}"}
 
+# 여러 문제를 한 번에 조회 (진단 화면 등에서 $in 쿼리 한 번으로 처리)
+@app.post("/api/problems:batch")
+async def get_problems_batch(request: dict):
+    try:
+        from .problem_cache import MAX_BATCH_SIZE
+        problem_ids = request.get("problem_ids") or []
+        
+        if not isinstance(problem_ids, list) or not problem_ids:
+            return {"error": "problem_ids 목록이 필요합니다."}
+        if len(problem_ids) > MAX_BATCH_SIZE:
+            return {"error": f"한 번에 최대 {MAX_BATCH_SIZE}개 문제까지 조회할 수 있습니다."}
+        
+        if not mongo_pool.available():
+            return {"error": "MongoDB 연결이 불가능합니다"}
+        
+        problem_ids = [str(problem_id) for problem_id in problem_ids]
+        with mongo_pool.guard():
+            found = await asyncio.to_thread(get_problem_cache().get_many, problem_ids)
+        
+        return bson_response({
+            "problems": [found[problem_id] for problem_id in problem_ids if problem_id in found],
+            "not_found": [problem_id for problem_id in dict.fromkeys(problem_ids) if problem_id not in found]
+        })
+        
+    except Exception as e:
+        return {"error": f"문제 일괄 조회 중 오류: {str(e)}"}
+
+# 여러 문제를 단원/개념으로 한 번에 해석 (진단 답안 목록 처리용)
+@app.post("/api/problems:resolve")
+async def resolve_problems(request: dict):
+    try:
+        from .concept_graph import get_concept_graph
+        from .neo4j_client import run_cypher
+        from .problem_concept_index import get_problem_concept_index
+        problem_ids = request.get("problem_ids") or []
+        
+        if not isinstance(problem_ids, list) or not problem_ids:
+            return {"error": "problem_ids 목록이 필요합니다."}
+        if not mongo_pool.available():
+            return {"error": "MongoDB 연결이 불가능합니다"}
+        
+        with mongo_pool.guard():
+            index = await asyncio.to_thread(
+                get_problem_concept_index, mongo_pool.db, lambda: get_concept_graph(run_cypher).names
+            )
+        return bson_response({"resolved": index.resolve_many(problem_ids)})
+        
+    except Exception as e:
+        return {"error": f"문제 개념 해석 중 오류: {str(e)}"}
+
+# 문제 캐시 무효화 (문제 수정 후 호출, problem_ids가 없으면 전체) + 문제-개념 인덱스 재컴파일 예약
+@app.post("/api/problems/cache/invalidate")
+async def invalidate_problem_cache(request: dict):
+    from .problem_cache import problem_cache
+    from .problem_concept_index import invalidate_problem_concept_index
+    problem_ids = request.get("problem_ids")
+    problem_cache.invalidate(problem_ids)
+    # 문제/단원 수정은 문제-개념 인덱스에도 반영
+    invalidate_problem_concept_index()
+    return {"status": "ok", "invalidated": problem_ids if problem_ids is not None else "all"}
+
+# 여러 개념의 선행/후행 개념 일괄 조회 (진단의 틀린 개념 목록을 한 번에 처리)
+@app.post("/api/concepts/prerequisites:batch")
+async def get_prerequisites_batch(request: dict):
+    try:
+        from .concept_graph import get_concept_graph
+        from .neo4j_client import run_cypher
+        from .prerequisite_lookup import lookup_prerequisites
+        concepts = request.get("concepts") or []
+        max_hops = request.get("max_hops", 5)
+        
+        if not isinstance(concepts, list) or not concepts:
+            return {"error": "concepts 목록이 필요합니다."}
+        
+        try:
+            snapshot = await asyncio.to_thread(get_concept_graph, run_cypher)
+        except Exception as e:
+            # 스냅샷을 만들 수 없으면 UNWIND 쿼리 한 번으로 조회
+            print(f"⚠️ 개념 그래프 스냅샷 사용 불가, Cypher로 조회: {e}")
+            snapshot = None
+        
+        found = await asyncio.to_thread(lookup_prerequisites, concepts, max_hops, run_cypher, snapshot)
+        return bson_response({
+            "concepts": found,
+            "not_found": [name for name in dict.fromkeys(concepts) if name not in found]
+        })
+        
+    except ValueError as e:
+        return {"error": str(e)}
+    except Exception as e:
+        return {"error": f"선행 개념 일괄 조회 중 오류: {str(e)}"}
+
+# Express 진단 비동기 처리: 작업 ID를 바로 반환하고 결과는 상태 조회/웹훅으로 전달
+@app.post("/api/learning-path/express/diagnostic:async")
+async def express_diagnostic_async(request: dict):
+    from .express_batch import validate_submission
+    from .job_queue import QueueFullError, job_queue, validate_callback_url
+    callback_url = request.pop("callbackUrl", None)
+    
+    error = validate_submission(request)
+    if not error and callback_url is not None:
+        error = validate_callback_url(callback_url)
+    if error:
+        return bson_response({"error": error}, status_code=400)
+    if not mongo_pool.available():
+        return bson_response({"error": "MongoDB 연결이 불가능합니다"}, status_code=503)
+    
+    try:
+        job = job_queue.submit("express_diagnostic", lambda: run_express_batch([request])[0],
+                               callback_url=callback_url)
+    except QueueFullError as e:
+        return bson_response({"error": str(e)}, status_code=503)
+    return bson_response({**job, "statusUrl": f"/api/jobs/{job['jobId']}"}, status_code=202)
+
+# 비동기 작업 상태/결과 조회
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    from .job_queue import job_queue
+    job = job_queue.get(job_id)
+    if job is None:
+        return bson_response({"error": f"작업 ID {job_id}를 찾을 수 없습니다"}, status_code=404)
+    return bson_response(job)
+
+# 사용자 숙련도 벡터 조회 (answer_attempt를 누적 반영한 BKT 숙련도, 학습 경로 생성에 그대로 사용)
+@app.get("/api/users/{user_id}/mastery")
+async def get_user_mastery(user_id: str):
+    from .knowledge_tracing import get_mastery_tracker
+    collection = mongo_pool.db.answer_attempt if mongo_pool.available() else None
+    tracker = await asyncio.to_thread(get_mastery_tracker, collection)
+    # answer_attempt.userld는 숫자
+    user_key = int(user_id) if user_id.isdigit() else user_id
+
+    return bson_response({
+        "userId": user_key,
+        "concepts": tracker.concept_names,
+        "mastery": [round(p, 4) for p in tracker.mastery_vector(user_key).tolist()],
+        "weakConcepts": tracker.weak_concepts(user_key),
+        "updatedUntil": tracker.checkpoint
+    })
+
 # 기존 AI API 라우터 포함
 app.include_router(ai_router)
 
@@ -167,6 +335,46 @@ app.include_router(ai_router)
 from .api.v1_learning_path import router as learning_path_router
 app.include_router(learning_path_router)
 
+# 진단 제출 분석 및 저장 (일괄 엔드포인트와 비동기 작업이 공유, 워커 스레드에서 실행)
+def run_express_batch(submissions):
+    from .concept_graph import get_concept_graph
+    from .express_batch import ExpressBatchProcessor
+    from .neo4j_client import run_cypher
+    from .problem_concept_index import get_problem_concept_index
+    
+    snapshot = get_concept_graph(run_cypher)
+    with mongo_pool.guard():
+        index = get_problem_concept_index(mongo_pool.db, lambda: get_concept_graph(run_cypher).names)
+        processor = ExpressBatchProcessor(
+            index, snapshot,
+            results_collection=mongo_pool.db.express_diagnostic_results,
+            paths_collection=mongo_pool.db.learning_paths,
+        )
+        return processor.process(submissions)
+
+# Express 진단 결과 일괄 처리 (수업 종료 시 몰리는 제출을 한 번에 분석/저장)
+@app.post("/api/learning-path/express/diagnostic:batch")
+async def express_diagnostic_batch(request: dict):
+    try:
+        submissions = request.get("submissions") or []
+        
+        if not isinstance(submissions, list) or not submissions:
+            return {"error": "submissions 목록이 필요합니다."}
+        if not mongo_pool.available():
+            return {"error": "MongoDB 연결이 불가능합니다"}
+        
+        results = await asyncio.to_thread(run_express_batch, submissions)
+        return bson_response({
+            "results": results,
+            "succeeded": sum(1 for result in results if result["status"] == "ok"),
+            "failed": sum(1 for result in results if result["status"] != "ok")
+        })
+        
+    except ValueError as e:
+        return {"error": str(e)}
+    except Exception as e:
+        return {"error": f"진단 일괄 처리 중 오류: {str(e)}"}
+
 # 간단한 채팅 엔드포인트
 @app.post("/api/chat")
 async def chat(message: dict):
@@ -185,41 +393,33 @@ async def chat(message: dict):
     except Exception as e:
         return {"error": f"채팅 중 오류가 발생했습니다: {str(e)}"}
 
-# ObjectId를 문자열로 변환하는 함수
-def convert_objectid(obj):
-    if isinstance(obj, ObjectId):
-        return str(obj)
-    elif isinstance(obj, dict):
-        return {key: convert_objectid(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_objectid(item) for item in obj]
-    return obj
+# LLM 응답 캐시 조회 (문제, 프롬프트 버전, 모델, 정규화된 질문 기준)
+async def lookup_answer_cache(problem_id: str, prompt_name: str, prompt_text: str, question: str):
+    from .llm_cache import answer_cache, make_cache_key
+    from .llm_client import DEFAULT_MODEL
+    if answer_cache.collection is None and mongo_pool.db is not None:
+        answer_cache.set_collection(mongo_pool.db["llm_answer_cache"])
+        answer_cache.set_precomputed_collection(mongo_pool.db["precomputed_answers"])
+    cache_key = make_cache_key(problem_id, prompt_name, prompt_text, DEFAULT_MODEL, question)
+    return answer_cache, cache_key, await answer_cache.aget(cache_key)
 
 # 문제 ID로 문제 조회 API
 @app.get("/api/problem/{problem_id}")
 async def get_problem(problem_id: str):
     try:
-        # MongoDB가 필요할 때만 초기화
-        if not mongodb_available:
-            init_mongodb()
-        
-        if not mongodb_available:
+        # DB 장애 시 타임아웃을 기다리지 않고 바로 실패
+        if not mongo_pool.available():
             return {"error": "MongoDB 연결이 불가능합니다"}
         
-        # MongoDB에서 문제 조회
-        from .db.mongo import problems
-        if problems is None:
+        if mongo_pool.problems is None:
             return {"error": "MongoDB 컬렉션에 접근할 수 없습니다"}
         
-        # problem_id로 문제 검색
-        problem = problems.find_one({"problem_id": problem_id})
+        # problem_id 또는 _id로 문제 검색 (캐시, 한 번의 쿼리)
+        problem = await lookup_problem(problem_id)
         if not problem:
-            # 다른 필드로도 검색 시도
-            problem = problems.find_one({"_id": problem_id})
-            if not problem:
-                return {"error": f"문제 ID {problem_id}를 찾을 수 없습니다"}
+            return {"error": f"문제 ID {problem_id}를 찾을 수 없습니다"}
         
-        return {"problem": convert_objectid(problem)}
+        return bson_response({"problem": problem})
         
     except Exception as e:
         return {"error": f"문제 조회 중 오류: {str(e)}"}
@@ -235,56 +435,53 @@ async def solve_with_problem(request: dict):
         if not problem_id:
             return {"error": "problem_id가 필요합니다."}
         
-        # MongoDB가 필요할 때만 초기화
-        if not mongodb_available:
-            init_mongodb()
-        
-        # 1단계: MongoDB에서 문제 데이터 조회
-        problem = problems.find_one({"problem_id": problem_id})
+        # 1단계: 문제 캐시(MongoDB)에서 문제 데이터 조회
+        problem = await lookup_problem(problem_id)
         if not problem:
             return {"error": f"문제 ID {problem_id}를 찾을 수 없습니다."}
         
         # 2단계: 문제 데이터와 질문을 AI에게 전송
-        problem_text = f"문제: {problem['content']['question']}\n\n사용자 질문: {question}"
-        
-        # 3단계: AI 풀이 요청 (직접 OpenAI API 호출)
-        import os
-        from openai import OpenAI
+        from .llm_client import build_problem_text
+        problem_text = build_problem_text(problem, "solve_prompt_v1", question)
         
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # 3단계: AI 풀이 요청 (공유 비동기 클라이언트)
+        from .llm_client import chat_json
         
         # 프롬프트 로드
         from .ai.prompts import load_prompt
         prompt_text = load_prompt("solve_prompt_v1")
         
-        # OpenAI API 호출
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": prompt_text},
-                {"role": "user", "content": problem_text}
-            ],
-            response_format={"type": "json_object"}
-        )
+        # 캐시 적중 시 GPT 호출 생략
+        cache, cache_key, cached = await lookup_answer_cache(problem_id, "solve_prompt_v1", prompt_text, question)
+        if cached is not None:
+            return bson_response({
+                "problem": problem,
+                "ai_solution": cached,
+                "status": "success",
+                "cached": True
+            })
+        
+        # OpenAI API 호출 (이벤트 루프를 막지 않음)
+        ai_response = await chat_json(prompt_text, problem_text)
         
         # 4단계: AI 응답 파싱 및 반환
-        ai_response = response.choices[0].message.content
         try:
             # JSON 파싱
             import json
             ai_data = json.loads(ai_response)
-            return {
-                "problem": convert_objectid(problem),
+            await cache.aset(cache_key, ai_data, {"problemId": problem_id, "prompt": "solve_prompt_v1"})
+            return bson_response({
+                "problem": problem,
                 "ai_solution": ai_data,
                 "status": "success"
-            }
+            })
         except Exception as e:
-            return {
-                "problem": convert_objectid(problem),
+            return bson_response({
+                "problem": problem,
                 "ai_solution": {"raw_response": ai_response},
                 "status": "partial_success",
                 "error": f"AI 응답 파싱 오류: {str(e)}"
-            }
+            })
             
     except Exception as e:
         import traceback
@@ -302,51 +499,48 @@ async def concept_with_problem(request: dict):
         if not problem_id:
             return {"error": "problem_id가 필요합니다."}
         
-        # MongoDB가 필요할 때만 초기화
-        if not mongodb_available:
-            init_mongodb()
-        
-        # MongoDB에서 문제 데이터 조회
-        problem = problems.find_one({"problem_id": problem_id})
+        # 문제 캐시(MongoDB)에서 문제 데이터 조회
+        problem = await lookup_problem(problem_id)
         if not problem:
             return {"error": f"문제 ID {problem_id}를 찾을 수 없습니다."}
         
         # 문제 데이터와 개념을 AI에게 전송
-        problem_text = f"문제: {problem['content']['question']}\n\n개념 설명 요청: {concept_name}"
+        from .llm_client import build_problem_text
+        problem_text = build_problem_text(problem, "concept_prompt_v1", concept_name)
         
-        import os
-        from openai import OpenAI
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        from .llm_client import chat_json
         
         # 개념 설명 프롬프트 로드
         from .ai.prompts import load_prompt
         prompt_text = load_prompt("concept_prompt_v1")
         
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": prompt_text},
-                {"role": "user", "content": problem_text}
-            ],
-            response_format={"type": "json_object"}
-        )
-        
-        ai_response = response.choices[0].message.content
+        # 캐시 적중 시 GPT 호출 생략
+        cache, cache_key, cached = await lookup_answer_cache(problem_id, "concept_prompt_v1", prompt_text, concept_name)
+        if cached is not None:
+            return bson_response({
+                "problem": problem,
+                "ai_concept": cached,
+                "status": "success",
+                "cached": True
+            })
+        
+        ai_response = await chat_json(prompt_text, problem_text)
         try:
             import json
             ai_data = json.loads(ai_response)
-            return {
-                "problem": convert_objectid(problem),
+            await cache.aset(cache_key, ai_data, {"problemId": problem_id, "prompt": "concept_prompt_v1"})
+            return bson_response({
+                "problem": problem,
                 "ai_concept": ai_data,
                 "status": "success"
-            }
+            })
         except Exception as e:
-            return {
-                "problem": convert_objectid(problem),
+            return bson_response({
+                "problem": problem,
                 "ai_concept": {"raw_response": ai_response},
                 "status": "partial_success",
                 "error": f"AI 응답 파싱 오류: {str(e)}"
-            }
+            })
             
     except Exception as e:
         import traceback
@@ -364,61 +558,164 @@ async def rag_with_problem(request: dict):
         if not problem_id:
             return {"error": "problem_id가 필요합니다."}
         
-        # MongoDB가 필요할 때만 초기화
-        if not mongodb_available:
-            init_mongodb()
-        
-        # MongoDB에서 문제 데이터 조회
-        problem = problems.find_one({"problem_id": problem_id})
+        # 문제 캐시(MongoDB)에서 문제 데이터 조회
+        problem = await lookup_problem(problem_id)
         if not problem:
             return {"error": f"문제 ID {problem_id}를 찾을 수 없습니다."}
         
         # 문제 데이터와 질문을 AI에게 전송
-        problem_text = f"문제: {problem['content']['question']}\n\n추천 요청: {question}"
+        from .llm_client import build_problem_text
+        problem_text = build_problem_text(problem, "rag_prompt_v1", question)
         
-        import os
-        from openai import OpenAI
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        from .llm_client import chat_json
         
         # RAG 추천 프롬프트 로드
         from .ai.prompts import load_prompt
         prompt_text = load_prompt("rag_prompt_v1")
         
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": prompt_text},
-                {"role": "user", "content": problem_text}
-            ],
-            response_format={"type": "json_object"}
-        )
-        
-        ai_response = response.choices[0].message.content
+        # 캐시 적중 시 GPT 호출 생략
+        cache, cache_key, cached = await lookup_answer_cache(problem_id, "rag_prompt_v1", prompt_text, question)
+        if cached is not None:
+            return bson_response({
+                "problem": problem,
+                "ai_recommendation": cached,
+                "status": "success",
+                "cached": True
+            })
+        
+        ai_response = await chat_json(prompt_text, problem_text)
         try:
             import json
             ai_data = json.loads(ai_response)
-            return {
-                "problem": convert_objectid(problem),
+            await cache.aset(cache_key, ai_data, {"problemId": problem_id, "prompt": "rag_prompt_v1"})
+            return bson_response({
+                "problem": problem,
                 "ai_recommendation": ai_data,
                 "status": "success"
-            }
+            })
         except Exception as e:
-            return {
-                "problem": convert_objectid(problem),
+            return bson_response({
+                "problem": problem,
                 "ai_recommendation": {"raw_response": ai_response},
                 "status": "partial_success",
                 "error": f"AI 응답 파싱 오류: {str(e)}"
-            }
+            })
             
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
         return {"error": f"RAG 추천 중 오류: {str(e)}", "traceback": error_details}
 
+# SSE 이벤트 한 건을 문자열로 직렬화
+def sse_event(event: str, data) -> str:
+    payload = data if isinstance(data, str) else bson_dumps(data).decode("utf-8")
+    lines = "\n".join(f"data: {line}" for line in payload.split("\n"))
+    return f"event: {event}\n{lines}\n\n"
+
+# 통합 API 스트리밍 공통 처리: 토큰은 token 이벤트로, 최종 JSON은 result 이벤트로 전송
+async def stream_with_problem(request: dict, text_key: str, prompt_name: str,
+                              result_key: str, error_label: str):
+    problem_id = request.get("problem_id")
+    user_text = request.get(text_key, "")
+    
+    if not problem_id:
+        return bson_response({"error": "problem_id가 필요합니다."})
+    
+    problem = await lookup_problem(problem_id)
+    if not problem:
+        return bson_response({"error": f"문제 ID {problem_id}를 찾을 수 없습니다."})
+    
+    from .llm_client import build_problem_text, stream_chat_json
+    problem_text = build_problem_text(problem, prompt_name, user_text)
+    
+    from .ai.prompts import load_prompt
+    prompt_text = load_prompt(prompt_name)
+    cache, cache_key, cached = await lookup_answer_cache(problem_id, prompt_name, prompt_text, user_text)
+    
+    async def event_stream():
+        # 캐시 적중 시 최종 결과만 바로 전송
+        if cached is not None:
+            yield sse_event("result", {
+                "problem": problem,
+                result_key: cached,
+                "status": "success",
+                "cached": True
+            })
+            return
+        
+        chunks = []
+        try:
+            async for delta in stream_chat_json(prompt_text, problem_text):
+                chunks.append(delta)
+                yield sse_event("token", delta)
+        except Exception as e:
+            yield sse_event("error", {"error": f"{error_label} 중 오류: {str(e)}"})
+            return
+        
+        ai_response = "".join(chunks)
+        try:
+            ai_data = json.loads(ai_response)
+            await cache.aset(cache_key, ai_data, {"problemId": problem_id, "prompt": prompt_name})
+            yield sse_event("result", {
+                "problem": problem,
+                result_key: ai_data,
+                "status": "success"
+            })
+        except Exception as e:
+            yield sse_event("result", {
+                "problem": problem,
+                result_key: {"raw_response": ai_response},
+                "status": "partial_success",
+                "error": f"AI 응답 파싱 오류: {str(e)}"
+            })
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream; charset=utf-8",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# 통합 문제 풀이 스트리밍 API (SSE)
+@app.post("/api/solve_with_problem/stream")
+async def solve_with_problem_stream(request: dict):
+    try:
+        return await stream_with_problem(request, "question", "solve_prompt_v1", "ai_solution", "문제 풀이")
+    except Exception as e:
+        return bson_response({"error": f"문제 풀이 중 오류: {str(e)}"})
+
+# 통합 개념 설명 스트리밍 API (SSE)
+@app.post("/api/concept_with_problem/stream")
+async def concept_with_problem_stream(request: dict):
+    try:
+        return await stream_with_problem(request, "concept_name", "concept_prompt_v1", "ai_concept", "개념 설명")
+    except Exception as e:
+        return bson_response({"error": f"개념 설명 중 오류: {str(e)}"})
+
+# 통합 RAG 추천 스트리밍 API (SSE)
+@app.post("/api/rag_with_problem/stream")
+async def rag_with_problem_stream(request: dict):
+    try:
+        return await stream_with_problem(request, "question", "rag_prompt_v1", "ai_recommendation", "RAG 추천")
+    except Exception as e:
+        return bson_response({"error": f"RAG 추천 중 오류: {str(e)}"})
+
+# LLM 응답 캐시 적중률 조회
+@app.get("/api/cache/stats")
+async def llm_cache_stats():
+    from .llm_cache import answer_cache
+    from .problem_cache import problem_cache
+    from .recommended_path_cache import recommended_path_cache
+    return {
+        "llm_answer_cache": answer_cache.get_stats(),
+        "problem_cache": problem_cache.get_stats(),
+        "recommended_path_cache": recommended_path_cache.get_stats()
+    }
+
 # 기존 AI API가 /api/ai/* 경로로 제공됩니다
 # - /api/ai/solve: 수학 문제 풀이
 # - /api/ai/concept: 개념 설명  
 # - /api/ai/rag_recommend: RAG 추천
+# 통합 API의 스트리밍(SSE) 버전은 /api/*_with_problem/stream 경로로 제공됩니다
 
 if __name__ == "__main__":
     import uvicorn
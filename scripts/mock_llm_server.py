@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+로컬 모의 LLM 서버 (OpenAI 호환 /v1/chat/completions)
+사전 생성 배치(precompute_answers.py)나 통합 API를 실제 OpenAI 호출 없이 시험할 때 사용합니다.
+
+사용 예:
+    python mock_llm_server.py
+    OPENAI_BASE_URL=http://localhost:8900/v1 python precompute_answers.py --limit 20
+"""
+
+import asyncio
+import json
+import os
+import time
+import uuid
+from typing import Any, Dict
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+# 응답 지연 (초) - 실제 LLM 지연을 흉내냄
+MOCK_LLM_LATENCY = float(os.getenv("MOCK_LLM_LATENCY", "0.2"))
+
+app = FastAPI(
+    title="Mock LLM Server",
+    version="1.0.0",
+    description="OpenAI 호환 모의 채팅 완성 API"
+)
+
+
+def build_mock_content(body: Dict[str, Any]) -> str:
+    """요청 메시지를 바탕으로 JSON 형식의 모의 응답 생성"""
+    user_message = next(
+        (m.get("content", "") for m in reversed(body.get("messages", [])) if m.get("role") == "user"),
+        ""
+    )
+    return json.dumps({
+        "mock": True,
+        "steps": ["1단계: 문제 이해", "2단계: 풀이", "3단계: 검산"],
+        "answer": "모의 응답",
+        "echo": user_message[:200]
+    }, ensure_ascii=False)
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(body: Dict[str, Any]):
+    """채팅 완성 (stream=True 이면 SSE 청크로 응답)"""
+    await asyncio.sleep(MOCK_LLM_LATENCY)
+
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+    created = int(time.time())
+    model = body.get("model", "mock-model")
+    content = build_mock_content(body)
+
+    if body.get("stream"):
+        async def event_stream():
+            for i in range(0, len(content), 16):
+                chunk = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {"content": content[i:i + 16]}, "finish_reason": None}]
+                }
+                yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+                await asyncio.sleep(0.01)
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": created,
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop"
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    }
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("MOCK_LLM_PORT", "8900")))
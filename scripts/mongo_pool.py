@@ -0,0 +1,215 @@
+"""
+MongoDB 연결 수명주기 관리
+서버 시작 시 튜닝된 MongoClient 하나를 만들고, 백그라운드 헬스 모니터와 회로 차단기로
+DB 장애 시 요청이 서버 선택 타임아웃을 기다리지 않고 바로 실패하도록 합니다.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from pymongo import MongoClient
+from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
+
+# 환경변수로 조정 가능한 연결 설정
+MONGODB_DB = os.getenv("MONGODB_DB", "nerdmath")
+MONGODB_PROBLEMS_COLLECTION = os.getenv("MONGODB_PROBLEMS_COLLECTION", "problems")
+MONGODB_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+MONGODB_MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", "5"))
+MONGODB_MAX_IDLE_TIME_MS = int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", "60000"))
+MONGODB_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "2000"))
+MONGODB_CONNECT_TIMEOUT_MS = int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "2000"))
+MONGODB_SOCKET_TIMEOUT_MS = int(os.getenv("MONGODB_SOCKET_TIMEOUT_MS", "10000"))
+# zlib은 추가 패키지 없이 사용 가능 (zstd/snappy는 zstandard/python-snappy 설치 후 지정)
+MONGODB_COMPRESSORS = os.getenv("MONGODB_COMPRESSORS", "zlib")
+MONGODB_HEALTH_INTERVAL = float(os.getenv("MONGODB_HEALTH_INTERVAL", "5"))
+
+
+class CircuitBreaker:
+    """연속 실패 시 일정 시간 요청을 차단하는 회로 차단기 (closed → open → half_open)"""
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 10.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        # half_open에서 결과를 기다리는 시험 요청이 있는지
+        self.probing = False
+        self._lock = threading.Lock()
+
+    def _update(self):
+        """open 상태에서 reset_timeout이 지나면 half_open으로 전환 (잠금 안에서 호출)"""
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+            self.probing = False
+
+    def blocking(self) -> bool:
+        """지금 요청이 차단되는지 (open이거나 half_open 시험 요청이 진행 중) — 시험 요청 자리를 차지하지 않음"""
+        with self._lock:
+            self._update()
+            return self.state == "open" or (self.state == "half_open" and self.probing)
+
+    def allow_request(self) -> bool:
+        """요청 허용 여부 (half_open에서는 결과가 기록될 때까지 시험 요청 하나만 허용)"""
+        with self._lock:
+            self._update()
+            if self.state == "closed":
+                return True
+            if self.state == "half_open" and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def release(self):
+        """연결 상태와 무관하게 끝난 시험 요청의 자리 반환"""
+        with self._lock:
+            self.probing = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self.probing = False
+
+    def trip(self):
+        """즉시 open 상태로 전환"""
+        with self._lock:
+            self.failures = max(self.failures, self.failure_threshold)
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            self.probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.probing = False
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+
+class MongoPool:
+    """프로세스 공용 MongoClient + 헬스 모니터"""
+
+    def __init__(self):
+        self.client: Optional[MongoClient] = None
+        self.db = None
+        self.problems = None
+        self.breaker = CircuitBreaker()
+        self.last_ping_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._monitor_task: Optional[asyncio.Task] = None
+
+    def connect(self, uri: Optional[str] = None):
+        """튜닝된 MongoClient 생성 (실제 연결은 백그라운드에서 이루어짐)"""
+        uri = uri or os.getenv("MONGODB_URI")
+        if not uri:
+            self.last_error = "MONGODB_URI 환경변수가 설정되지 않았습니다."
+            print(f"⚠️ {self.last_error}")
+            return
+        try:
+            self.client = MongoClient(
+                uri,
+                maxPoolSize=MONGODB_MAX_POOL_SIZE,
+                minPoolSize=MONGODB_MIN_POOL_SIZE,
+                maxIdleTimeMS=MONGODB_MAX_IDLE_TIME_MS,
+                serverSelectionTimeoutMS=MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+                connectTimeoutMS=MONGODB_CONNECT_TIMEOUT_MS,
+                socketTimeoutMS=MONGODB_SOCKET_TIMEOUT_MS,
+                compressors=MONGODB_COMPRESSORS,
+                retryWrites=True,
+                appname="ai-math-tutor",
+            )
+        except Exception as e:
+            # 잘못된 URI / SRV 조회 실패 / 설정 오류여도 서버는 로컬 모드로 시작
+            self.client = None
+            self.last_error = str(e)
+            self.breaker.trip()
+            print(f"❌ MongoDB 클라이언트 생성 실패, 로컬 모드로 동작: {e}")
+            return
+        self.db = self.client[MONGODB_DB]
+        self.problems = self.db[MONGODB_PROBLEMS_COLLECTION]
+        print(f"✅ MongoDB 클라이언트 생성 (pool={MONGODB_MAX_POOL_SIZE}, db={MONGODB_DB})")
+
+    def available(self) -> bool:
+        """클라이언트가 있고 회로 차단기가 요청을 차단하지 않는지 (실제 시험 요청 자리는 guard()에서 차지)"""
+        return self.client is not None and not self.breaker.blocking()
+
+    def ping(self) -> bool:
+        """MongoDB ping (성공/실패를 회로 차단기에 기록)"""
+        if self.client is None:
+            return False
+        started = time.perf_counter()
+        try:
+            self.client.admin.command("ping")
+            self.last_ping_ms = round((time.perf_counter() - started) * 1000, 2)
+            self.last_error = None
+            self.breaker.record_success()
+            return True
+        except Exception as e:
+            self.last_error = str(e)
+            self.breaker.record_failure()
+            return False
+
+    @contextmanager
+    def guard(self):
+        """요청 경로의 DB 호출 결과(성공/연결 장애)를 회로 차단기에 기록
+        half_open에서는 시험 요청 하나만 통과시키고 나머지는 바로 실패"""
+        if not self.breaker.allow_request():
+            raise RuntimeError("MongoDB 연결이 불가능합니다")
+        try:
+            yield
+        except (ConnectionFailure, ServerSelectionTimeoutError) as e:
+            self.last_error = str(e)
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+        else:
+            self.breaker.record_success()
+
+    async def _monitor(self, interval: float):
+        while True:
+            await asyncio.to_thread(self.ping)
+            await asyncio.sleep(interval)
+
+    def start_monitor(self, interval: float = MONGODB_HEALTH_INTERVAL):
+        """백그라운드 헬스 모니터 시작"""
+        if self.client is not None and self._monitor_task is None:
+            self._monitor_task = asyncio.create_task(self._monitor(interval))
+
+    async def stop_monitor(self):
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            try:
+                await self._monitor_task
+            except asyncio.CancelledError:
+                pass
+            self._monitor_task = None
+
+    def close(self):
+        """MongoDB 연결 종료"""
+        if self.client is not None:
+            self.client.close()
+        self.client = None
+        self.db = None
+        self.problems = None
+
+    def status(self) -> Dict[str, Any]:
+        """헬스 상태 요약"""
+        return {
+            "connected": self.client is not None and self.breaker.state == "closed",
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "last_ping_ms": self.last_ping_ms,
+            "last_error": self.last_error,
+        }
+
+
+# 프로세스 공용 인스턴스
+mongo_pool = MongoPool()
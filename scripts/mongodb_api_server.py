@@ -10,9 +10,12 @@ import os
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure, BulkWriteError
+from collection_swap import SEED_COLLECTIONS, swap_load_seed
+from json_stream import iter_seed_items
 import logging
 from dotenv import load_dotenv
 
@@ -37,6 +40,9 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# 데이터 타입별 표시 이름
+SEED_LABELS = {"concepts": "개념", "diagnostic_tests": "진단테스트", "unit_tests": "단원테스트"}
+
 class MongoDBService:
     def __init__(self):
         self.client = None
@@ -69,25 +75,13 @@ class MongoDBService:
             if 'concepts' not in data:
                 raise ValueError("개념 데이터에 'concepts' 키가 없습니다.")
             
-            collection = self.db.concepts
-            # 기존 데이터 삭제
-            collection.delete_many({})
-            logger.info("기존 개념 데이터 삭제 완료")
-            
-            # 새 데이터 삽입
-            result = collection.insert_many(data['concepts'])
-            logger.info(f"개념 데이터 저장 완료: {len(result.inserted_ids)}개")
-            
-            # 인덱스 생성
-            collection.create_index("conceptId", unique=True)
-            collection.create_index("unitId")
-            collection.create_index("unitCode")
-            logger.info("개념 컬렉션 인덱스 생성 완료")
+            inserted_count = swap_load_seed(self.db, "concepts", data['concepts'])
+            logger.info(f"개념 데이터 저장 완료: {inserted_count}개")
             
             return {
                 "success": True,
-                "message": f"개념 데이터 저장 완료: {len(result.inserted_ids)}개",
-                "count": len(result.inserted_ids)
+                "message": f"개념 데이터 저장 완료: {inserted_count}개",
+                "count": inserted_count
             }
             
         except Exception as e:
@@ -106,25 +100,13 @@ class MongoDBService:
             if 'sets' not in data:
                 raise ValueError("진단테스트 데이터에 'sets' 키가 없습니다.")
             
-            collection = self.db.diagnostic_tests
-            # 기존 데이터 삭제
-            collection.delete_many({})
-            logger.info("기존 진단테스트 데이터 삭제 완료")
-            
-            # 새 데이터 삽입
-            result = collection.insert_many(data['sets'])
-            logger.info(f"진단테스트 데이터 저장 완료: {len(result.inserted_ids)}개")
-            
-            # 인덱스 생성
-            collection.create_index("test.testId", unique=True)
-            collection.create_index("test.userId")
-            collection.create_index("problems.unitId")
-            logger.info("진단테스트 컬렉션 인덱스 생성 완료")
+            inserted_count = swap_load_seed(self.db, "diagnostic_tests", data['sets'])
+            logger.info(f"진단테스트 데이터 저장 완료: {inserted_count}개")
             
             return {
                 "success": True,
-                "message": f"진단테스트 데이터 저장 완료: {len(result.inserted_ids)}개",
-                "count": len(result.inserted_ids)
+                "message": f"진단테스트 데이터 저장 완료: {inserted_count}개",
+                "count": inserted_count
             }
             
         except Exception as e:
@@ -143,25 +125,13 @@ class MongoDBService:
             if 'units' not in data:
                 raise ValueError("단원테스트 데이터에 'units' 키가 없습니다.")
             
-            collection = self.db.unit_tests
-            # 기존 데이터 삭제
-            collection.delete_many({})
-            logger.info("기존 단원테스트 데이터 삭제 완료")
-            
-            # 새 데이터 삽입
-            result = collection.insert_many(data['units'])
-            logger.info(f"단원테스트 데이터 저장 완료: {len(result.inserted_ids)}개")
-            
-            # 인덱스 생성
-            collection.create_index("code", unique=True)
-            collection.create_index("problems.problemId")
-            collection.create_index("problems.unitId")
-            logger.info("단원테스트 컬렉션 인덱스 생성 완료")
+            inserted_count = swap_load_seed(self.db, "unit_tests", data['units'])
+            logger.info(f"단원테스트 데이터 저장 완료: {inserted_count}개")
             
             return {
                 "success": True,
-                "message": f"단원테스트 데이터 저장 완료: {len(result.inserted_ids)}개",
-                "count": len(result.inserted_ids)
+                "message": f"단원테스트 데이터 저장 완료: {inserted_count}개",
+                "count": inserted_count
             }
             
         except Exception as e:
@@ -172,6 +142,30 @@ class MongoDBService:
                 "count": 0
             }
     
+    def load_file(self, data_type: str, file) -> Dict[str, Any]:
+        """시드 파일(JSON {키: [...]} / NDJSON)을 스트리밍으로 읽어 저장 (파일 크기와 무관하게 메모리 일정)"""
+        label = SEED_LABELS[data_type]
+        key = SEED_COLLECTIONS[data_type]["key"]
+        try:
+            logger.info(f"{label} 데이터 스트리밍 로드 시작")
+            
+            inserted_count = swap_load_seed(self.db, data_type, iter_seed_items(file, key))
+            logger.info(f"{label} 데이터 저장 완료: {inserted_count}개")
+            
+            return {
+                "success": True,
+                "message": f"{label} 데이터 저장 완료: {inserted_count}개",
+                "count": inserted_count
+            }
+            
+        except Exception as e:
+            logger.error(f"{label} 데이터 로드 실패: {e}")
+            return {
+                "success": False,
+                "message": f"{label} 데이터 로드 실패: {str(e)}",
+                "count": 0
+            }
+    
     def get_collection_stats(self) -> Dict[str, Any]:
         """컬렉션별 통계 정보 조회"""
         try:
@@ -287,27 +281,13 @@ async def load_all_data():
         results = {}
         success_count = 0
         
-        # 개념 데이터 로드
-        with open(concepts_file, 'r', encoding='utf-8') as file:
-            concepts_data = json.load(file)
-            result = mongodb_service.load_concepts(concepts_data)
-            results["concepts"] = result
-            if result["success"]:
-                success_count += 1
-        
-        # 진단테스트 데이터 로드
-        with open(diagnostic_file, 'r', encoding='utf-8') as file:
-            diagnostic_data = json.load(file)
-            result = mongodb_service.load_diagnostic_tests(diagnostic_data)
-            results["diagnostic_tests"] = result
-            if result["success"]:
-                success_count += 1
-        
-        # 단원테스트 데이터 로드
-        with open(unit_test_file, 'r', encoding='utf-8') as file:
-            unit_test_data = json.load(file)
-            result = mongodb_service.load_unit_tests(unit_test_data)
-            results["unit_tests"] = result
+        # 파일별로 항목을 스트리밍하며 로드
+        for data_type, file_path in (("concepts", concepts_file),
+                                     ("diagnostic_tests", diagnostic_file),
+                                     ("unit_tests", unit_test_file)):
+            with open(file_path, 'rb') as file:
+                result = mongodb_service.load_file(data_type, file)
+            results[data_type] = result
             if result["success"]:
                 success_count += 1
         
@@ -341,20 +321,12 @@ async def upload_file(
 ):
     """파일 업로드를 통한 데이터 로드"""
     try:
-        # 파일 내용 읽기
-        content = await file.read()
-        data = json.loads(content.decode('utf-8'))
-        
-        # 데이터 타입에 따라 처리
-        if data_type == "concepts":
-            result = mongodb_service.load_concepts(data)
-        elif data_type == "diagnostic_tests":
-            result = mongodb_service.load_diagnostic_tests(data)
-        elif data_type == "unit_tests":
-            result = mongodb_service.load_unit_tests(data)
-        else:
+        if data_type not in SEED_COLLECTIONS:
             raise HTTPException(status_code=400, detail="지원하지 않는 데이터 타입입니다.")
         
+        # 업로드 파일 전체를 메모리로 읽지 않고 스트리밍으로 파싱/적재 (워커 스레드에서 실행)
+        result = await run_in_threadpool(mongodb_service.load_file, data_type, file.file)
+        
         if result["success"]:
             return JSONResponse(content=result, status_code=200)
         else:
@@ -0,0 +1,217 @@
+"""
+Neo4j 읽기 경로 클라이언트
+드라이버 하나를 프로세스 전체에서 재사용하고(execute_query가 풀링된 연결과 라우팅을 처리),
+읽기 전용 run_cypher 결과를 (정규화된 쿼리, 파라미터) 키로 TTL + LRU 캐시에 보관합니다.
+그래프 동기화 스크립트가 올리는 버전 스탬프(:GraphMeta)가 바뀌면 캐시를 비웁니다.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+GRAPH_META_KEY = "concept_graph"
+
+# 선행 관계 타입 (neo4j_edges.csv의 type 값은 'precedes'/'PRECEDES'가 섞여 있어 대문자로 맞춰 비교)
+PRECEDES_TYPE = "PRECEDES"
+
+GRAPH_VERSION_QUERY = """
+    MATCH (m:GraphMeta {key: $key})
+    RETURN m.version as version
+"""
+
+# 버전은 밀리초 시각 기반으로 단조 증가 (GraphMeta 노드가 지워져도 이전 버전으로 돌아가지 않음)
+BUMP_GRAPH_VERSION_QUERY = """
+    MERGE (m:GraphMeta {key: $key})
+    WITH m, timestamp() as now
+    SET m.version = CASE WHEN now > coalesce(m.version, 0) THEN now ELSE m.version + 1 END,
+        m.updatedAt = datetime()
+    RETURN m.version as version
+"""
+
+# 쓰기 쿼리는 캐시하지 않고 실행 후 캐시를 비움
+WRITE_PATTERN = re.compile(r"\b(CREATE|MERGE|DELETE|SET|REMOVE|DROP|FOREACH|LOAD\s+CSV)\b", re.IGNORECASE)
+# 쓰기 키워드 검사 전에 지우는 문자열 리터럴 / `식별자` / 주석
+LITERAL_PATTERN = re.compile(r"'(?:\\.|[^'\\])*'|\"(?:\\.|[^\"\\])*\"|`[^`]*`|//[^\n]*|/\*.*?\*/", re.DOTALL)
+
+NEO4J_CACHE_MAX_ITEMS = int(os.getenv("NEO4J_CACHE_MAX_ITEMS", "2000"))
+NEO4J_CACHE_TTL = float(os.getenv("NEO4J_CACHE_TTL", "300"))
+NEO4J_VERSION_CHECK_INTERVAL = float(os.getenv("NEO4J_VERSION_CHECK_INTERVAL", "30"))
+NEO4J_MAX_POOL_SIZE = int(os.getenv("NEO4J_MAX_POOL_SIZE", "50"))
+
+
+def normalize_query(query: str) -> str:
+    """공백/줄바꿈 차이를 없앤 쿼리 문자열"""
+    return " ".join(query.split())
+
+
+def is_write_query(query: str) -> bool:
+    """쓰기 절이 있는지 (문자열/주석 안의 단어, n.set 속성, :Set 레이블, $set 파라미터, {set: ...} 키는 제외)"""
+    stripped = LITERAL_PATTERN.sub(" ", query)
+    for match in WRITE_PATTERN.finditer(stripped):
+        before = stripped[:match.start()].rstrip()[-1:]
+        after = stripped[match.end():].lstrip()[:1]
+        if before not in (".", ":", "|", "$") and after != ":":
+            return True
+    return False
+
+
+def make_query_key(query: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """(정규화된 쿼리, 파라미터) 캐시 키"""
+    return normalize_query(query) + "\x1f" + json.dumps(params or {}, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def is_precedes_type(value: Any) -> bool:
+    """CSV type 값이 PRECEDES 관계인지 (대소문자 무시)"""
+    return str(value).strip().upper() == PRECEDES_TYPE
+
+
+def bump_graph_version(session) -> int:
+    """그래프 버전 스탬프 증가 (sync_neo4j / rebuild_neo4j가 변경을 적용한 뒤 호출)"""
+    record = session.run(BUMP_GRAPH_VERSION_QUERY, key=GRAPH_META_KEY).single()
+    return record["version"]
+
+
+class CypherQueryCache:
+    """읽기 쿼리 결과 LRU + TTL 캐시 (그래프 버전이 바뀌면 전체 무효화)"""
+
+    def __init__(self, max_items: int = NEO4J_CACHE_MAX_ITEMS, ttl: float = NEO4J_CACHE_TTL):
+        self.max_items = max_items
+        self.ttl = ttl
+        self.graph_version: Optional[int] = None
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._items[key]
+                self.stats["misses"] += 1
+                return None
+            self._items.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[1]
+
+    def set(self, key: str, rows: List[Dict[str, Any]]):
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl, rows)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def set_graph_version(self, version: Optional[int]):
+        """버전 스탬프가 바뀌었으면 캐시 비우기"""
+        with self._lock:
+            if version == self.graph_version:
+                return
+            self.graph_version = version
+        self.invalidate()
+
+    def invalidate(self):
+        with self._lock:
+            self._items.clear()
+            self.stats["invalidations"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "items": len(self._items),
+            "graph_version": self.graph_version,
+            "hit_rate": round(self.stats["hits"] / total, 4) if total else 0.0,
+        }
+
+
+class Neo4jClient:
+    """프로세스 공용 Neo4j 드라이버 + 읽기 결과 캐시"""
+
+    def __init__(self, cache: Optional[CypherQueryCache] = None,
+                 version_check_interval: float = NEO4J_VERSION_CHECK_INTERVAL):
+        self.driver = None
+        self.database: Optional[str] = None
+        self.cache = cache or CypherQueryCache()
+        self.version_check_interval = version_check_interval
+        self._version_checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def connect(self, uri: Optional[str] = None, user: Optional[str] = None, password: Optional[str] = None):
+        """드라이버 생성 (여러 번 호출해도 하나만 유지)"""
+        from neo4j import GraphDatabase
+
+        with self._lock:
+            if self.driver is not None:
+                return
+            self.driver = GraphDatabase.driver(
+                uri or os.getenv("AURA_URI"),
+                auth=(user or os.getenv("AURA_USER"), password or os.getenv("AURA_PASS")),
+                max_connection_pool_size=NEO4J_MAX_POOL_SIZE,
+            )
+            self.database = os.getenv("NEO4J_DATABASE") or None
+            print(f"✅ Neo4j 드라이버 생성 (pool={NEO4J_MAX_POOL_SIZE})")
+
+    def _execute(self, query: str, params: Optional[Dict[str, Any]], read: bool) -> List[Dict[str, Any]]:
+        from neo4j import RoutingControl
+
+        if self.driver is None:
+            self.connect()
+        records, _, _ = self.driver.execute_query(
+            query, params or {},
+            routing_=RoutingControl.READ if read else RoutingControl.WRITE,
+            database_=self.database,
+        )
+        return [record.data() for record in records]
+
+    def _check_graph_version(self):
+        """version_check_interval마다 버전 스탬프를 읽어 바뀌었으면 캐시 무효화"""
+        now = time.monotonic()
+        if now - self._version_checked_at < self.version_check_interval:
+            return
+        self._version_checked_at = now
+        try:
+            rows = self._execute(GRAPH_VERSION_QUERY, {"key": GRAPH_META_KEY}, read=True)
+        except Exception as e:
+            print(f"⚠️ 그래프 버전 확인 실패: {e}")
+            return
+        self.cache.set_graph_version(rows[0]["version"] if rows else None)
+
+    def run_cypher(self, query: str, params: Optional[Dict[str, Any]] = None,
+                   use_cache: bool = True) -> List[Dict[str, Any]]:
+        """Cypher 실행 결과를 dict 목록으로 반환 (읽기 쿼리는 캐시 사용)"""
+        if is_write_query(query):
+            rows = self._execute(query, params, read=False)
+            self.cache.invalidate()
+            return rows
+
+        if not use_cache:
+            return self._execute(query, params, read=True)
+
+        self._check_graph_version()
+        key = make_query_key(query, params)
+        rows = self.cache.get(key)
+        if rows is None:
+            rows = self._execute(query, params, read=True)
+            self.cache.set(key, rows)
+        # 호출자가 결과를 수정해도 캐시가 바뀌지 않도록 얕은 복사
+        return [dict(row) for row in rows]
+
+    def close(self):
+        if self.driver is not None:
+            self.driver.close()
+        self.driver = None
+        self.cache.invalidate()
+
+
+# 프로세스 공용 인스턴스
+neo4j_client = Neo4jClient()
+
+
+def run_cypher(query: str, params: Optional[Dict[str, Any]] = None, use_cache: bool = True) -> List[Dict[str, Any]]:
+    """db.neo4j.run_cypher와 같은 시그니처의 캐시 적용 버전"""
+    return neo4j_client.run_cypher(query, params, use_cache)
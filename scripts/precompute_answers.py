@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+문제 은행 전체 AI 풀이/개념 설명 사전 생성 배치
+problem 컬렉션의 모든 문제에 대해 solve_prompt_v1 / concept_prompt_v1 응답을 미리 생성하여
+precomputed_answers 컬렉션에 저장합니다. 통합 API는 llm_cache를 통해 이 결과를 바로 반환합니다.
+
+- 동시 요청 수 제한 (--concurrency)
+- 체크포인트 파일로 중단 후 재개 (프롬프트 내용이 바뀐 항목은 다시 생성)
+- 개념 설명은 실제 요청의 concept_name(문제 단원 제목)을 키로 생성
+- --base-url 로 로컬 모의 LLM 서버(mock_llm_server.py)에 대해 실행 가능
+
+사용 예:
+    python precompute_answers.py --concurrency 16
+    python precompute_answers.py --base-url http://localhost:8900/v1 --limit 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# AI 디렉토리를 Python 경로에 추가
+AI_DIR = Path(__file__).parent
+sys.path.insert(0, str(AI_DIR))
+
+# 통합 API(mongo_pool)와 같은 문제 컬렉션
+MONGODB_PROBLEMS_COLLECTION = os.getenv("MONGODB_PROBLEMS_COLLECTION", "problems")
+
+# 프롬프트별로 미리 생성할 사용자 입력 (첫 번째 입력으로 생성하고 나머지는 같은 응답의 별칭 키로 저장)
+# 개념 설명은 실제 요청의 concept_name인 문제 단원의 개념 이름을 앞에 붙여 생성 (concept_questions)
+PRECOMPUTE_QUESTIONS = {
+    "solve_prompt_v1": ["이 문제를 풀어주세요", ""],
+    "concept_prompt_v1": [""],
+}
+
+
+def load_prompt_text(prompt_name):
+    """앱과 같은 load_prompt로 프롬프트 로드"""
+    try:
+        from app.ai.prompts import load_prompt
+    except ImportError:
+        from ai.prompts import load_prompt
+    return load_prompt(prompt_name)
+
+
+async def llm_generate(prompt_name, prompt_text, problem, question):
+    """통합 API와 같은 사용자 메시지로 GPT 응답(JSON 문자열) 생성"""
+    from llm_client import build_problem_text, chat_json
+    return await chat_json(prompt_text, build_problem_text(problem, prompt_name, question))
+
+
+def concept_questions(problem, unit_titles):
+    """개념 설명 요청의 concept_name 후보 (문제의 concept 필드, 단원 제목 순)"""
+    names = [problem.get("concept"), unit_titles.get(problem.get("unitId"))]
+    return [name for name in dict.fromkeys(names) if name]
+
+
+class AnswerPrecomputer:
+    def __init__(self, prompts, concurrency=8, batch_size=50, checkpoint_path=None, resume=True, limit=None,
+                 generate=llm_generate, model=None):
+        self.client = None
+        self.db = None
+        self.mongodb_uri = os.getenv("MONGODB_URI")
+        self.database_name = os.getenv("MONGODB_DB", "nerdmath")
+
+        self.prompts = prompts
+        self.generate = generate
+        # None이면 prepare()에서 llm_client.DEFAULT_MODEL 사용 (통합 API 캐시 키와 같은 모델)
+        self.model = model
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.checkpoint_path = Path(checkpoint_path or AI_DIR / "precompute_checkpoint.jsonl")
+        self.resume = resume
+        self.limit = limit
+
+        self.prompt_texts = {}
+        self.unit_titles = {}
+        self.done = set()
+        self.pending_docs = []
+        self.pending_checkpoints = []
+        self.stats = {"generated": 0, "skipped": 0, "failed": 0, "unsaved": 0}
+        self.errors = []
+
+    def connect(self):
+        """MongoDB에 연결"""
+        from pymongo import MongoClient
+
+        if not self.mongodb_uri:
+            print("❌ MONGODB_URI 환경변수가 설정되지 않았습니다.")
+            return False
+        try:
+            print("🚀 MongoDB 연결 시도 중...")
+            self.client = MongoClient(self.mongodb_uri)
+            self.db = self.client[self.database_name]
+            self.client.admin.command("ping")
+            print("✅ MongoDB 연결 성공!")
+            return True
+        except Exception as e:
+            print(f"❌ MongoDB 연결 실패: {e}")
+            return False
+
+    def prepare(self):
+        """프롬프트 로드, 인덱스 생성, 단원 제목 로드, 체크포인트 읽기"""
+        from llm_cache import prompt_fingerprint
+        from problem_concept_index import unit_title
+
+        if self.model is None:
+            from llm_client import DEFAULT_MODEL
+            self.model = DEFAULT_MODEL
+
+        for prompt_name in self.prompts:
+            if prompt_name not in self.prompt_texts:
+                self.prompt_texts[prompt_name] = load_prompt_text(prompt_name)
+            print(f"📝 프롬프트 로드: {prompt_name} ({prompt_fingerprint(self.prompt_texts[prompt_name])})")
+
+        # 개념 설명 요청의 concept_name(단원 제목)으로 키를 만들기 위해 한 번만 읽음
+        if "concept_prompt_v1" in self.prompts:
+            self.unit_titles = {unit["unitId"]: unit_title(unit)
+                                for unit in self.db.unit.find({}, {"_id": 0, "unitId": 1, "title": 1})
+                                if unit.get("unitId")}
+
+        collection = self.db.precomputed_answers
+        collection.create_index("key", unique=True)
+        collection.create_index([("problemId", 1), ("prompt", 1)])
+
+        if self.resume and self.checkpoint_path.exists():
+            current = {name: prompt_fingerprint(text) for name, text in self.prompt_texts.items()}
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    # 프롬프트 내용이 바뀐 항목은 다시 생성
+                    if current.get(entry.get("prompt")) == entry.get("promptHash"):
+                        self.done.add((entry["problemId"], entry["prompt"]))
+            print(f"🔁 체크포인트에서 완료된 항목 {len(self.done)}개 확인")
+        elif not self.resume and self.checkpoint_path.exists():
+            self.checkpoint_path.unlink()
+
+    def iter_tasks(self):
+        """(problem_id, 문제 문서, 프롬프트 이름) 작업 목록 생성"""
+        cursor = self.db[MONGODB_PROBLEMS_COLLECTION].find({}, {"problem_id": 1, "problemId": 1, "content": 1, "unitId": 1, "concept": 1})
+        count = 0
+        for problem in cursor:
+            problem_id = problem.get("problem_id") or problem.get("problemId")
+            if not problem_id:
+                continue
+            for prompt_name in self.prompts:
+                if (problem_id, prompt_name) in self.done:
+                    self.stats["skipped"] += 1
+                    continue
+                yield problem_id, problem, prompt_name
+            count += 1
+            if self.limit and count >= self.limit:
+                break
+
+    def take_pending(self):
+        """대기 중인 저장 작업을 꺼내고 버퍼 비우기 (이벤트 루프에서 호출)"""
+        pending = (self.pending_docs, self.pending_checkpoints)
+        self.pending_docs, self.pending_checkpoints = [], []
+        return pending
+
+    def save(self, docs):
+        """사전 생성 응답을 key 기준 upsert로 한 번에 저장"""
+        from pymongo import UpdateOne
+
+        ops = [UpdateOne({"key": doc["key"]}, {"$set": doc}, upsert=True) for doc in docs]
+        self.db.precomputed_answers.bulk_write(ops, ordered=False)
+
+    def flush(self, docs, checkpoints):
+        """결과를 저장하고 체크포인트 기록
+        저장 실패는 기록만 하고 넘어감 (워커가 죽으면 작업 큐가 비워지지 않아 배치 전체가 멈춤),
+        체크포인트를 남기지 않으므로 다음 실행에서 다시 생성됩니다."""
+        if not docs:
+            return
+        try:
+            self.save(docs)
+        except Exception as e:
+            details = getattr(e, "details", None) or {}
+            write_errors = len(details.get("writeErrors", []))
+            self.stats["unsaved"] += len(checkpoints)
+            self.errors.append(f"저장 실패 ({len(checkpoints)}개 항목, 쓰기 오류 {write_errors}개): {e}")
+            print(f"❌ 사전 생성 결과 저장 실패 ({len(checkpoints)}개 항목): {e}")
+            return
+        try:
+            with open(self.checkpoint_path, 'a', encoding='utf-8') as f:
+                for entry in checkpoints:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"⚠️ 체크포인트 기록 실패: {e}")
+
+    def questions_for(self, problem, prompt_name):
+        """문제 하나에 대해 생성할 사용자 입력 (첫 번째로 생성, 나머지는 별칭)"""
+        questions = list(PRECOMPUTE_QUESTIONS[prompt_name])
+        if prompt_name == "concept_prompt_v1":
+            questions = concept_questions(problem, self.unit_titles) + questions
+        return list(dict.fromkeys(questions))
+
+    async def generate_one(self, problem_id, problem, prompt_name):
+        """문제 하나, 프롬프트 하나에 대한 응답 생성"""
+        from llm_cache import make_cache_key, prompt_fingerprint
+
+        prompt_text = self.prompt_texts[prompt_name]
+        questions = self.questions_for(problem, prompt_name)
+        ai_response = await self.generate(prompt_name, prompt_text, problem, questions[0])
+        answer = json.loads(ai_response)
+
+        now = datetime.utcnow()
+        prompt_hash = prompt_fingerprint(prompt_text)
+        for question in questions:
+            key = make_cache_key(problem_id, prompt_name, prompt_text, self.model, question)
+            self.pending_docs.append({
+                "key": key,
+                "problemId": problem_id,
+                "prompt": prompt_name,
+                "promptHash": prompt_hash,
+                "model": self.model,
+                "question": question,
+                "answer": answer,
+                "generatedAt": now,
+            })
+        self.pending_checkpoints.append({"problemId": problem_id, "prompt": prompt_name, "promptHash": prompt_hash})
+
+    async def run(self):
+        """제한된 동시성으로 전체 문제 은행 처리"""
+        queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        flush_lock = asyncio.Lock()
+        started = time.perf_counter()
+
+        async def worker():
+            while True:
+                task = await queue.get()
+                if task is None:
+                    queue.task_done()
+                    return
+                problem_id, problem, prompt_name = task
+                try:
+                    await self.generate_one(problem_id, problem, prompt_name)
+                    self.stats["generated"] += 1
+                except Exception as e:
+                    self.stats["failed"] += 1
+                    self.errors.append(f"{problem_id} / {prompt_name}: {e}")
+                if len(self.pending_checkpoints) >= self.batch_size:
+                    pending = self.take_pending()
+                    async with flush_lock:
+                        await asyncio.to_thread(self.flush, *pending)
+                finished = self.stats["generated"] + self.stats["failed"]
+                if finished and finished % 50 == 0:
+                    elapsed = time.perf_counter() - started
+                    print(f"   진행률: {finished}개 처리 ({finished / elapsed:.1f}개/초)")
+                queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        for task in self.iter_tasks():
+            await queue.put(task)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+
+        async with flush_lock:
+            await asyncio.to_thread(self.flush, *self.take_pending())
+
+        elapsed = time.perf_counter() - started
+        print(f"\n📊 사전 생성 완료! ({elapsed:.1f}초)")
+        print(f"✅ 생성: {self.stats['generated']}개")
+        print(f"⏭️ 건너뜀 (체크포인트): {self.stats['skipped']}개")
+        print(f"❌ 실패: {self.stats['failed']}개")
+        if self.stats["unsaved"]:
+            print(f"❌ 저장 실패: {self.stats['unsaved']}개")
+        for error in self.errors[:10]:
+            print(f"   - {error}")
+        return self.stats["failed"] == 0 and self.stats["unsaved"] == 0
+
+    def close(self):
+        """MongoDB 연결 종료"""
+        if self.client:
+            self.client.close()
+            print("🔌 MongoDB 연결 종료")
+
+
+async def run_and_close(precomputer):
+    """배치 실행 후 공유 OpenAI 커넥션 풀 정리"""
+    from llm_client import close_async_client
+    try:
+        return await precomputer.run()
+    finally:
+        await close_async_client()
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="문제 은행 AI 응답 사전 생성 배치")
+    parser.add_argument("--prompts", nargs="+", default=list(PRECOMPUTE_QUESTIONS.keys()),
+                        choices=list(PRECOMPUTE_QUESTIONS.keys()), help="생성할 프롬프트 목록")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 LLM 요청 수")
+    parser.add_argument("--batch-size", type=int, default=50, help="MongoDB 저장/체크포인트 단위")
+    parser.add_argument("--checkpoint", default=None, help="체크포인트 파일 경로")
+    parser.add_argument("--fresh", action="store_true", help="체크포인트를 무시하고 처음부터 생성")
+    parser.add_argument("--limit", type=int, default=None, help="처리할 최대 문제 수")
+    parser.add_argument("--base-url", default=None, help="OpenAI 호환 API 주소 (예: 모의 서버)")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+
+    # .env 파일 로드
+    load_dotenv(AI_DIR / ".env")
+
+    if args.base_url:
+        os.environ["OPENAI_BASE_URL"] = args.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "mock-key")
+
+    print("🚀 AI 응답 사전 생성 시작")
+    print("=" * 60)
+
+    precomputer = None
+    try:
+        precomputer = AnswerPrecomputer(
+            prompts=args.prompts,
+            concurrency=args.concurrency,
+            batch_size=args.batch_size,
+            checkpoint_path=args.checkpoint,
+            resume=not args.fresh,
+            limit=args.limit,
+        )
+
+        if not precomputer.connect():
+            print("❌ MongoDB 연결 실패")
+            return
+
+        precomputer.prepare()
+        success = asyncio.run(run_and_close(precomputer))
+
+        if success:
+            print("\n🎉 AI 응답 사전 생성 완료!")
+        else:
+            print("\n⚠️ 일부 항목 생성 실패 - 다시 실행하면 실패한 항목만 재시도합니다.")
+
+    except Exception as e:
+        print(f"❌ 스크립트 실행 실패: {e}")
+        import traceback
+        traceback.print_exc()
+
+    finally:
+        if precomputer:
+            precomputer.close()
+
+
+if __name__ == "__main__":
+    main()
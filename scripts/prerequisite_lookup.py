@@ -0,0 +1,75 @@
+"""
+여러 개념의 선행/후행 개념 일괄 조회
+진단에서 틀린 개념이 여러 개일 때 개념마다 Cypher를 두 번씩 보내지 않고,
+메모리 그래프 스냅샷 한 번 또는 UNWIND 쿼리 한 번으로 모든 개념의 관계를 조회합니다.
+
+반환 형태 (개념 이름 → 관계):
+    {
+        "1.4 절댓값": {
+            "concept": ..., "unit": ..., "grade": ...,
+            "predecessors": [{"concept", "unit", "grade"}, ...],   # (p)-[:PRECEDES]->(개념)
+            "successors": [{"concept", "unit", "grade"}, ...],     # (개념)-[:PRECEDES]->(s)
+            "ancestors": [{"concept", "unit", "grade", "hops"}, ...]  # max_hops 이내 선행 개념
+        },
+        ...
+    }
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# 한 번의 일괄 조회에서 허용하는 최대 개념 수
+MAX_BATCH_CONCEPTS = 100
+# 가변 길이 패턴의 홉 수는 파라미터로 넘길 수 없어 정수 검증 후 쿼리에 넣음
+MAX_HOPS_LIMIT = 10
+
+BATCH_RELATIONS_QUERY = """
+    UNWIND $names AS name
+    MATCH (c:Concept {{concept: name}})
+    OPTIONAL MATCH (p:Concept)-[:PRECEDES]->(c)
+    WITH c, collect(DISTINCT p {{.concept, .unit, .grade}}) AS predecessors
+    OPTIONAL MATCH (c)-[:PRECEDES]->(s:Concept)
+    WITH c, predecessors, collect(DISTINCT s {{.concept, .unit, .grade}}) AS successors
+    OPTIONAL MATCH path = (a:Concept)-[:PRECEDES*1..{max_hops}]->(c)
+    WITH c, predecessors, successors, a, min(length(path)) AS hops
+    RETURN c.concept as concept, c.unit as unit, c.grade as grade, predecessors, successors,
+           collect(CASE WHEN a IS NULL THEN NULL
+                   ELSE {{concept: a.concept, unit: a.unit, grade: a.grade, hops: hops}} END) AS ancestors
+"""
+
+
+def _sort_nodes(nodes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return sorted(nodes, key=lambda n: (n.get("unit") or "", n.get("concept") or ""))
+
+
+def query_relations(run_cypher: Callable, names: List[str], max_hops: int = 5) -> Dict[str, Dict[str, Any]]:
+    """UNWIND 쿼리 한 번으로 여러 개념의 관계 조회"""
+    rows = run_cypher(BATCH_RELATIONS_QUERY.format(max_hops=max_hops), {"names": names}) or []
+    result: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        result[row["concept"]] = {
+            "concept": row["concept"],
+            "unit": row.get("unit"),
+            "grade": row.get("grade"),
+            "predecessors": _sort_nodes(row.get("predecessors") or []),
+            "successors": _sort_nodes(row.get("successors") or []),
+            "ancestors": sorted(row.get("ancestors") or [], key=lambda n: (n["hops"], n["concept"])),
+        }
+    return result
+
+
+def lookup_prerequisites(names: Iterable[str], max_hops: int = 5, run_cypher: Optional[Callable] = None,
+                         snapshot=None) -> Dict[str, Dict[str, Any]]:
+    """여러 개념의 관계 일괄 조회 (스냅샷이 있으면 로컬 조회, 없으면 UNWIND 쿼리 한 번)"""
+    names = [name for name in dict.fromkeys(names) if name]
+    max_hops = int(max_hops)
+    if not 1 <= max_hops <= MAX_HOPS_LIMIT:
+        raise ValueError(f"max_hops는 1~{MAX_HOPS_LIMIT} 사이여야 합니다: {max_hops}")
+    if len(names) > MAX_BATCH_CONCEPTS:
+        raise ValueError(f"한 번에 최대 {MAX_BATCH_CONCEPTS}개 개념까지 조회할 수 있습니다.")
+    if not names:
+        return {}
+    if snapshot is not None:
+        return snapshot.relations(names, max_hops)
+    if run_cypher is None:
+        raise ValueError("snapshot 또는 run_cypher가 필요합니다.")
+    return query_relations(run_cypher, names, max_hops)
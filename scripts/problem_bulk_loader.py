@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+문제 데이터 병렬 일괄 upsert
+문제마다 find_one + insert_one을 반복하는 대신
+1. 원본 줄을 프로세스 풀에서 나눠 파싱/검증하고 (줄 번호별 오류 수집)
+2. problemId 기준 UpdateOne(upsert=True)을 batch_size개씩 묶어
+3. 여러 배치를 공유 클라이언트 위의 스레드 풀에서 동시에 bulk_write(ordered=False) 합니다.
+처리량(개/초)과 오류 요약을 출력합니다.
+"""
+
+import json
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+BULK_BATCH_SIZE = 1000
+BULK_WORKERS = 4
+VALIDATE_CHUNK_SIZE = 500
+
+# 테이블 정의서 기준 problem 필수 필드
+PROBLEM_REQUIRED_FIELDS = [
+    "problemId", "unitId", "grade", "chapter", "context",
+    "cognitiveType", "level", "diagnosticTest", "type",
+    "tags", "content", "correctAnswer", "explanation",
+    "createdAt", "updatedAt"
+]
+PROBLEM_OPTIONAL_STRING_FIELDS = ["imageUrl", "diagnosticUnit", "promptVersion", "subunit"]
+
+
+def parse_datetime(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+
+
+def clean_problem(problem: Dict[str, Any]) -> Dict[str, Any]:
+    """테이블 정의서 타입으로 정리한 문제 문서 (검증 실패 시 ValueError)"""
+    if not isinstance(problem, dict):
+        raise ValueError("문제 데이터가 객체가 아닙니다")
+    require_problem_fields(problem)
+
+    try:
+        cleaned = {
+            "problemId": str(problem["problemId"]),
+            "unitId": str(problem["unitId"]),
+            "grade": int(problem["grade"]),
+            "chapter": int(problem["chapter"]),
+            "context": problem["context"],
+            "cognitiveType": str(problem["cognitiveType"]),
+            "level": str(problem["level"]),
+            "diagnosticTest": bool(problem["diagnosticTest"]),
+            "type": str(problem["type"]),
+            "tags": list(problem["tags"]),
+            "content": problem["content"],
+            "correctAnswer": str(problem["correctAnswer"]),
+            "explanation": problem["explanation"],
+        }
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"데이터 타입 오류 - {e}")
+    try:
+        cleaned["createdAt"] = parse_datetime(problem["createdAt"])
+        cleaned["updatedAt"] = parse_datetime(problem["updatedAt"])
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"날짜 변환 오류 - {e}")
+    for field in PROBLEM_OPTIONAL_STRING_FIELDS:
+        if field in problem:
+            cleaned[field] = str(problem[field])
+    return cleaned
+
+
+def require_problem_fields(problem: Dict[str, Any]) -> Dict[str, Any]:
+    """필수 필드만 확인하고 문서는 그대로 반환 (이미 변환된 문제용)"""
+    missing = [field for field in PROBLEM_REQUIRED_FIELDS if field not in problem]
+    if missing:
+        raise ValueError(f"필수 필드 누락 - {missing}")
+    return problem
+
+
+def parse_problem_line(line: str) -> Dict[str, Any]:
+    """NDJSON 한 줄 → 정리된 문제 문서"""
+    try:
+        problem = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"JSON 파싱 오류 - {e.msg}")
+    return clean_problem(problem)
+
+
+def _validate_chunk(validator: Callable[[Any], Dict[str, Any]], chunk: List[Tuple[Any, Any]]):
+    """(위치, 원본) 묶음 검증 — 프로세스 풀 작업 단위"""
+    docs, errors = [], []
+    for location, raw in chunk:
+        try:
+            docs.append(validator(raw))
+        except Exception as e:
+            errors.append((location, str(e)))
+    return docs, errors
+
+
+def _chunks(items: Iterable[Any], size: int) -> Iterable[List[Any]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def validate_parallel(items: Iterable[Tuple[Any, Any]], validator: Callable[[Any], Dict[str, Any]] = parse_problem_line,
+                      workers: int = BULK_WORKERS, chunk_size: int = VALIDATE_CHUNK_SIZE):
+    """(위치, 원본) 목록을 프로세스 풀에서 검증, (문서 목록, [(위치, 오류)]) 반환 (입력 순서 유지)"""
+    task = partial(_validate_chunk, validator)
+    docs, errors = [], []
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for chunk_docs, chunk_errors in (pool.map if pool else map)(task, _chunks(items, chunk_size)):
+            docs.extend(chunk_docs)
+            errors.extend(chunk_errors)
+    finally:
+        if pool:
+            pool.shutdown()
+    return docs, errors
+
+
+def dedupe_by_key(docs: List[Dict[str, Any]], key: str = "problemId"):
+    """같은 키가 여러 번 나오면 마지막 문서만 남김 (동시 배치 간 upsert 경합 방지)"""
+    latest: Dict[Any, Dict[str, Any]] = {}
+    for doc in docs:
+        latest[doc[key]] = doc
+    return list(latest.values()), len(docs) - len(latest)
+
+
+def _write_batch(collection, batch: List[Dict[str, Any]], key: str, overwrite: bool, make_op: Callable):
+    """배치 하나 bulk_write, (upserted, matched, modified, [(키, 오류)]) 반환"""
+    ops = [make_op(key, doc, overwrite) for doc in batch]
+    try:
+        result = collection.bulk_write(ops, ordered=False)
+        return result.upserted_count, result.matched_count, result.modified_count, []
+    except Exception as e:
+        details = getattr(e, "details", None)
+        if details is None:
+            # 배치 전체 실패
+            return 0, 0, 0, [(doc.get(key), str(e)) for doc in batch]
+        errors = [(batch[error["index"]].get(key), error.get("errmsg", "쓰기 오류"))
+                  for error in details.get("writeErrors", [])]
+        return details.get("nUpserted", 0), details.get("nMatched", 0), details.get("nModified", 0), errors
+
+
+def bulk_upsert(collection, docs: List[Dict[str, Any]], key: str = "problemId", batch_size: int = BULK_BATCH_SIZE,
+                workers: int = BULK_WORKERS, overwrite: bool = True, make_op: Optional[Callable] = None) -> Dict[str, Any]:
+    """key 기준 upsert 배치를 동시에 실행 (overwrite=False면 기존 문서는 건드리지 않음)"""
+    if make_op is None:
+        from pymongo import UpdateOne
+
+        def make_op(key, doc, overwrite):
+            return UpdateOne({key: doc[key]}, {"$set" if overwrite else "$setOnInsert": doc}, upsert=True)
+    docs, duplicates = dedupe_by_key(docs, key)
+    batches = list(_chunks(docs, batch_size))
+    started = time.time()
+    report = {"total": len(docs), "duplicates": duplicates, "batches": len(batches),
+              "upserted": 0, "matched": 0, "modified": 0, "errors": []}
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        for upserted, matched, modified, errors in pool.map(
+                lambda batch: _write_batch(collection, batch, key, overwrite, make_op), batches):
+            report["upserted"] += upserted
+            report["matched"] += matched
+            report["modified"] += modified
+            report["errors"].extend(errors)
+    report["seconds"] = round(time.time() - started, 3)
+    report["docs_per_sec"] = round(len(docs) / report["seconds"], 1) if report["seconds"] else float(len(docs))
+    return report
+
+
+def summarize_errors(errors: List[Tuple[Any, str]], limit: int = 5) -> List[Tuple[str, int, List[Any]]]:
+    """오류 메시지별 (메시지, 건수, 예시 위치) — 건수 많은 순"""
+    counts = Counter(message for _, message in errors)
+    examples: Dict[str, List[Any]] = {}
+    for location, message in errors:
+        bucket = examples.setdefault(message, [])
+        if len(bucket) < limit:
+            bucket.append(location)
+    return [(message, count, examples[message]) for message, count in counts.most_common()]
+
+
+def print_report(report: Dict[str, Any], validation_errors: List[Tuple[Any, str]] = ()):
+    """처리량과 오류 요약 출력"""
+    print(f"\n📊 일괄 upsert 완료: {report['total']}개 / {report['batches']}개 배치")
+    print(f"  ✅ 새로 저장: {report['upserted']}개, 기존 문서 일치: {report['matched']}개 (변경 {report['modified']}개)")
+    if report["duplicates"]:
+        print(f"  🔄 입력 내 중복 problemId: {report['duplicates']}개 (마지막 항목 사용)")
+    print(f"  ⚡ {report['seconds']}초 ({report['docs_per_sec']}개/초)")
+    for title, errors in (("검증 오류", list(validation_errors)), ("저장 오류", report["errors"])):
+        if not errors:
+            continue
+        print(f"  ⚠️ {title} {len(errors)}건:")
+        for message, count, locations in summarize_errors(errors):
+            print(f"    - {message} ({count}건, 예: {locations})")
@@ -0,0 +1,109 @@
+"""
+문제 문서 캐시
+problem_id(또는 _id)로 조회한 문제 문서를 프로세스 내 LRU + TTL 캐시에 보관하고,
+여러 문제를 한 번의 $in 쿼리로 조회하는 다건 조회를 제공합니다.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+# 한 번의 다건 조회에서 허용하는 최대 문제 수
+MAX_BATCH_SIZE = 200
+
+
+class ProblemCache:
+    """읽기 관통(read-through) 문제 문서 캐시"""
+
+    def __init__(self, collection=None, max_items: int = 5000, ttl: int = 600):
+        self.collection = collection
+        self.max_items = max_items
+        self.ttl = ttl
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "db_queries": 0, "evictions": 0}
+
+    def set_collection(self, collection):
+        """문제 컬렉션 연결 (컬렉션이 바뀌면 캐시 비우기)"""
+        if collection is not self.collection:
+            self.collection = collection
+            self.invalidate()
+
+    def _cache_get(self, problem_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._items.get(problem_id)
+            if entry is None:
+                return None
+            expires_at, problem = entry
+            if expires_at < time.monotonic():
+                del self._items[problem_id]
+                return None
+            self._items.move_to_end(problem_id)
+            return problem
+
+    def _cache_set(self, problem_id: str, problem: Dict[str, Any]):
+        with self._lock:
+            self._items[problem_id] = (time.monotonic() + self.ttl, problem)
+            self._items.move_to_end(problem_id)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def get(self, problem_id: str) -> Optional[Dict[str, Any]]:
+        """문제 하나 조회 (캐시 → MongoDB)"""
+        return self.get_many([problem_id]).get(problem_id)
+
+    def get_many(self, problem_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """여러 문제 조회, 캐시에 없는 문제는 한 번의 $in 쿼리로 조회"""
+        found: Dict[str, Dict[str, Any]] = {}
+        missing: List[str] = []
+        for problem_id in dict.fromkeys(problem_ids):
+            problem = self._cache_get(problem_id)
+            if problem is not None:
+                self.stats["hits"] += 1
+                found[problem_id] = problem
+            else:
+                self.stats["misses"] += 1
+                missing.append(problem_id)
+
+        if missing and self.collection is not None:
+            self.stats["db_queries"] += 1
+            by_id: Dict[str, Dict[str, Any]] = {}
+            cursor = self.collection.find({"$or": [
+                {"problem_id": {"$in": missing}},
+                {"_id": {"$in": missing}},
+            ]})
+            for problem in cursor:
+                # problem_id 필드 일치를 _id 일치보다 우선
+                if problem.get("problem_id") in missing:
+                    by_id[problem["problem_id"]] = problem
+                elif problem.get("_id") in missing:
+                    by_id.setdefault(problem["_id"], problem)
+            for problem_id, problem in by_id.items():
+                self._cache_set(problem_id, problem)
+                found[problem_id] = problem
+
+        return found
+
+    def invalidate(self, problem_ids: Optional[Iterable[str]] = None):
+        """지정한 문제(없으면 전체)를 캐시에서 제거"""
+        with self._lock:
+            if problem_ids is None:
+                self._items.clear()
+                return
+            for problem_id in problem_ids:
+                self._items.pop(problem_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """적중/미스 통계"""
+        total = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "items": len(self._items),
+            "hit_rate": round(self.stats["hits"] / total, 4) if total else 0.0,
+        }
+
+
+# 프로세스 공용 문제 캐시 인스턴스
+problem_cache = ProblemCache()
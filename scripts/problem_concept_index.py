@@ -0,0 +1,212 @@
+"""
+문제 → 단원 → 개념 해석 인덱스
+problem / unit / concept 컬렉션과 Neo4j Concept 이름을 한 번 읽어 dict 기반 매핑 테이블로 컴파일하고,
+진단 답안 목록 전체를 문제마다 find_one을 반복하지 않고 O(1) 조회 한 번씩으로 해석합니다.
+원본 컬렉션이 바뀌면(문서 수 / 최신 _id / 최신 syncedAt 변경) 다음 조회 때 다시 컴파일합니다.
+
+해석 우선순위:
+1. problemId → unitId → 단원 제목과 같은 이름(단원 코드 제외)의 Neo4j 개념
+2. 단원의 학년/챕터/순서로 만든 단원 코드("챕터.순서")와 같은 코드의 Neo4j 개념
+3. 문제 ID 안에 "1.4" 처럼 단원 코드(숫자.숫자)가 있으면 처음 나오는 그 코드의 Neo4j 개념
+"""
+
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# main.py는 패키지(from .problem_concept_index)로, 테스트/배치 스크립트는 scripts 경로에서 바로 불러옴
+try:
+    from .content_hash_sync import SYNCED_FIELD
+except ImportError:
+    from content_hash_sync import SYNCED_FIELD
+
+UNIT_CODE_PATTERN = re.compile(r"(\d+\.\d+)")
+LEADING_CODE_PATTERN = re.compile(r"^\s*\d+(\.\d+)*\.?\s*")
+
+# 컴파일 시 읽는 필드만 가져옴
+PROBLEM_PROJECTION = {"_id": 0, "problemId": 1, "unitId": 1, "grade": 1}
+UNIT_PROJECTION = {"_id": 0, "unitId": 1, "title": 1, "grade": 1, "chapter": 1, "orderInGrade": 1}
+CONCEPT_PROJECTION = {"_id": 0, "conceptId": 1, "unitId": 1}
+
+
+def extract_unit_code(name: Optional[str]) -> Optional[str]:
+    """개념명/문제 ID에서 단원 코드 추출 (예: '1.5 정수와 유리수의 덧셈, 뺄셈' → '1.5')"""
+    if not name:
+        return None
+    match = UNIT_CODE_PATTERN.search(name)
+    return match.group(1) if match else None
+
+
+def normalize_title(name: Optional[str]) -> str:
+    """단원 코드와 공백을 제외한 비교용 제목"""
+    if not name:
+        return ""
+    return "".join(LEADING_CODE_PATTERN.sub("", name).split())
+
+
+def unit_title(unit: Dict[str, Any]) -> Optional[str]:
+    """unit.title은 {"ko": ...} 형태 또는 문자열"""
+    title = unit.get("title")
+    if isinstance(title, dict):
+        return title.get("ko") or next(iter(title.values()), None)
+    return title
+
+
+class ProblemConceptIndex:
+    """컴파일된 문제 → 단원 → 개념 매핑 테이블 (불변)"""
+
+    def __init__(self, problems: Iterable[Dict[str, Any]], units: Iterable[Dict[str, Any]],
+                 concepts: Iterable[Dict[str, Any]], concept_names: Iterable[str], fingerprint: Any = None):
+        concept_names = [name for name in concept_names if name]
+        by_title: Dict[str, str] = {}
+        self.concept_by_code: Dict[str, str] = {}
+        for name in sorted(concept_names):
+            by_title.setdefault(normalize_title(name), name)
+            code = extract_unit_code(name)
+            if code:
+                self.concept_by_code.setdefault(code, name)
+
+        concept_ids: Dict[str, List[str]] = {}
+        for concept in concepts:
+            if concept.get("unitId") and concept.get("conceptId"):
+                concept_ids.setdefault(concept["unitId"], []).append(concept["conceptId"])
+
+        # unitId → 해석 결과 (문제 해석 시 그대로 공유)
+        self.units: Dict[str, Dict[str, Any]] = {}
+        for unit in units:
+            unit_id = unit.get("unitId")
+            if not unit_id:
+                continue
+            title = unit_title(unit)
+            concept = by_title.get(normalize_title(title))
+            if concept is None and unit.get("chapter") is not None and unit.get("orderInGrade") is not None:
+                concept = self.concept_by_code.get(f"{unit['chapter']}.{unit['orderInGrade']}")
+            self.units[unit_id] = {
+                "unitId": unit_id,
+                "unitTitle": title,
+                "grade": unit.get("grade"),
+                "concept": concept,
+                "conceptIds": concept_ids.get(unit_id, []),
+            }
+
+        self.problem_units: Dict[str, str] = {
+            str(problem["problemId"]): str(problem["unitId"])
+            for problem in problems
+            if problem.get("problemId") and problem.get("unitId")
+        }
+        self.fingerprint = fingerprint
+        self.built_at = time.time()
+
+    def resolve(self, problem_id: str) -> Dict[str, Any]:
+        """문제 하나 해석 (찾지 못하면 concept이 None)"""
+        unit = self.units.get(self.problem_units.get(problem_id))
+        if unit is not None and unit["concept"] is not None:
+            return {"problemId": problem_id, **unit, "source": "unit"}
+
+        # 문제 ID의 단원 코드로 대체 해석 (_extract_unit_from_problem_id 대체)
+        concept = self.concept_by_code.get(extract_unit_code(problem_id))
+        base = unit or {"unitId": None, "unitTitle": None, "grade": None, "conceptIds": []}
+        return {"problemId": problem_id, **base, "concept": concept,
+                "source": "problem_code" if concept else None}
+
+    def resolve_many(self, problem_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """답안 목록 전체를 한 번에 해석 (입력 순서 유지, 같은 문제는 한 번만 계산)"""
+        problem_ids = [str(problem_id) for problem_id in problem_ids]
+        resolved = {problem_id: self.resolve(problem_id) for problem_id in dict.fromkeys(problem_ids)}
+        return [resolved[problem_id] for problem_id in problem_ids]
+
+    def get_stats(self) -> Dict[str, Any]:
+        mapped_units = sum(1 for unit in self.units.values() if unit["concept"] is not None)
+        return {
+            "problems": len(self.problem_units),
+            "units": len(self.units),
+            "units_with_concept": mapped_units,
+            "concept_codes": len(self.concept_by_code),
+            "built_at": self.built_at,
+        }
+
+
+def collection_fingerprint(*collections) -> Tuple:
+    """컬렉션별 (문서 수, 최신 _id, 최신 syncedAt) — 추가/삭제/재적재와 _id를 유지한 내용 변경 감지용"""
+    fingerprint = []
+    for collection in collections:
+        latest = collection.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+        # 해시 비교 재적재(sync_by_hash)는 _id와 문서 수를 유지하고 바뀐 문서의 syncedAt만 갱신
+        synced = collection.find_one({SYNCED_FIELD: {"$exists": True}}, {"_id": 0, SYNCED_FIELD: 1},
+                                     sort=[(SYNCED_FIELD, -1)])
+        fingerprint.append((collection.estimated_document_count(), latest["_id"] if latest else None,
+                            synced[SYNCED_FIELD] if synced else None))
+    return tuple(fingerprint)
+
+
+class ProblemConceptIndexStore:
+    """MongoDB 컬렉션과 Neo4j 개념 이름으로 인덱스를 만들고, 원본이 바뀌면 다시 컴파일"""
+
+    def __init__(self, db=None, concept_names: Optional[Callable[[], Iterable[str]]] = None,
+                 refresh_interval: float = 60.0):
+        self.db = db
+        self.concept_names = concept_names
+        self.refresh_interval = refresh_interval
+        self._index: Optional[ProblemConceptIndex] = None
+        self._checked_at = 0.0
+        self._stale = True
+        self._lock = threading.Lock()
+
+    def _collections(self):
+        return self.db.problem, self.db.unit, self.db.concept
+
+    def build(self, concept_names: List[str], fingerprint: Any = None) -> ProblemConceptIndex:
+        """세 컬렉션을 한 번씩 읽어 인덱스 컴파일"""
+        problems, units, concepts = self._collections()
+        index = ProblemConceptIndex(
+            problems.find({}, PROBLEM_PROJECTION),
+            units.find({}, UNIT_PROJECTION),
+            concepts.find({}, CONCEPT_PROJECTION),
+            concept_names,
+            fingerprint,
+        )
+        stats = index.get_stats()
+        print(f"✅ 문제-개념 인덱스 컴파일: 문제 {stats['problems']}개, "
+              f"단원 {stats['units']}개 (개념 연결 {stats['units_with_concept']}개)")
+        return index
+
+    def get(self) -> ProblemConceptIndex:
+        """현재 인덱스 (refresh_interval마다 원본 컬렉션/개념 이름 변경 여부 확인)"""
+        index = self._index
+        if index is not None and not self._stale and time.monotonic() - self._checked_at < self.refresh_interval:
+            return index
+        with self._lock:
+            try:
+                concept_names = list(self.concept_names()) if self.concept_names else []
+                fingerprint = collection_fingerprint(*self._collections()) + (hash(tuple(concept_names)),)
+                if self._index is None or self._stale or fingerprint != self._index.fingerprint:
+                    self._index = self.build(concept_names, fingerprint)
+            except Exception as e:
+                if self._index is None:
+                    raise
+                print(f"⚠️ 문제-개념 인덱스 갱신 실패, 기존 인덱스 사용: {e}")
+            self._checked_at = time.monotonic()
+            self._stale = False
+            return self._index
+
+    def invalidate(self):
+        """다음 get() 호출 시 다시 컴파일 (문제/단원 적재 후 호출)"""
+        self._stale = True
+
+
+_store: Optional[ProblemConceptIndexStore] = None
+
+
+def get_problem_concept_index(db, concept_names: Callable[[], Iterable[str]]) -> ProblemConceptIndex:
+    """프로세스 공용 인덱스 반환 (concept_names는 Neo4j 개념 이름 목록을 돌려주는 함수)"""
+    global _store
+    if _store is None or _store.db is not db:
+        _store = ProblemConceptIndexStore(db, concept_names)
+    return _store.get()
+
+
+def invalidate_problem_concept_index():
+    """공용 인덱스 무효화"""
+    if _store is not None:
+        _store.invalidate()
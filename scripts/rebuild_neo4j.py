@@ -1,8 +1,12 @@
+import argparse
 import os
+import time
 from pathlib import Path
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
-import pandas as pd
+from concept_closure import build_closure_from_driver
+from neo4j_client import bump_graph_version, is_precedes_type
+from sync_neo4j import read_csv, read_graph_csv, sync_graph
 
 # AI/.env 파일 로드
 env_path = Path(__file__).resolve().parents[1] / ".env"
@@ -17,13 +21,16 @@ AURA_PASS = os.getenv("AURA_PASS")
 
 driver = GraphDatabase.driver(AURA_URI, auth=(AURA_USER, AURA_PASS))
 
+# UNWIND 한 번에 보낼 행 수 (--batch-size 또는 NEO4J_BATCH_SIZE 환경변수로 조정)
+BATCH_SIZE = int(os.getenv("NEO4J_BATCH_SIZE", "1000"))
+
 def clear_database():
     """기존 데이터베이스 내용 완전 삭제"""
     print("🗑️ 기존 데이터베이스 내용 삭제 중...")
     
     with driver.session() as session:
-        # 모든 노드와 관계 삭제
-        session.run("MATCH (n) DETACH DELETE n")
+        # 모든 노드와 관계 삭제 (그래프 버전 스탬프 :GraphMeta는 남겨 둠)
+        session.run("MATCH (n) WHERE NOT n:GraphMeta DETACH DELETE n")
         print("✅ 모든 노드와 관계 삭제 완료")
 
 def create_constraints():
@@ -37,9 +44,31 @@ def create_constraints():
             print("✅ concept 속성 고유 제약조건 생성 완료")
         except Exception as e:
             print(f"⚠️ 제약조건 생성 중 오류 (이미 존재할 수 있음): {e}")
+        
+        # 제약조건 인덱스가 ONLINE이 된 뒤 로드해야 관계 MATCH가 전체 스캔을 하지 않음
+        session.run("CALL db.awaitIndexes(300)").consume()
+
+def run_batches(session, query, rows, label):
+    """rows를 BATCH_SIZE 단위로 나눠 UNWIND $rows 쿼리를 명시적 쓰기 트랜잭션으로 실행"""
+    def write_chunk(tx, chunk):
+        return tx.run(query, rows=chunk).consume().counters
+
+    started = time.perf_counter()
+    nodes_created = relationships_created = 0
+    for offset in range(0, len(rows), BATCH_SIZE):
+        chunk = rows[offset:offset + BATCH_SIZE]
+        counters = session.execute_write(write_chunk, chunk)
+        nodes_created += counters.nodes_created
+        relationships_created += counters.relationships_created
+        print(f"   진행률: {offset + len(chunk)}/{len(rows)}")
+
+    elapsed = time.perf_counter() - started
+    rate = len(rows) / elapsed if elapsed > 0 else 0.0
+    print(f"⚡ {label}: {len(rows)}행, {elapsed:.2f}초 ({rate:,.0f}행/초, 배치 {BATCH_SIZE})")
+    return nodes_created, relationships_created
 
 def load_nodes():
-    """노드 데이터 로드"""
+    """노드 데이터 로드 (UNWIND 배치)"""
     print("📊 노드 데이터 로드 중...")
     
     # CSV 파일 경로
@@ -49,15 +78,7 @@ def load_nodes():
         print(f"❌ 노드 파일을 찾을 수 없음: {nodes_file}")
         return
     
-    # CSV 파일 읽기 (한글 인코딩 처리)
-    try:
-        df = pd.read_csv(nodes_file, encoding='utf-8')
-    except UnicodeDecodeError:
-        try:
-            df = pd.read_csv(nodes_file, encoding='cp949')
-        except UnicodeDecodeError:
-            df = pd.read_csv(nodes_file, encoding='euc-kr')
-    
+    df = read_csv(nodes_file)
     print(f"📁 노드 파일 읽기 완료: {len(df)}개 행")
     
     # 데이터 확인
@@ -65,36 +86,23 @@ def load_nodes():
     print(f"📊 처음 3행:")
     print(df.head(3))
     
+    rows = df[['concept', 'unit', 'grade']].to_dict('records')
+    query = """
+    UNWIND $rows AS row
+    CREATE (c:Concept {
+        concept: row.concept,
+        unit: row.unit,
+        grade: row.grade
+    })
+    """
+    
     with driver.session() as session:
-        # Concept 노드 생성
-        for index, row in df.iterrows():
-            concept_name = row['concept']
-            unit = row['unit']
-            grade = row['grade']
-            
-            # NaN 값 처리
-            if pd.isna(unit):
-                unit = None
-            if pd.isna(grade):
-                grade = None
-            
-            query = """
-            CREATE (c:Concept {
-                concept: $concept,
-                unit: $unit,
-                grade: $grade
-            })
-            """
-            
-            session.run(query, concept=concept_name, unit=unit, grade=grade)
-            
-            if (index + 1) % 50 == 0:
-                print(f"   진행률: {index + 1}/{len(df)}")
+        nodes_created, _ = run_batches(session, query, rows, "Concept 노드")
     
-    print(f"✅ {len(df)}개 Concept 노드 생성 완료")
+    print(f"✅ {nodes_created}개 Concept 노드 생성 완료")
 
 def load_edges():
-    """관계 데이터 로드"""
+    """관계 데이터 로드 (UNWIND 배치, concept 고유 제약조건 인덱스로 양 끝 노드 조회)"""
     print("🔗 관계 데이터 로드 중...")
     
     # CSV 파일 경로
@@ -104,15 +112,7 @@ def load_edges():
         print(f"❌ 관계 파일을 찾을 수 없음: {edges_file}")
         return
     
-    # CSV 파일 읽기 (한글 인코딩 처리)
-    try:
-        df = pd.read_csv(edges_file, encoding='utf-8')
-    except UnicodeDecodeError:
-        try:
-            df = pd.read_csv(edges_file, encoding='cp949')
-        except UnicodeDecodeError:
-            df = pd.read_csv(edges_file, encoding='euc-kr')
-    
+    df = read_csv(edges_file)
     print(f"📁 관계 파일 읽기 완료: {len(df)}개 행")
     
     # 데이터 확인
@@ -120,30 +120,22 @@ def load_edges():
     print(f"📊 처음 3행:")
     print(df.head(3))
     
+    # precedes 관계만 처리 (sync_neo4j와 같은 기준, 대소문자 무시)
+    rows = df.loc[df['type'].map(is_precedes_type), ['source', 'target']].to_dict('records')
+    query = """
+    UNWIND $rows AS row
+    MATCH (source:Concept {concept: row.source})
+    MATCH (target:Concept {concept: row.target})
+    CREATE (source)-[:PRECEDES]->(target)
+    """
+    
     with driver.session() as session:
-        # PRECEDES 관계 생성
-        for index, row in df.iterrows():
-            source_concept = row['source']
-            target_concept = row['target']
-            relationship_type = row['type']
-            
-            # precedes 관계만 처리
-            if relationship_type == 'precedes':
-                query = """
-                MATCH (source:Concept {concept: $source_concept})
-                MATCH (target:Concept {concept: $target_concept})
-                CREATE (source)-[:PRECEDES]->(target)
-                """
-                
-                try:
-                    session.run(query, source_concept=source_concept, target_concept=target_concept)
-                except Exception as e:
-                    print(f"⚠️ 관계 생성 실패: {source_concept} -> {target_concept} (오류: {e})")
-            
-            if (index + 1) % 100 == 0:
-                print(f"   진행률: {index + 1}/{len(df)}")
+        _, relationships_created = run_batches(session, query, rows, "PRECEDES 관계")
     
-    print(f"✅ 관계 데이터 로드 완료")
+    skipped = len(rows) - relationships_created
+    if skipped:
+        print(f"⚠️ 양 끝 개념을 찾지 못해 생성되지 않은 관계: {skipped}개")
+    print(f"✅ {relationships_created}개 관계 데이터 로드 완료")
 
 def verify_data():
     """데이터 검증"""
@@ -186,26 +178,46 @@ def verify_data():
             print(f"   {record['grade']}학년: {record['count']}개")
 
 def main():
+    global BATCH_SIZE
+    parser = argparse.ArgumentParser(description="Neo4j 그래프 데이터베이스 재구축")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="UNWIND 배치당 행 수")
+    parser.add_argument("--full", action="store_true",
+                        help="전체 삭제 후 재적재 (기본은 CSV와의 차이만 적용하는 증분 동기화)")
+    args = parser.parse_args()
+    BATCH_SIZE = max(1, args.batch_size)
+    
     print("🚀 Neo4j 그래프 데이터베이스 재구축 시작!")
     print("=" * 60)
+    started = time.perf_counter()
     
     try:
-        # 1. 기존 데이터 삭제
-        clear_database()
-        
-        # 2. 제약조건 생성
+        # 1. 제약조건 생성 (관계 로드의 MATCH가 인덱스를 타도록 노드/관계 로드 전에 생성)
         create_constraints()
         
-        # 3. 노드 로드
-        load_nodes()
-        
-        # 4. 관계 로드
-        load_edges()
+        if args.full:
+            # 2. 기존 데이터 삭제 (적재가 끝날 때까지 그래프가 비어 있음)
+            clear_database()
+            
+            # 3. 노드 로드
+            load_nodes()
+            
+            # 4. 관계 로드
+            load_edges()
+            
+            with driver.session() as session:
+                bump_graph_version(session)
+        else:
+            # 2~4. 현재 그래프와의 차이만 MERGE로 적용 (동기화 중에도 그래프 조회 가능)
+            node_rows, edge_pairs = read_graph_csv()
+            sync_graph(driver, node_rows, edge_pairs, BATCH_SIZE)
         
         # 5. 데이터 검증
         verify_data()
         
-        print("\n🎉 Neo4j 그래프 데이터베이스 재구축 완료!")
+        # 6. 전이 폐쇄 인덱스 생성 (학습 경로 선행 개념 조회용)
+        build_closure_from_driver(driver)
+        
+        print(f"\n🎉 Neo4j 그래프 데이터베이스 재구축 완료! ({time.perf_counter() - started:.1f}초)")
         
     except Exception as e:
         print(f"❌ 오류 발생: {e}")
@@ -0,0 +1,78 @@
+"""
+추천 학습 경로 메모이제이션
+같은 단원/개념을 틀린 학생이 많으므로, 추천 경로를
+(정렬된 취약 개념 집합, 정답률 구간, 그래프 버전) 시그니처로 LRU 캐시에 보관하고
+같은 실패 패턴이 다시 나오면 그래프 탐색 없이 recommendedPath를 돌려줍니다.
+그래프 버전이 시그니처에 들어가므로 그래프가 바뀌면 이전 항목은 자연히 적중하지 않고 밀려납니다.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+PATH_CACHE_MAX_ITEMS = int(os.getenv("PATH_CACHE_MAX_ITEMS", "5000"))
+# 정답률(%) 구간 폭 (예: 10이면 65.0% → 60)
+ACCURACY_BAND_WIDTH = 10
+
+
+def accuracy_band(accuracy_rate: Optional[float], width: int = ACCURACY_BAND_WIDTH) -> Optional[int]:
+    """정답률(0~100)을 width 단위 구간의 하한으로 변환 (100%는 마지막 구간에 포함)"""
+    if accuracy_rate is None:
+        return None
+    clamped = min(max(float(accuracy_rate), 0.0), 100.0)
+    return int(min(clamped // width * width, 100 - width))
+
+
+def path_signature(weak: Iterable[str], accuracy_rate: Optional[float] = None,
+                   graph_version: Any = None) -> Tuple:
+    """캐시 키: (정렬된 취약 단원/개념, 정답률 구간, 그래프 버전)"""
+    return tuple(sorted(set(weak))), accuracy_band(accuracy_rate), graph_version
+
+
+class RecommendedPathCache:
+    """시그니처 → 추천 경로 LRU 캐시"""
+
+    def __init__(self, max_items: int = PATH_CACHE_MAX_ITEMS):
+        self.max_items = max_items
+        self._items: "OrderedDict[Hashable, List[Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get_or_compute(self, signature: Hashable,
+                       compute: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """캐시된 경로 반환, 없으면 compute()로 만들어 저장 (호출자가 수정해도 되도록 노드는 복사본)"""
+        with self._lock:
+            path = self._items.get(signature)
+            if path is not None:
+                self._items.move_to_end(signature)
+                self.stats["hits"] += 1
+                return [dict(node) for node in path]
+            self.stats["misses"] += 1
+
+        # 계산은 잠금 밖에서 (동시에 같은 시그니처를 계산해도 결과는 같음)
+        path = [dict(node) for node in compute()]
+        with self._lock:
+            self._items[signature] = path
+            self._items.move_to_end(signature)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+                self.stats["evictions"] += 1
+        return [dict(node) for node in path]
+
+    def invalidate(self):
+        with self._lock:
+            self._items.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "items": len(self._items),
+            "max_items": self.max_items,
+            "hit_rate": round(self.stats["hits"] / total, 4) if total else 0.0,
+        }
+
+
+# 프로세스 공용 추천 경로 캐시
+recommended_path_cache = RecommendedPathCache()
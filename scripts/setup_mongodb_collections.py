@@ -9,13 +9,15 @@ import os
 import sys
 from pathlib import Path
 from dotenv import load_dotenv
-from pymongo import MongoClient, ASCENDING, DESCENDING, TEXT
-from pymongo.errors import CollectionInvalid, OperationFailure
+from pymongo import MongoClient
+from pymongo.errors import CollectionInvalid
 
 # AI 디렉토리를 Python 경로에 추가
 AI_DIR = Path(__file__).parent
 sys.path.insert(0, str(AI_DIR))
 
+from index_manifest import LEGACY_INDEXES, sync_manifest
+
 # .env 파일 로드
 load_dotenv(AI_DIR / ".env")
 
@@ -425,151 +427,9 @@ class MongoDBSetup:
     
     def create_indexes(self):
         """필요한 인덱스들을 생성"""
-        indexes_config = {
-            "users": [
-                [("email", ASCENDING)],
-                [("phoneNumber", ASCENDING)],
-                [("createdAt", DESCENDING)]
-            ],
-            
-            "guardian_info": [
-                [("userId", ASCENDING)]
-            ],
-            
-            "user_auth": [
-                [("userId", ASCENDING)],
-                [("refreshToken", ASCENDING)]
-            ],
-            
-            "email_verification": [
-                [("email", ASCENDING)],
-                [("verificationCode", ASCENDING)],
-                [("expiresAt", ASCENDING)]
-            ],
-            
-            "password_reset": [
-                [("email", ASCENDING)],
-                [("resetToken", ASCENDING)],
-                [("expiresAt", ASCENDING)]
-            ],
-            
-            "diagnostic_tests": [
-                [("testId", ASCENDING)],
-                [("userId", ASCENDING)],
-                [("grade", ASCENDING)],
-                [("createdAt", DESCENDING)]
-            ],
-            
-            "answer_attempts": [
-                [("attemptId", ASCENDING)],
-                [("userId", ASCENDING)],
-                [("problemId", ASCENDING)],
-                [("attemptTime", DESCENDING)]
-            ],
-            
-            "diagnostic_analysis": [
-                [("analysisId", ASCENDING)],
-                [("userId", ASCENDING)],
-                [("testId", ASCENDING)],
-                [("createdAt", DESCENDING)]
-            ],
-            
-            "units": [
-                [("unitId", ASCENDING)],
-                [("unitCode", ASCENDING)],
-                [("grade", ASCENDING)],
-                [("subject", ASCENDING)]
-            ],
-            
-            "concepts": [
-                [("conceptId", ASCENDING)],
-                [("unitId", ASCENDING)],
-                [("difficulty", ASCENDING)]
-            ],
-            
-            "learning_time_logs": [
-                [("logId", ASCENDING)],
-                [("userId", ASCENDING)],
-                [("conceptId", ASCENDING)],
-                [("startTime", DESCENDING)]
-            ],
-            
-            "problems": [
-                [("problemId", ASCENDING)],
-                [("conceptId", ASCENDING)],
-                [("unitId", ASCENDING)],
-                [("difficulty", ASCENDING)],
-                [("problemText", TEXT)]
-            ],
-            
-            "problem_sets": [
-                [("setId", ASCENDING)],
-                [("difficulty", ASCENDING)]
-            ],
-            
-            "vocabulary": [
-                [("vocaId", ASCENDING)],
-                [("term", TEXT)],
-                [("conceptId", ASCENDING)]
-            ],
-            
-            "progress": [
-                [("progressId", ASCENDING)],
-                [("userId", ASCENDING)],
-                [("conceptId", ASCENDING)],
-                [("completionRate", DESCENDING)]
-            ],
-            
-            "activity_logs": [
-                [("logId", ASCENDING)],
-                [("userId", ASCENDING)],
-                [("activityType", ASCENDING)],
-                [("timestamp", DESCENDING)]
-            ],
-            
-            "gamification_state": [
-                [("gamifiId", ASCENDING)],
-                [("userId", ASCENDING)],
-                [("level", DESCENDING)]
-            ],
-            
-            "xp_transactions": [
-                [("transactionId", ASCENDING)],
-                [("userId", ASCENDING)],
-                [("timestamp", DESCENDING)]
-            ],
-            
-            "bookmarks": [
-                [("bookmarkId", ASCENDING)],
-                [("userId", ASCENDING)],
-                [("itemId", ASCENDING)],
-                [("createdAt", DESCENDING)]
-            ]
-        }
-        
+        # 인덱스 정의는 index_manifest.py에서 관리 (복합 인덱스 기준, index_advisor.py로 실제 쿼리와 비교)
         print("🔍 인덱스 생성 시작...")
-        
-        for collection_name, indexes in indexes_config.items():
-            try:
-                collection = self.db[collection_name]
-                
-                for index_spec in indexes:
-                    try:
-                        # 인덱스 이름 생성
-                        index_name = f"{'_'.join([str(field[0]) for field in index_spec])}_idx"
-                        
-                        # 인덱스 생성
-                        collection.create_index(index_spec, name=index_name)
-                        print(f"✅ 인덱스 '{index_name}' 생성 완료 ({collection_name})")
-                        
-                    except OperationFailure as e:
-                        if "already exists" in str(e):
-                            print(f"⚠️ 인덱스 '{index_name}' 이미 존재함 ({collection_name})")
-                        else:
-                            print(f"❌ 인덱스 '{index_name}' 생성 실패 ({collection_name}): {e}")
-                            
-            except Exception as e:
-                print(f"❌ 컬렉션 '{collection_name}' 인덱스 생성 실패: {e}")
+        sync_manifest(self.db, LEGACY_INDEXES)
         
         print("🎉 모든 인덱스 생성 완료!")
     
@@ -9,13 +9,15 @@ import os
 import sys
 from pathlib import Path
 from dotenv import load_dotenv
-from pymongo import MongoClient, ASCENDING, DESCENDING, TEXT
-from pymongo.errors import CollectionInvalid, OperationFailure
+from pymongo import MongoClient
+from pymongo.errors import CollectionInvalid
 
 # AI 디렉토리를 Python 경로에 추가
 AI_DIR = Path(__file__).parent
 sys.path.insert(0, str(AI_DIR))
 
+from index_manifest import NERDMATH_INDEXES, sync_manifest
+
 # .env 파일 로드
 load_dotenv(AI_DIR / ".env")
 
@@ -364,142 +366,9 @@ class NerdMathMongoDBSetup:
     
     def create_indexes(self):
         """테이블 정의서 기반 인덱스들을 생성"""
-        indexes_config = {
-            "diagnostic_test": [
-                [("testid", ASCENDING)],
-                [("userld", ASCENDING)],
-                [("startedAt", DESCENDING)],
-                [("completed", ASCENDING)]
-            ],
-            
-            "answer_attempt": [
-                [("answerld", ASCENDING)],
-                [("userld", ASCENDING)],
-                [("problemld", ASCENDING)],
-                [("unitid", ASCENDING)],
-                [("scoredAt", DESCENDING)],
-                [("mode", ASCENDING)]
-            ],
-            
-            "diagnostic_analysis": [
-                [("analysisId", ASCENDING)],
-                [("testid", ASCENDING)],
-                [("userld", ASCENDING)],
-                [("generatedAt", DESCENDING)],
-                [("analysisType", ASCENDING)]
-            ],
-            
-            "unit": [
-                [("unitId", ASCENDING)],
-                [("subject", ASCENDING)],
-                [("grade", ASCENDING)],
-                [("chapter", ASCENDING)],
-                [("orderInGrade", ASCENDING)],
-                [("status", ASCENDING)]
-            ],
-            
-            "problem": [
-                [("problemld", ASCENDING)],
-                [("unitId", ASCENDING)],
-                [("grade", ASCENDING)],
-                [("chapter", ASCENDING)],
-                [("cognitiveType", ASCENDING)],
-                [("level", ASCENDING)],
-                [("diagnosticTest", ASCENDING)],
-                [("type", ASCENDING)],
-                [("tags", ASCENDING)],
-                [("content.text", TEXT)]
-            ],
-            
-            "problem_set": [
-                [("setId", ASCENDING)],
-                [("userld", ASCENDING)],
-                [("unitld", ASCENDING)],
-                [("mode", ASCENDING)],
-                [("createdAt", DESCENDING)]
-            ],
-            
-            "concept": [
-                [("conceptId", ASCENDING)],
-                [("unitId", ASCENDING)]
-            ],
-            
-            "vocabulary": [
-                [("vocald", ASCENDING)],
-                [("type", ASCENDING)],
-                [("category", ASCENDING)],
-                [("unitId", ASCENDING)],
-                [("word", TEXT)]
-            ],
-            
-            "progress": [
-                [("progressId", ASCENDING)],
-                [("userld", ASCENDING)],
-                [("unitId", ASCENDING)],
-                [("updatedAt", DESCENDING)]
-            ],
-            
-            "activity_log": [
-                [("logld", ASCENDING)],
-                [("userld", ASCENDING)],
-                [("date", ASCENDING)],
-                [("todaySolved", DESCENDING)]
-            ],
-            
-            "gamification_state": [
-                [("gamifild", ASCENDING)],
-                [("userld", ASCENDING)],
-                [("level", DESCENDING)],
-                [("totalXp", DESCENDING)]
-            ],
-            
-            "xp_transactions": [
-                [("transactionld", ASCENDING)],
-                [("userld", ASCENDING)],
-                [("reason", ASCENDING)],
-                [("at", DESCENDING)]
-            ],
-            
-            "learning_time_log": [
-                [("learningTimeld", ASCENDING)],
-                [("userld", ASCENDING)],
-                [("activityType", ASCENDING)],
-                [("contentid", ASCENDING)],
-                [("startedAt", DESCENDING)]
-            ],
-            
-            "bookmark": [
-                [("bookmarkid", ASCENDING)],
-                [("userld", ASCENDING)],
-                [("problemld", ASCENDING)],
-                [("unitld", ASCENDING)],
-                [("bookmarkedAt", DESCENDING)]
-            ]
-        }
-        
+        # 인덱스 정의는 index_manifest.py에서 관리 (복합 인덱스 기준, index_advisor.py로 실제 쿼리와 비교)
         print("🔍 nerdmath 인덱스 생성 시작...")
-        
-        for collection_name, indexes in indexes_config.items():
-            try:
-                collection = self.db[collection_name]
-                
-                for index_spec in indexes:
-                    try:
-                        # 인덱스 이름 생성
-                        index_name = f"{'_'.join([str(field[0]) for field in index_spec])}_idx"
-                        
-                        # 인덱스 생성
-                        collection.create_index(index_spec, name=index_name)
-                        print(f"✅ 인덱스 '{index_name}' 생성 완료 ({collection_name})")
-                        
-                    except OperationFailure as e:
-                        if "already exists" in str(e):
-                            print(f"⚠️ 인덱스 '{index_name}' 이미 존재함 ({collection_name})")
-                        else:
-                            print(f"❌ 인덱스 '{index_name}' 생성 실패 ({collection_name}): {e}")
-                            
-            except Exception as e:
-                print(f"❌ 컬렉션 '{collection_name}' 인덱스 생성 실패: {e}")
+        sync_manifest(self.db, NERDMATH_INDEXES)
         
         print("🎉 모든 nerdmath 인덱스 생성 완료!")
     
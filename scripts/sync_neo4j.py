@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Neo4j 개념 그래프 증분 동기화
+neo4j_nodes.csv / neo4j_edges.csv 와 현재 그래프를 비교하여 필요한 추가/삭제/속성 변경만
+MERGE 기반 배치 트랜잭션으로 적용합니다. 전체 삭제 후 재적재와 달리 동기화 중에도
+그래프가 비지 않으므로 운영 중인 학습 경로 조회가 계속 동작합니다.
+
+사용 예:
+    python sync_neo4j.py --dry-run        # 변경 사항만 출력
+    python sync_neo4j.py --batch-size 500
+"""
+
+import argparse
+import os
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+from concept_graph import EDGES_QUERY, NODES_QUERY
+from neo4j_client import bump_graph_version, is_precedes_type
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+NODE_PROPERTIES = ("unit", "grade")
+DEFAULT_BATCH_SIZE = int(os.getenv("NEO4J_BATCH_SIZE", "1000"))
+
+UPSERT_NODES_QUERY = """
+    UNWIND $rows AS row
+    MERGE (c:Concept {concept: row.concept})
+    SET c.unit = row.unit, c.grade = row.grade
+"""
+
+MERGE_EDGES_QUERY = """
+    UNWIND $rows AS row
+    MATCH (source:Concept {concept: row.source})
+    MATCH (target:Concept {concept: row.target})
+    MERGE (source)-[:PRECEDES]->(target)
+"""
+
+DELETE_EDGES_QUERY = """
+    UNWIND $rows AS row
+    MATCH (:Concept {concept: row.source})-[r:PRECEDES]->(:Concept {concept: row.target})
+    DELETE r
+"""
+
+DEDUPE_EDGES_QUERY = """
+    UNWIND $rows AS row
+    MATCH (:Concept {concept: row.source})-[r:PRECEDES]->(:Concept {concept: row.target})
+    WITH row, collect(r) AS rels
+    FOREACH (r IN tail(rels) | DELETE r)
+"""
+
+DELETE_NODES_QUERY = """
+    UNWIND $rows AS row
+    MATCH (c:Concept {concept: row.concept})
+    DETACH DELETE c
+"""
+
+
+def normalize_value(value: Any) -> Any:
+    """CSV(pandas)와 Neo4j 값 비교용 정규화 (NaN → None, 1.0 → 1)"""
+    if isinstance(value, float):
+        if value != value:
+            return None
+        if value.is_integer():
+            return int(value)
+    return value
+
+
+def normalize_nodes(rows: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """concept → {unit, grade} (빈 concept 제외, 중복은 마지막 행 우선)"""
+    nodes = {}
+    for row in rows:
+        name = normalize_value(row.get("concept"))
+        if not name:
+            continue
+        nodes[name] = {key: normalize_value(row.get(key)) for key in NODE_PROPERTIES}
+    return nodes
+
+
+class GraphDiff:
+    """원하는 그래프(CSV)와 현재 그래프의 차이"""
+
+    def __init__(self, desired_nodes: Iterable[Dict[str, Any]], desired_edges: Iterable[Tuple[str, str]],
+                 live_nodes: Iterable[Dict[str, Any]], live_edges: Iterable[Tuple[str, str]]):
+        desired = normalize_nodes(desired_nodes)
+        live = normalize_nodes(live_nodes)
+        self.nodes_added = sorted(name for name in desired if name not in live)
+        self.nodes_removed = sorted(name for name in live if name not in desired)
+        self.nodes_updated = sorted(
+            name for name in desired if name in live and desired[name] != live[name]
+        )
+        self.node_rows = [
+            {"concept": name, **desired[name]} for name in self.nodes_added + self.nodes_updated
+        ]
+
+        # 양 끝 개념이 CSV에 없는 관계는 만들 수 없으므로 제외
+        wanted = {(src, dst) for src, dst in desired_edges if src in desired and dst in desired}
+        live_counts = Counter(live_edges)
+        self.edges_added = sorted(wanted - set(live_counts))
+        # 삭제될 노드의 관계는 DETACH DELETE로 함께 지워짐
+        removed = set(self.nodes_removed)
+        self.edges_removed = sorted(
+            pair for pair in live_counts
+            if pair not in wanted and pair[0] not in removed and pair[1] not in removed
+        )
+        # 이전 CREATE 재실행으로 생긴 중복 관계
+        self.edges_duplicated = sorted(
+            pair for pair, count in live_counts.items() if count > 1 and pair in wanted
+        )
+
+    def is_empty(self) -> bool:
+        return not (self.node_rows or self.nodes_removed or self.edges_added
+                    or self.edges_removed or self.edges_duplicated)
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "nodes_added": len(self.nodes_added),
+            "nodes_updated": len(self.nodes_updated),
+            "nodes_removed": len(self.nodes_removed),
+            "edges_added": len(self.edges_added),
+            "edges_removed": len(self.edges_removed),
+            "edges_deduplicated": len(self.edges_duplicated),
+        }
+
+
+def read_live_graph(session) -> Tuple[List[Dict[str, Any]], List[Tuple[str, str]]]:
+    """현재 그래프의 Concept 노드와 PRECEDES 관계 (중복 관계 포함)"""
+    nodes = [record.data() for record in session.run(NODES_QUERY)]
+    edges = [(record["source"], record["target"]) for record in session.run(EDGES_QUERY)]
+    return nodes, edges
+
+
+def _edge_rows(pairs: List[Tuple[str, str]]) -> List[Dict[str, str]]:
+    return [{"source": src, "target": dst} for src, dst in pairs]
+
+
+def _write_batches(session, query: str, rows: List[Dict[str, Any]], batch_size: int, label: str):
+    """rows를 batch_size 단위 UNWIND 쓰기 트랜잭션으로 적용 (트랜잭션이 짧아 읽기를 막지 않음)"""
+    if not rows:
+        return
+    started = time.perf_counter()
+    for offset in range(0, len(rows), batch_size):
+        chunk = rows[offset:offset + batch_size]
+        session.execute_write(lambda tx: tx.run(query, rows=chunk).consume())
+    elapsed = time.perf_counter() - started
+    print(f"   {label}: {len(rows)}개 ({elapsed:.2f}초)")
+
+
+def apply_diff(session, diff: GraphDiff, batch_size: int = DEFAULT_BATCH_SIZE):
+    """추가 → 관계 추가 → 관계 삭제 → 노드 삭제 순으로 적용 (중간 상태에서도 기존 경로가 끊기지 않음)"""
+    _write_batches(session, UPSERT_NODES_QUERY, diff.node_rows, batch_size, "노드 추가/수정")
+    _write_batches(session, MERGE_EDGES_QUERY, _edge_rows(diff.edges_added), batch_size, "관계 추가")
+    _write_batches(session, DEDUPE_EDGES_QUERY, _edge_rows(diff.edges_duplicated), batch_size, "중복 관계 정리")
+    _write_batches(session, DELETE_EDGES_QUERY, _edge_rows(diff.edges_removed), batch_size, "관계 삭제")
+    _write_batches(session, DELETE_NODES_QUERY, [{"concept": name} for name in diff.nodes_removed],
+                   batch_size, "노드 삭제")
+
+
+def sync_graph(driver, node_rows: List[Dict[str, Any]], edge_pairs: List[Tuple[str, str]],
+               batch_size: int = DEFAULT_BATCH_SIZE, dry_run: bool = False) -> GraphDiff:
+    """CSV 행과 현재 그래프를 비교하여 최소 변경만 적용"""
+    print("🔄 현재 그래프와 CSV 비교 중...")
+    with driver.session() as session:
+        live_nodes, live_edges = read_live_graph(session)
+        diff = GraphDiff(node_rows, edge_pairs, live_nodes, live_edges)
+        print(f"📊 변경 사항: {diff.summary()}")
+
+        if diff.is_empty():
+            print("✅ 그래프가 이미 최신 상태입니다")
+        elif dry_run:
+            print("🔍 dry-run: 변경 사항을 적용하지 않습니다")
+        else:
+            apply_diff(session, diff, batch_size)
+            # 서버들의 run_cypher 캐시가 다음 버전 확인 때 비워지도록 스탬프 증가
+            version = bump_graph_version(session)
+            print(f"✅ 증분 동기화 완료 (그래프 버전 {version})")
+    return diff
+
+
+def read_csv(path):
+    """CSV 파일 읽기 (한글 인코딩 처리, NaN은 None으로 변환, rebuild_neo4j와 공용)"""
+    import pandas as pd
+
+    try:
+        df = pd.read_csv(path, encoding='utf-8')
+    except UnicodeDecodeError:
+        try:
+            df = pd.read_csv(path, encoding='cp949')
+        except UnicodeDecodeError:
+            df = pd.read_csv(path, encoding='euc-kr')
+    return df.astype(object).where(pd.notna(df), None)
+
+
+def read_graph_csv(nodes_file: Path = DATA_DIR / "neo4j_nodes.csv",
+                   edges_file: Path = DATA_DIR / "neo4j_edges.csv") -> Tuple[List[Dict[str, Any]], List[Tuple[str, str]]]:
+    """neo4j_nodes.csv / neo4j_edges.csv 읽기 (PRECEDES 관계만, 대소문자 무시)"""
+    nodes_df = read_csv(nodes_file)
+    edges_df = read_csv(edges_file)
+    edges_df = edges_df[edges_df['type'].map(is_precedes_type)]
+    node_rows = nodes_df[['concept', *NODE_PROPERTIES]].to_dict('records')
+    edge_pairs = list(zip(edges_df['source'], edges_df['target']))
+    print(f"📁 CSV 읽기 완료: 노드 {len(node_rows)}개, 관계 {len(edge_pairs)}개")
+    return node_rows, edge_pairs
+
+
+def main():
+    from dotenv import load_dotenv
+    from neo4j import GraphDatabase
+
+    parser = argparse.ArgumentParser(description="Neo4j 개념 그래프 증분 동기화")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="UNWIND 배치당 행 수")
+    parser.add_argument("--dry-run", action="store_true", help="변경 사항만 출력하고 적용하지 않음")
+    parser.add_argument("--skip-closure", action="store_true", help="전이 폐쇄 인덱스를 다시 만들지 않음")
+    args = parser.parse_args()
+
+    # AI/.env 파일 로드
+    env_path = Path(__file__).resolve().parents[1] / ".env"
+    if env_path.exists():
+        load_dotenv(env_path)
+
+    driver = GraphDatabase.driver(os.getenv("AURA_URI"), auth=(os.getenv("AURA_USER"), os.getenv("AURA_PASS")))
+    try:
+        node_rows, edge_pairs = read_graph_csv()
+        diff = sync_graph(driver, node_rows, edge_pairs, max(1, args.batch_size), args.dry_run)
+        if not diff.is_empty() and not args.dry_run and not args.skip_closure:
+            from concept_closure import build_closure_from_driver
+            build_closure_from_driver(driver)
+    finally:
+        driver.close()
+        print("🔌 Neo4j 연결 종료")
+
+
+if __name__ == "__main__":
+    main()
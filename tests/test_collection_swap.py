@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""블루/그린 컬렉션 재적재 테스트 (MongoDB 없이 임시 컬렉션 → rename 교체 확인)"""
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from collection_swap import staging_name, swap_load, swap_load_seed
+
+class InsertResult:
+    def __init__(self, ids):
+        self.inserted_ids = ids
+
+class FakeCollection:
+    def __init__(self, db, name):
+        self.db = db
+        self.name = name
+        self.docs = []
+        self.indexes = []
+        self.index_options = []
+        self.collection_options = {}
+
+    def insert_many(self, docs, ordered=True):
+        self.db.events.append(("insert", self.name, len(docs), bool(self.indexes)))
+        self.db.collections[self.name] = self
+        self.docs.extend(docs)
+        return InsertResult(list(range(len(docs))))
+
+    def create_index(self, keys, unique=False, **options):
+        if unique and len({doc.get(keys) for doc in self.docs}) != len(self.docs):
+            raise ValueError(f"duplicate key: {keys}")
+        self.indexes.append(keys)
+        self.index_options.append(options)
+
+    def list_indexes(self):
+        infos = [{"v": 2, "key": {"_id": 1}, "name": "_id_"}]
+        for keys, options in zip(self.indexes, self.index_options):
+            items = [(keys, 1)] if isinstance(keys, str) else list(keys)
+            infos.append({"v": 2, "key": dict(items), "name": options.get("name", "_".join(f"{k}_{d}" for k, d in items))})
+        return infos
+
+    def options(self):
+        return dict(self.collection_options)
+
+    def rename(self, new_name, dropTarget=False):
+        assert dropTarget
+        self.db.events.append(("rename", self.name, new_name))
+        self.db.collections.pop(self.name, None)
+        self.db.collections[new_name] = self
+        self.name = new_name
+
+    def drop(self):
+        self.db.collections.pop(self.name, None)
+        self.docs, self.indexes, self.index_options, self.collection_options = [], [], [], {}
+
+class FakeDB:
+    def __init__(self):
+        self.collections = {}
+        self.events = []
+
+    def __getitem__(self, name):
+        if name not in self.collections:
+            self.collections[name] = FakeCollection(self, name)
+        return self.collections[name]
+
+    def list_collection_names(self):
+        return list(self.collections)
+
+    def create_collection(self, name, **options):
+        collection = self[name]
+        collection.collection_options = options
+        return collection
+
+def test_swap_replaces_collection():
+    print("=== 임시 컬렉션 적재 후 교체 테스트 ===")
+
+    db = FakeDB()
+    old = db["concepts"]
+    old.docs = [{"conceptId": "old"}]
+
+    count = swap_load_seed(db, "concepts", ({"conceptId": f"c{i}"} for i in range(2500)), batch_size=1000)
+
+    assert count == 2500
+    assert db["concepts"] is not old and len(db["concepts"].docs) == 2500
+    assert db["concepts"].indexes == ["conceptId", "unitId", "unitCode"]
+    assert staging_name("concepts") not in db.collections
+    inserts = [event for event in db.events if event[0] == "insert"]
+    assert [event[2] for event in inserts] == [1000, 1000, 500]
+    assert not any(event[3] for event in inserts)
+    assert db.events[-1] == ("rename", staging_name("concepts"), "concepts")
+    print("✅ 인덱스 없이 배치 적재 → 인덱스 생성 → rename 교체")
+
+def test_failed_load_keeps_old_collection():
+    print("=== 실패 시 기존 컬렉션 유지 테스트 ===")
+
+    db = FakeDB()
+    old = db["unit_tests"]
+    old.docs = [{"code": "1.1"}]
+
+    for documents in ([{"code": "1.1"}, {"code": "1.1"}], []):
+        try:
+            swap_load(db, "unit_tests", documents, [("code", {"unique": True})])
+            assert False, "예외가 발생해야 합니다"
+        except ValueError as e:
+            print(f"⚠️ 예상된 실패: {e}")
+        assert db["unit_tests"] is old
+        assert staging_name("unit_tests") not in db.collections
+    print("✅ unique 위반/빈 데이터에서도 기존 컬렉션 유지, 임시 컬렉션 정리")
+
+def test_swap_keeps_options_and_indexes():
+    print("=== 기존 컬렉션 옵션/인덱스 유지 테스트 ===")
+
+    db = FakeDB()
+    validator = {"$jsonSchema": {"bsonType": "object", "required": ["conceptId"]}}
+    old = db.create_collection("concepts", validator=validator)
+    old.docs = [{"conceptId": "old"}]
+    old.create_index("conceptId", unique=True)
+    old.create_index([("difficulty", 1), ("unitId", 1)], name="difficulty_unitId_idx")
+
+    swap_load_seed(db, "concepts", [{"conceptId": "c1"}, {"conceptId": "c2"}])
+
+    new = db["concepts"]
+    assert new is not old and new.collection_options == {"validator": validator}
+    assert new.indexes == ["conceptId", "unitId", "unitCode", [("difficulty", 1), ("unitId", 1)]]
+    assert new.index_options[-1] == {"name": "difficulty_unitId_idx"}
+    print("✅ validator와 기존 인덱스가 교체 후에도 유지")
+
+if __name__ == "__main__":
+    test_swap_replaces_collection()
+    test_failed_load_keeps_old_collection()
+    test_swap_keeps_options_and_indexes()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""개념 그래프 전이 폐쇄 인덱스(메모리 매핑 파일) 테스트"""
+
+import os
+import sys
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from concept_closure import ConceptClosure, build_closure_file
+from concept_graph import ConceptGraphSnapshot, ConceptGraphStore
+from test_concept_graph import EDGES, NODES, FakeRunCypher
+
+def build_closure(directory):
+    graph = ConceptGraphSnapshot.from_run_cypher(FakeRunCypher(NODES, EDGES))
+    path = build_closure_file(graph, os.path.join(directory, "closure.bin"), layers=2)
+    return graph, ConceptClosure(path)
+
+def test_closure_matches_snapshot():
+    print("=== 전이 폐쇄 인덱스 / 스냅샷 일치 테스트 ===")
+
+    with tempfile.TemporaryDirectory() as directory:
+        graph, closure = build_closure(directory)
+        try:
+            assert closure.names == graph.names
+            assert closure.content_hash == graph.content_hash
+            for name in graph.names:
+                # 저장된 층 이내 / 층보다 깊은 조회 / 전체 조회 모두 BFS 결과와 같아야 함
+                for max_hops in (1, 2, 3, None):
+                    assert closure.ancestors(name, max_hops) == graph.ancestors(name, max_hops)
+                    union = set(closure.mask_to_names(closure.ancestor_mask([name], max_hops)))
+                    assert union == set(graph.ancestors(name, max_hops))
+                assert set(closure.descendants(name)) == set(graph.descendants(name, None))
+            print(f"✅ 개념 {closure.n}개 모두 스냅샷 BFS 결과와 일치")
+        finally:
+            closure.close()
+
+def test_union_ancestors():
+    print("=== 틀린 개념들의 선행 개념 합집합 테스트 ===")
+
+    with tempfile.TemporaryDirectory() as directory:
+        _, closure = build_closure(directory)
+        try:
+            wrong = ["1.6 정수와 유리수의 곱셈, 나눗셈", "1.4 절댓값"]
+            union = closure.union_ancestors(wrong)
+            print(f"📊 합집합: {union}")
+            assert set(union) == {"1.1 소인수분해", "1.3 정수와 유리수", "1.5 정수와 유리수의 덧셈, 뺄셈"}
+            assert "1.4 절댓값" in closure.union_ancestors(wrong, exclude_inputs=False)
+            assert set(closure.union_ancestors(wrong, max_hops=1)) == {"1.3 정수와 유리수", "1.5 정수와 유리수의 덧셈, 뺄셈"}
+            assert closure.is_ancestor("1.1 소인수분해", "1.6 정수와 유리수의 곱셈, 나눗셈")
+            assert not closure.is_ancestor("1.6 정수와 유리수의 곱셈, 나눗셈", "1.1 소인수분해")
+            assert closure.union_ancestors(["없는 개념"]) == []
+            print("✅ 합집합 / 도달 가능성 조회 정상")
+        finally:
+            closure.close()
+
+def test_store_uses_matching_closure():
+    print("=== 스냅샷의 전이 폐쇄 인덱스 사용 테스트 ===")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "closure.bin")
+        fake = FakeRunCypher(NODES, EDGES)
+        build_closure_file(ConceptGraphSnapshot.from_run_cypher(fake), path, layers=2)
+
+        store = ConceptGraphStore(fake, refresh_interval=3600, closure_path=path)
+        graph = store.get()
+        assert graph.closure is not None
+        bfs = ConceptGraphSnapshot.from_run_cypher(fake)
+        assert graph.relations(graph.names, 3) == bfs.relations(bfs.names, 3)
+
+        # 그래프가 바뀌면 이전 그래프로 만든 파일은 쓰지 않음
+        fake.edges = EDGES[:-1]
+        store.invalidate()
+        assert store.get().closure is None
+        graph.closure.close()
+        print("✅ 내용 해시가 같은 파일만 연결, 조회 결과는 BFS와 동일")
+
+if __name__ == "__main__":
+    test_closure_matches_snapshot()
+    test_union_ancestors()
+    test_store_uses_matching_closure()
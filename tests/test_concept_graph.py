@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""개념 그래프 메모리 스냅샷(CSR) 조회 테스트"""
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from concept_graph import ConceptGraphSnapshot, ConceptGraphStore
+
+NODES = [
+    {"concept": "1.1 소인수분해", "unit": "1단원", "grade": 1},
+    {"concept": "1.3 정수와 유리수", "unit": "1단원", "grade": 1},
+    {"concept": "1.4 절댓값", "unit": "1단원", "grade": 1},
+    {"concept": "1.5 정수와 유리수의 덧셈, 뺄셈", "unit": "1단원", "grade": 1},
+    {"concept": "1.6 정수와 유리수의 곱셈, 나눗셈", "unit": "1단원", "grade": 1},
+]
+EDGES = [
+    {"source": "1.1 소인수분해", "target": "1.3 정수와 유리수"},
+    {"source": "1.3 정수와 유리수", "target": "1.4 절댓값"},
+    {"source": "1.4 절댓값", "target": "1.5 정수와 유리수의 덧셈, 뺄셈"},
+    {"source": "1.5 정수와 유리수의 덧셈, 뺄셈", "target": "1.6 정수와 유리수의 곱셈, 나눗셈"},
+    {"source": "1.3 정수와 유리수", "target": "1.5 정수와 유리수의 덧셈, 뺄셈"},
+]
+
+class FakeRunCypher:
+    """NODES/EDGES 쿼리에 고정 결과를 돌려주는 가짜 run_cypher (GraphMeta 쿼리는 graph_version 반환)"""
+
+    def __init__(self, nodes, edges):
+        self.nodes = nodes
+        self.edges = edges
+        self.graph_version = 1
+        self.calls = 0
+        self.cached_calls = 0
+
+    def __call__(self, query, params=None, use_cache=True):
+        if use_cache:
+            self.cached_calls += 1
+        if "GraphMeta" in query:
+            return [{"version": self.graph_version}]
+        self.calls += 1
+        return self.edges if "PRECEDES" in query else self.nodes
+
+def test_snapshot_queries():
+    print("=== 개념 그래프 스냅샷 조회 테스트 ===")
+
+    graph = ConceptGraphSnapshot.from_run_cypher(FakeRunCypher(NODES, EDGES))
+    print(f"📊 노드 {len(graph)}개, 관계 {graph.edge_count}개")
+    assert len(graph) == 5 and graph.edge_count == 5
+
+    assert sorted(graph.successors("1.3 정수와 유리수")) == ["1.4 절댓값", "1.5 정수와 유리수의 덧셈, 뺄셈"]
+    assert graph.predecessors("1.4 절댓값") == ["1.3 정수와 유리수"]
+
+    # 최소 홉 수: 1.3 → 1.5 는 직접 연결이므로 1홉
+    ancestors = graph.ancestors("1.6 정수와 유리수의 곱셈, 나눗셈")
+    print(f"🔼 1.6의 선행 개념: {ancestors}")
+    assert ancestors == {
+        "1.5 정수와 유리수의 덧셈, 뺄셈": 1,
+        "1.4 절댓값": 2,
+        "1.3 정수와 유리수": 2,
+        "1.1 소인수분해": 3,
+    }
+    assert graph.ancestors("1.6 정수와 유리수의 곱셈, 나눗셈", max_hops=1) == {"1.5 정수와 유리수의 덧셈, 뺄셈": 1}
+    assert graph.descendants("1.1 소인수분해", max_hops=2) == {
+        "1.3 정수와 유리수": 1,
+        "1.4 절댓값": 2,
+        "1.5 정수와 유리수의 덧셈, 뺄셈": 2,
+    }
+    assert graph.ancestors("없는 개념") == {}
+    print("✅ 스냅샷 조회 정상")
+
+def test_store_versioning():
+    print("=== 개념 그래프 버전 관리 테스트 ===")
+
+    fake = FakeRunCypher(NODES, EDGES)
+    store = ConceptGraphStore(fake, refresh_interval=3600)
+    assert store.get().version == 1
+    store.get()
+    assert fake.calls == 2  # 두 번째 get()은 캐시된 스냅샷 사용
+
+    # 내용이 같으면 재로드해도 버전 유지
+    store.reload()
+    assert store.version == 1
+
+    # 관계가 바뀌면 버전 증가
+    fake.edges = EDGES[:-1]
+    store.invalidate()
+    graph = store.get()
+    assert store.version == 2
+    assert graph.ancestors("1.5 정수와 유리수의 덧셈, 뺄셈", max_hops=1) == {"1.4 절댓값": 1}
+    # 재로드는 run_cypher 결과 캐시를 거치지 않음
+    assert fake.cached_calls == 0
+    print("✅ 버전 관리 정상")
+
+def test_store_reloads_on_graph_version_change():
+    print("=== 그래프 버전 스탬프 변경 감지 테스트 ===")
+
+    fake = FakeRunCypher(NODES, EDGES)
+    store = ConceptGraphStore(fake, refresh_interval=3600, version_check_interval=0)
+    assert store.get().graph_version == 1
+    store.get()
+    assert fake.calls == 2  # 스탬프가 같으면 다시 읽지 않음
+
+    # 동기화 스크립트가 관계를 바꾸고 스탬프를 올림
+    fake.edges = EDGES[:-1]
+    fake.graph_version = 2
+    graph = store.get()
+    assert fake.calls == 4 and store.version == 2 and graph.graph_version == 2
+    assert "1.3 정수와 유리수" not in graph.predecessors("1.5 정수와 유리수의 덧셈, 뺄셈")
+    print("✅ 스탬프가 바뀌면 캐시를 거치지 않고 다시 읽음")
+
+def test_store_accepts_plain_run_cypher():
+    print("=== use_cache 인자가 없는 run_cypher 테스트 ===")
+
+    fake = FakeRunCypher(NODES, EDGES)
+
+    def run_cypher(query, params=None):
+        return fake(query, params)
+
+    store = ConceptGraphStore(run_cypher, refresh_interval=3600, version_check_interval=0)
+    assert len(store.get()) == len(NODES) and store.get().graph_version == 1
+    print("✅ 일반 run_cypher(query, params)로도 스냅샷 생성")
+
+if __name__ == "__main__":
+    test_snapshot_queries()
+    test_store_versioning()
+    test_store_reloads_on_graph_version_change()
+    test_store_accepts_plain_run_cypher()
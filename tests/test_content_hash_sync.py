@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+내용 해시 기반 재적재 테스트
+"""
+
+import os
+import sys
+from datetime import datetime
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from content_hash_sync import HASH_FIELD, content_hash, plan_sync, sync_by_hash
+
+
+class FakeBulkWriteError(Exception):
+    """pymongo BulkWriteError처럼 details에 writeErrors를 담는 예외"""
+
+    def __init__(self, details):
+        super().__init__("batch op errors occurred")
+        self.details = details
+
+
+class FakeCollection:
+    """find(projection) / bulk_write만 흉내내는 컬렉션 (fail_keys의 문서 쓰기는 실패)"""
+
+    def __init__(self):
+        self.docs = {}
+        self.writes = []
+        self.fail_keys = set()
+
+    def find(self, query, projection):
+        return [{k: v for k, v in doc.items() if projection.get(k)} for doc in self.docs.values()]
+
+    def bulk_write(self, ops, ordered=True):
+        write_errors = []
+        for index, (kind, doc_key, doc) in enumerate(ops):
+            if kind != "delete" and doc_key in self.fail_keys:
+                write_errors.append({"index": index, "code": 121, "errmsg": f"Document failed validation: {doc_key}"})
+                continue
+            self.writes.append((kind, doc_key))
+            if kind == "delete":
+                for key in doc_key:
+                    self.docs.pop(key, None)
+            else:
+                # update도 문서 전체 교체 (ReplaceOne)
+                self.docs[doc_key] = dict(doc)
+        if write_errors:
+            raise FakeBulkWriteError({"writeErrors": write_errors, "nInserted": len(ops) - len(write_errors)})
+
+
+def make_op(kind, doc_key, doc):
+    return kind, doc_key, doc
+
+
+def sample_units():
+    return [
+        {"unitId": "u1", "title": {"ko": "정수"}, "grade": 1, "createdAt": datetime(2024, 1, 1)},
+        {"unitId": "u2", "title": {"ko": "유리수"}, "grade": 1, "createdAt": datetime(2024, 1, 1)},
+    ]
+
+
+def test_hash_ignores_key_order_and_id():
+    """키 순서/_id/해시 필드와 무관한 해시"""
+    print("🧪 해시 안정성 테스트")
+    a = {"unitId": "u1", "title": {"ko": "정수", "en": "Integers"}}
+    b = {"title": {"en": "Integers", "ko": "정수"}, "unitId": "u1", "_id": "x", HASH_FIELD: "old"}
+    assert content_hash(a) == content_hash(b)
+    assert content_hash(a) != content_hash({**a, "grade": 2})
+    print("✅ 해시 안정성 테스트 통과")
+
+
+def test_second_run_writes_nothing():
+    """원본이 그대로면 두 번째 적재는 쓰기 없음"""
+    print("🧪 멱등 재적재 테스트")
+    collection = FakeCollection()
+    first = sync_by_hash(collection, sample_units(), "unitId", make_op=make_op)
+    assert first["inserted"] == 2 and first["writes"] == 2
+
+    collection.writes.clear()
+    second = sync_by_hash(collection, sample_units(), "unitId", make_op=make_op)
+    assert second["unchanged"] == 2
+    assert second["writes"] == 0 and not collection.writes
+    print("✅ 멱등 재적재 테스트 통과")
+
+
+def test_only_changed_documents_are_updated():
+    """바뀐 문서만 update, 원본에 없는 문서는 delete_missing일 때만 삭제"""
+    print("🧪 변경분 동기화 테스트")
+    collection = FakeCollection()
+    sync_by_hash(collection, sample_units(), "unitId", make_op=make_op)
+    collection.writes.clear()
+
+    units = sample_units()
+    units[0]["grade"] = 2
+    units = units[:1] + [{"unitId": "u3", "title": {"ko": "방정식"}, "grade": 1}]
+    kept = sync_by_hash(collection, units, "unitId", make_op=make_op)
+    assert (kept["inserted"], kept["updated"], kept["deleted"], kept["stale"]) == (1, 1, 0, 1)
+    assert "u2" in collection.docs
+
+    removed = sync_by_hash(collection, units, "unitId", delete_missing=True, make_op=make_op)
+    assert removed["deleted"] == 1 and removed["unchanged"] == 2
+    assert sorted(collection.docs) == ["u1", "u3"]
+    assert collection.docs["u1"]["grade"] == 2
+    print("✅ 변경분 동기화 테스트 통과")
+
+
+def test_plan_treats_missing_hash_as_changed():
+    """해시 없이 저장된 기존 문서는 한 번 갱신되고, 입력 내 중복 키는 마지막 문서 사용"""
+    print("🧪 해시 없는 기존 문서 테스트")
+    docs = [{"problemId": "p1", "level": "하"}, {"problemId": "p1", "level": "상"}]
+    plan = plan_sync(docs, {"p1": None}, "problemId")
+    assert len(plan["updates"]) == 1 and plan["updates"][0]["level"] == "상"
+    assert plan["updates"][0][HASH_FIELD] == content_hash({"problemId": "p1", "level": "상"})
+    print("✅ 해시 없는 기존 문서 테스트 통과")
+
+
+def test_update_replaces_document_but_keeps_created_at():
+    """바뀐 문서는 통째로 교체 (원본에서 빠진 필드 제거), createdAt은 기존 값 유지"""
+    print("🧪 문서 교체 테스트")
+    collection = FakeCollection()
+    sync_by_hash(collection, [{"unitId": "u1", "grade": 1, "memo": "삭제될 필드", "createdAt": datetime(2024, 1, 1)}],
+                 "unitId", make_op=make_op)
+
+    report = sync_by_hash(collection, [{"unitId": "u1", "grade": 2}], "unitId", make_op=make_op)
+    assert report["updated"] == 1
+    doc = collection.docs["u1"]
+    assert doc["grade"] == 2 and "memo" not in doc
+    assert doc["createdAt"] == datetime(2024, 1, 1)
+    # 유지한 createdAt은 해시에 영향 없음 → 다음 실행은 쓰기 없음
+    assert sync_by_hash(collection, [{"unitId": "u1", "grade": 2}], "unitId", make_op=make_op)["writes"] == 0
+    print("✅ 문서 교체 테스트 통과")
+
+
+def test_partial_bulk_write_failure_is_reported():
+    """일부 문서 쓰기가 실패해도 나머지는 저장하고 실패 건수를 리포트"""
+    print("🧪 부분 실패 리포트 테스트")
+    collection = FakeCollection()
+    collection.fail_keys = {"u2"}
+    report = sync_by_hash(collection, sample_units(), "unitId", make_op=make_op)
+    assert report["inserted"] == 1 and report["failed"] == 1
+    assert "u2" in report["errors"][0]
+    assert sorted(collection.docs) == ["u1"]
+
+    # 다시 실행하면 실패했던 문서만 씀
+    collection.fail_keys = set()
+    retry = sync_by_hash(collection, sample_units(), "unitId", make_op=make_op)
+    assert (retry["inserted"], retry["unchanged"], retry["failed"]) == (1, 1, 0)
+    print("✅ 부분 실패 리포트 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_hash_ignores_key_order_and_id()
+    test_second_run_writes_nothing()
+    test_only_changed_documents_are_updated()
+    test_plan_treats_missing_hash_as_changed()
+    test_update_replaces_document_but_keeps_created_at()
+    test_partial_bulk_write_failure_is_reported()
+    print("\n🎉 모든 테스트 통과!")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""진단 채점 벡터화 엔진 테스트"""
+
+import os
+import sys
+import random
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import numpy as np
+from diagnostic_scoring import determine_learner_class, group_quantile, score_submissions
+
+def answer(unit, concept, correct, seconds):
+    return {"unit": unit, "concept": concept, "isCorrect": correct, "durationSeconds": seconds}
+
+def test_single_submission():
+    print("=== 단건 채점 테스트 ===")
+
+    submission = {"answers": [
+        answer("정수와 유리수", "1.4 절댓값", False, 40),
+        answer("정수와 유리수", "1.4 절댓값", True, 20),
+        answer("정수와 유리수", "1.3 정수와 유리수", True, 30),
+        answer("문자와 식", "2.1 문자와 식", False, 100),
+        answer("문자와 식", "2.1 문자와 식", False, 60),
+    ]}
+    result = score_submissions([submission])[0]
+    print(f"📊 {result}")
+
+    assert result["accuracyRate"] == 40.0
+    assert result["avgTime"] == 50.0
+    assert result["timeP50"] == 40.0
+    assert result["conceptErrorRates"] == {"1.4 절댓값": 0.5, "1.3 정수와 유리수": 0.0, "2.1 문자와 식": 1.0}
+    assert result["unitLevels"] == {"정수와 유리수": "중", "문자와 식": "하"}
+    assert result["wrongUnits"] == ["문자와 식"]
+    assert result["overallLevel"] == "하" and result["class"] == "기초형"
+    print("✅ 정답률 / 백분위 / 개념 오답률 / 단원 수준 / 클래스 정상")
+
+def test_learner_class_uses_service_rule_on_percent_scale():
+    print("=== 학습자 클래스 규칙 (% 단위) 테스트 ===")
+
+    calls = []
+
+    def custom_rule(accuracy_rate, avg_time):
+        calls.append((accuracy_rate, avg_time))
+        return "테스트 클래스"
+
+    submission = {"answers": [answer("함수", "3.1 함수", True, 100), answer("함수", "3.1 함수", True, 140),
+                              answer("함수", "3.2 일차함수", False, 120)]}
+    result = score_submissions([submission], learner_class=custom_rule)[0]
+    # DiagnosticService._determine_learner_class와 같이 정답률은 % 단위로 전달
+    assert len(calls) == 1 and (round(calls[0][0], 2), calls[0][1]) == (66.67, 120.0)
+    assert result["class"] == "테스트 클래스"
+    # 기본 규칙(LEARNER_CLASS_RULES)도 % 단위: 66.7% → 성장형, 단건 함수와 벡터 연산 결과가 같음
+    assert score_submissions([submission])[0]["class"] == "성장형"
+    assert determine_learner_class(66.67, 120.0) == "성장형"
+    assert determine_learner_class(90.0, 60.0) == "심화형" and determine_learner_class(10.0, 60.0) == "기초형"
+    print("✅ 기존 규칙에 % 정답률 전달")
+
+def test_batch_matches_single():
+    print("=== 일괄 채점 = 단건 채점 반복 테스트 ===")
+
+    rng = random.Random(7)
+    units = ["정수와 유리수", "문자와 식", "함수"]
+    submissions = [
+        {"answers": [answer(rng.choice(units), f"{rng.randint(1, 3)}.{rng.randint(1, 5)}", rng.random() < 0.7,
+                            rng.randint(5, 200)) for _ in range(rng.randint(1, 12))]}
+        for _ in range(300)
+    ]
+    submissions.append({"answers": []})
+
+    batch = score_submissions(submissions)
+    single = [score_submissions([submission])[0] for submission in submissions]
+    assert batch == single
+    assert batch[-1]["totalProblems"] == 0 and batch[-1]["timeP50"] is None
+    print(f"✅ 제출 {len(submissions)}개 일괄 결과가 단건 결과와 일치")
+
+def test_group_quantile():
+    print("=== 그룹별 분위수 테스트 ===")
+
+    groups = np.array([0, 0, 0, 1, 1, 0])
+    values = np.array([5.0, 1.0, 3.0, 10.0, 20.0, 7.0])
+    for q in (0.0, 0.5, 0.9, 1.0):
+        expected = [np.quantile(values[groups == g], q) for g in (0, 1)]
+        assert np.allclose(group_quantile(groups, values, q, 3)[:2], expected)
+    assert np.isnan(group_quantile(groups, values, 0.5, 3)[2])
+    print("✅ np.quantile과 일치")
+
+if __name__ == "__main__":
+    test_single_submission()
+    test_learner_class_uses_service_rule_on_percent_scale()
+    test_batch_matches_single()
+    test_group_quantile()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Express 진단 결과 일괄 처리 테스트 (MongoDB/Neo4j 없이 공유 조회와 insert_many 확인)"""
+
+import os
+import sys
+import itertools
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from concept_graph import ConceptGraphSnapshot
+from express_batch import ExpressBatchProcessor
+from problem_concept_index import ProblemConceptIndex
+from test_concept_graph import EDGES, NODES, FakeRunCypher
+
+UNITS = [
+    {"unitId": "U3", "title": {"ko": "정수와 유리수"}},
+    {"unitId": "U4", "title": {"ko": "절댓값"}},
+    {"unitId": "U6", "title": {"ko": "정수와 유리수의 곱셈, 나눗셈"}},
+]
+PROBLEMS = [
+    {"problemId": "P3", "unitId": "U3"},
+    {"problemId": "P4", "unitId": "U4"},
+    {"problemId": "P6", "unitId": "U6"},
+]
+
+class RecordingCollection:
+    def __init__(self, name, fail_indexes=()):
+        self.name = name
+        self.calls = []
+        self.deleted = []
+        self.fail_indexes = set(fail_indexes)
+        self.ids = itertools.count(1)
+
+    def insert_many(self, docs, ordered=True):
+        docs = list(docs)
+        for doc in docs:
+            doc["_id"] = f"{self.name}-{next(self.ids)}"
+        self.calls.append(docs)
+        if self.fail_indexes:
+            error = Exception("일부 쓰기 실패")
+            error.details = {"writeErrors": [{"index": i} for i in sorted(self.fail_indexes)]}
+            raise error
+
+    def delete_many(self, query):
+        self.deleted.extend(query["_id"]["$in"])
+
+class CountingSnapshot:
+    """relations 호출 수를 세는 스냅샷 래퍼"""
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.calls = 0
+
+    def relations(self, names, max_hops):
+        self.calls += 1
+        return self.snapshot.relations(names, max_hops)
+
+def submission(test_id, answers):
+    return {"testId": test_id, "userId": 1, "gradeRange": "중1",
+            "answers": [{"problemId": p, "isCorrect": c, "durationSeconds": 30} for p, c in answers]}
+
+def test_batch_processing():
+    print("=== Express 진단 일괄 처리 테스트 ===")
+
+    concept_names = [node["concept"] for node in NODES]
+    index = ProblemConceptIndex(PROBLEMS, UNITS, [], concept_names)
+    snapshot = CountingSnapshot(ConceptGraphSnapshot.from_run_cypher(FakeRunCypher(NODES, EDGES)))
+    results_collection = RecordingCollection("express_diagnostic_results")
+    paths_collection = RecordingCollection("learning_paths")
+    ids = itertools.count(1)
+    processor = ExpressBatchProcessor(index, snapshot, results_collection, paths_collection,
+                                      id_factory=lambda: f"id{next(ids)}")
+
+    results = processor.process([
+        submission("t1", [("P6", False), ("P3", True)]),
+        {"testId": "t2", "userId": 2, "answers": []},
+        submission("t3", [("P3", True), ("P4", True)]),
+    ])
+
+    assert [r["status"] for r in results] == ["ok", "error", "ok"]
+    assert snapshot.calls == 1
+    assert len(results_collection.calls) == 1 and len(results_collection.calls[0]) == 2
+    assert len(paths_collection.calls) == 1 and len(paths_collection.calls[0]) == 2
+
+    # 1.6을 틀렸으므로 2홉 이내 선행 개념(1.3, 1.4, 1.5)이 먼저 오고 1.6이 마지막
+    nodes = results[0]["learningPath"]["nodes"]
+    print(f"📚 t1 학습 경로: {[n['concept'] for n in nodes]}")
+    assert nodes[-1]["concept"] == "1.6 정수와 유리수의 곱셈, 나눗셈" and not nodes[-1]["isPrerequisite"]
+    assert {n["concept"] for n in nodes[:-1]} == {"1.3 정수와 유리수", "1.4 절댓값", "1.5 정수와 유리수의 덧셈, 뺄셈"}
+    assert [n["priority"] for n in nodes] == list(range(1, len(nodes) + 1))
+
+    analysis = results_collection.calls[0][0]["analysisResult"]
+    assert analysis["weakConcepts"] == ["1.6 정수와 유리수의 곱셈, 나눗셈"]
+    assert results[2]["learningPath"]["nodes"] == []
+    print("✅ 공유 조회 1회 / insert_many 1회씩 / 항목별 결과 정상")
+
+def test_failed_path_removes_result():
+    print("=== 경로 저장 실패 시 결과 정리 테스트 ===")
+
+    concept_names = [node["concept"] for node in NODES]
+    index = ProblemConceptIndex(PROBLEMS, UNITS, [], concept_names)
+    snapshot = ConceptGraphSnapshot.from_run_cypher(FakeRunCypher(NODES, EDGES))
+    results_collection = RecordingCollection("express_diagnostic_results")
+    paths_collection = RecordingCollection("learning_paths", fail_indexes=[1])
+    ids = itertools.count(1)
+    processor = ExpressBatchProcessor(index, snapshot, results_collection, paths_collection,
+                                      id_factory=lambda: f"id{next(ids)}")
+
+    results = processor.process([
+        submission("t1", [("P6", False)]),
+        submission("t2", [("P3", True)]),
+    ])
+
+    assert [r["status"] for r in results] == ["ok", "error"]
+    saved_results = results_collection.calls[0]
+    saved_paths = paths_collection.calls[0]
+    assert [path["resultId"] for path in saved_paths] == [doc["_id"] for doc in saved_results]
+    # t2의 경로가 저장되지 않았으므로 t2 결과는 삭제
+    assert results_collection.deleted == [saved_results[1]["_id"]]
+    print("✅ 결과 먼저 저장, 경로 실패 시 결과 삭제")
+
+if __name__ == "__main__":
+    test_batch_processing()
+    test_failed_path_removes_result()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+인덱스 매니페스트 / 어드바이저 테스트
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from index_advisor import advise_collection, collect_shapes, index_supports, manifest_keys, query_shape, suggest_index
+from index_manifest import NERDMATH_INDEXES, index_name, normalize_keys, plan_index_diff, sync_collection_indexes
+
+
+class FakeCollection:
+    """list_indexes / create_index / drop_index만 흉내내는 컬렉션"""
+
+    def __init__(self, indexes):
+        self.indexes = {"_id_": {"name": "_id_", "key": {"_id": 1}}}
+        for name, info in indexes.items():
+            self.indexes[name] = {"name": name, **info}
+
+    def list_indexes(self):
+        return list(self.indexes.values())
+
+    def create_index(self, keys, name):
+        self.indexes[name] = {"name": name, "key": dict(keys)}
+
+    def drop_index(self, name):
+        del self.indexes[name]
+
+
+def profile_entry(collection, filter_, sort=None, millis=10, plan="COLLSCAN"):
+    command = {"find": collection, "filter": filter_}
+    if sort:
+        command["sort"] = sort
+    return {"ns": f"nerdmath.{collection}", "command": command, "millis": millis, "planSummary": plan}
+
+
+def test_query_shape_and_esr_suggestion():
+    """쿼리 형태 추출과 등호 → 정렬 → 범위 순서 제안"""
+    print("🧪 쿼리 형태 / ESR 제안 테스트")
+    entry = profile_entry("answer_attempt", {"userld": 7, "mode": {"$in": ["vocab", "test"]},
+                                             "scoredAt": {"$gte": "2024-01-01"}}, {"unitid": 1})
+    collection, equality, sort, ranges = query_shape(entry)
+    assert collection == "answer_attempt"
+    assert equality == ("mode", "userld") and sort == (("unitid", 1),) and ranges == ("scoredAt",)
+    assert suggest_index(equality, sort, ranges) == [("mode", 1), ("userld", 1), ("unitid", 1), ("scoredAt", 1)]
+    assert query_shape(profile_entry("answer_attempt", {"$or": [{"userld": 1}, {"userld": 2}]})) is None
+    print("✅ 쿼리 형태 / ESR 제안 테스트 통과")
+
+
+def test_index_supports_prefix_and_reversed_sort():
+    """복합 인덱스 앞부분으로 등호+정렬 처리 (정렬 전체 역방향 허용)"""
+    print("🧪 인덱스 지원 판단 테스트")
+    index = [("userld", 1), ("scoredAt", -1)]
+    assert index_supports(index, ["userld"], [], [])
+    assert index_supports(index, ["userld"], [("scoredAt", -1)], [])
+    assert index_supports(index, ["userld"], [("scoredAt", 1)], [])
+    assert not index_supports(index, ["scoredAt"], [], [])
+    assert not index_supports([("userld", 1)], ["userld"], [("scoredAt", -1)], [])
+    assert index_supports([("scoredAt", -1)], [], [], ["scoredAt"])
+    print("✅ 인덱스 지원 판단 테스트 통과")
+
+
+def test_manifest_diff_and_sync():
+    """매니페스트 차이: 이름이 달라도 키가 같으면 유지, 단일 필드 인덱스는 매니페스트 밖으로 분류"""
+    print("🧪 매니페스트 동기화 테스트")
+    collection = FakeCollection({
+        "answerld_idx": {"key": {"answerld": 1}},
+        "custom_user_time": {"key": {"userld": 1, "scoredAt": -1}},
+        "mode_idx": {"key": {"mode": 1}},
+    })
+    manifest = NERDMATH_INDEXES["answer_attempt"]
+    plan = sync_collection_indexes(collection, manifest)
+    assert sorted(plan["keep"]) == ["answerld_idx", "custom_user_time"]
+    assert plan["extra"] == ["mode_idx"]
+    assert index_name([("problemld", 1)]) in collection.indexes
+
+    plan = sync_collection_indexes(collection, manifest, drop_extra=True)
+    assert not plan["create"] and "mode_idx" not in collection.indexes
+    text_plan = plan_index_diff([[("word", "text")]], {"word_idx": normalize_keys([("word", "text")])})
+    assert text_plan["keep"] == ["word_idx"]
+    print("✅ 매니페스트 동기화 테스트 통과")
+
+
+def test_advise_collection_suggests_and_flags_unused():
+    """반복되는 미지원 쿼리는 복합 인덱스 제안, 사용 기록 없는 인덱스는 표시"""
+    print("🧪 어드바이저 테스트")
+    entries = [profile_entry("answer_attempt", {"userld": 3, "mode": "test"}, {"scoredAt": -1})] * 6
+    entries += [profile_entry("answer_attempt", {"userld": 3}, {"scoredAt": -1}, plan="IXSCAN")] * 6
+    entries += [profile_entry("answer_attempt", {"isCorrect": True})] * 2
+    shapes = collect_shapes(entries)
+    existing = {"userld_idx": normalize_keys([("userld", 1)]), "mode_idx": normalize_keys([("mode", 1)])}
+    usage = {"userld_idx": 40, "mode_idx": 0}
+
+    advice = advise_collection("answer_attempt", NERDMATH_INDEXES["answer_attempt"], existing, usage, shapes)
+    assert advice["unused"] == ["mode_idx"]
+    assert set(advice["extra"]) == {"userld_idx", "mode_idx"}
+    # userld+scoredAt 쿼리는 매니페스트 인덱스로 처리, isCorrect는 횟수 미달
+    assert len(advice["suggested"]) == 1
+    keys, stats = advice["suggested"][0]
+    assert keys == [("mode", 1), ("userld", 1), ("scoredAt", -1)]
+    assert stats["count"] == 6 and stats["collscans"] == 6
+    print("✅ 어드바이저 테스트 통과")
+
+
+def test_other_manifest_indexes_are_not_extra():
+    """같은 DB의 다른 매니페스트(legacy) 인덱스는 매니페스트 밖 인덱스로 보지 않음"""
+    print("🧪 매니페스트 합집합 테스트")
+    existing = {
+        "userld_updatedAt_idx": normalize_keys([("userld", 1), ("updatedAt", -1)]),
+        "userId_conceptId_idx": normalize_keys([("userId", 1), ("conceptId", 1)]),
+        "stale_idx": normalize_keys([("stale", 1)]),
+    }
+    usage = {name: 0 for name in existing}
+    advice = advise_collection("progress", NERDMATH_INDEXES["progress"], existing, usage, {},
+                               protected=manifest_keys("progress"))
+    assert advice["extra"] == ["stale_idx"]
+    assert normalize_keys([("vocaId", 1)]) in manifest_keys("vocabulary")
+    print("✅ 매니페스트 합집합 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_query_shape_and_esr_suggestion()
+    test_index_supports_prefix_and_reversed_sort()
+    test_manifest_diff_and_sync()
+    test_advise_collection_suggests_and_flags_unused()
+    test_other_manifest_indexes_are_not_extra()
+    print("\n🎉 모든 테스트 통과!")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""프로세스 내 비동기 작업 큐 테스트"""
+
+import os
+import sys
+import asyncio
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from job_queue import JobQueue, QueueFullError, summarize_result, validate_callback_url
+
+async def wait_finished(queue, job_id):
+    for _ in range(200):
+        job = queue.get(job_id)
+        if job["status"] in ("succeeded", "partial", "failed"):
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError("작업이 끝나지 않았습니다")
+
+def test_job_lifecycle():
+    print("=== 작업 등록 / 상태 조회 / 웹훅 테스트 ===")
+
+    delivered = []
+
+    async def fake_webhook(url, payload):
+        delivered.append((url, payload))
+        return True
+
+    async def scenario():
+        queue = JobQueue(workers=2, webhook_sender=fake_webhook)
+        queue.start()
+        try:
+            job = queue.submit("express_diagnostic", lambda x: {"pathId": x}, "p1",
+                               callback_url="http://express/callback")
+            assert job["status"] == "queued" and "callbackUrl" not in job
+
+            done = await wait_finished(queue, job["jobId"])
+            assert done["status"] == "succeeded" and done["result"] == {"pathId": "p1"}
+
+            def fail():
+                raise ValueError("분석 실패")
+
+            failed = await wait_finished(queue, queue.submit("express_diagnostic", fail)["jobId"])
+            assert failed["status"] == "failed" and failed["error"] == "분석 실패"
+            assert queue.get("없는 작업") is None
+            for _ in range(200):
+                if delivered:
+                    break
+                await asyncio.sleep(0.01)
+            print(f"📊 {queue.get_stats()}")
+        finally:
+            await queue.stop()
+
+    asyncio.run(scenario())
+    assert len(delivered) == 1 and delivered[0][0] == "http://express/callback"
+    assert delivered[0][1]["result"] == {"pathId": "p1"}
+    print("✅ 성공/실패 상태 기록, 웹훅 1회 전송")
+
+def test_queue_full():
+    print("=== 큐 가득 참 테스트 ===")
+
+    async def scenario():
+        queue = JobQueue(workers=0, max_size=1)
+        queue.start()
+        queue.submit("noop", lambda: None)
+        try:
+            queue.submit("noop", lambda: None)
+            assert False, "QueueFullError가 발생해야 합니다"
+        except QueueFullError:
+            pass
+        await queue.stop()
+
+    asyncio.run(scenario())
+    print("✅ 큐가 가득 차면 즉시 거절")
+
+def test_item_errors_mark_job():
+    print("=== 항목별 오류로 작업 상태 결정 테스트 ===")
+    assert summarize_result({"status": "ok"})["status"] == "succeeded"
+    failed = summarize_result({"status": "error", "error": "testId 누락"})
+    assert failed == {"status": "failed", "failures": 1, "error": "testId 누락"}
+    partial = summarize_result([{"status": "ok"}, {"status": "error", "error": "x"}])
+    assert partial["status"] == "partial" and partial["failures"] == 1
+    assert summarize_result({"pathId": "p1"})["status"] == "succeeded"
+
+    async def scenario():
+        queue = JobQueue(workers=1)
+        queue.start()
+        try:
+            job = queue.submit("express_diagnostic", lambda: {"status": "error", "error": "분석 실패"})
+            done = await wait_finished(queue, job["jobId"])
+            assert done["status"] == "failed" and done["failures"] == 1 and done["error"] == "분석 실패"
+        finally:
+            await queue.stop()
+
+    asyncio.run(scenario())
+    print("✅ 모든 항목이 실패하면 failed, 일부면 partial")
+
+def test_slow_webhook_does_not_block_worker():
+    print("=== 느린 웹훅이 워커를 막지 않는지 테스트 ===")
+    release = None
+
+    async def slow_webhook(url, payload):
+        await release.wait()
+        return True
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        queue = JobQueue(workers=1, webhook_sender=slow_webhook)
+        queue.start()
+        try:
+            first = queue.submit("noop", lambda: 1, callback_url="https://express.example.com/cb")
+            second = queue.submit("noop", lambda: 2)
+            await wait_finished(queue, first["jobId"])
+            assert (await wait_finished(queue, second["jobId"]))["result"] == 2
+            assert queue.get_stats()["webhooks_pending"] == 1
+            release.set()
+        finally:
+            await queue.stop()
+
+    asyncio.run(scenario())
+    print("✅ 웹훅 전송 중에도 다음 작업 처리")
+
+def test_callback_url_allowlist():
+    print("=== callbackUrl 허용 목록 테스트 ===")
+    allowed = ["express.example.com", ".hooks.example.com"]
+    assert validate_callback_url("https://express.example.com/cb", allowed) is None
+    assert validate_callback_url("https://a.hooks.example.com/cb", allowed) is None
+    assert validate_callback_url("http://express.example.com/cb", allowed)
+    assert validate_callback_url("https://169.254.169.254/latest/meta-data", allowed)
+    assert validate_callback_url("https://localhost:8000/", allowed)
+    assert validate_callback_url("https://evilhooks.example.com/", allowed)
+    assert validate_callback_url("https://user@express.example.com/", allowed)
+    assert validate_callback_url("https://express.example.com/cb", [])
+    assert validate_callback_url(123, allowed)
+    print("✅ https + 허용 호스트만 통과")
+
+if __name__ == "__main__":
+    test_job_lifecycle()
+    test_queue_full()
+    test_item_errors_mark_job()
+    test_slow_webhook_does_not_block_worker()
+    test_callback_url_allowlist()
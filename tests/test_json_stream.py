@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""JSON / NDJSON 시드 파일 스트리밍 파서 테스트"""
+
+import io
+import json
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from json_stream import JSONStream, iter_seed_items, read_chunks
+
+CONCEPTS = [{"conceptId": f"C{i}", "unitId": f"U{i % 7}", "score": i * 1.5, "tags": ["정수", "유리수"],
+             "note": None, "flag": i % 2 == 0} for i in range(300)]
+
+def stream(text, key, chunk_size=7):
+    return list(iter_seed_items(io.BytesIO(text.encode("utf-8")), key, chunk_size=chunk_size))
+
+def test_object_array_and_formats():
+    print("=== 객체 배열 / 최상위 배열 / NDJSON 파싱 테스트 ===")
+
+    pretty = json.dumps({"version": {"a": [1, 2]}, "concepts": CONCEPTS, "tail": 1}, ensure_ascii=False, indent=2)
+    minified = json.dumps({"concepts": CONCEPTS}, ensure_ascii=False)
+    ndjson = "\n".join(json.dumps(c, ensure_ascii=False) for c in CONCEPTS) + "\n"
+    array = json.dumps(CONCEPTS, ensure_ascii=False)
+
+    for chunk_size in (1, 7, 4096):
+        assert stream(pretty, "concepts", chunk_size) == CONCEPTS
+        assert stream(minified, "concepts", chunk_size) == CONCEPTS
+        assert stream(ndjson, "concepts", chunk_size) == CONCEPTS
+        assert stream(array, "concepts", chunk_size) == CONCEPTS
+    assert stream('﻿{"sets": []}', "sets") == []
+    assert stream('{"n": [10, 200, 3000]}', "n", chunk_size=1) == [10, 200, 3000]
+    print("✅ 청크 크기와 관계없이 json.load 결과와 일치 (BOM/숫자 경계 포함)")
+
+def test_errors():
+    print("=== 형식 오류 테스트 ===")
+
+    for text, key in (('{"units": [{"code": "1.1"}]}', "concepts"), ('{"concepts": [{"a": 1} {"b": 2}]}', "concepts"),
+                      ('{"concepts": [{"a": 1}', "concepts")):
+        try:
+            stream(text, key)
+            assert False, "예외가 발생해야 합니다"
+        except ValueError as e:
+            print(f"⚠️ 예상된 오류: {e}")
+    print("✅ 키 누락 / 잘못된 구분자 / 잘린 파일에서 ValueError")
+
+def test_flat_memory():
+    print("=== 버퍼 크기 일정 테스트 ===")
+
+    item = json.dumps({"conceptId": "C", "blocks": ["x" * 50] * 4})
+    text = '{"concepts": [' + ",".join([item] * 20000) + "]}"
+    parser = JSONStream(read_chunks(io.StringIO(text), 4096))
+    parser.expect("{")
+    parser.value()
+    parser.expect(":")
+    count, max_buffer = 0, 0
+    for _ in parser.array_items():
+        count += 1
+        max_buffer = max(max_buffer, len(parser.buf))
+    print(f"📊 입력 {len(text):,}자, 항목 {count}개, 최대 버퍼 {max_buffer:,}자")
+    assert count == 20000 and max_buffer < 4096 + 2 * len(item)
+    print("✅ 입력 크기와 무관하게 버퍼는 청크 + 항목 크기 이내")
+
+if __name__ == "__main__":
+    test_object_array_and_formats()
+    test_errors()
+    test_flat_memory()
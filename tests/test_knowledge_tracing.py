@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""BKT 숙련도 엔진 테스트"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import numpy as np
+from knowledge_tracing import MasteryTracker, sync_from_answer_attempts
+
+START = datetime(2025, 3, 1, tzinfo=timezone.utc)
+
+def attempt(user, unit, correct, minutes):
+    return {"userld": user, "unitid": unit, "isCorrect": correct, "scoredAt": START + timedelta(minutes=minutes)}
+
+def test_update_direction():
+    print("=== 정답/오답 갱신 방향 테스트 ===")
+
+    tracker = MasteryTracker()
+    up = tracker.update(1, "1.4", True)
+    down = MasteryTracker().update(1, "1.4", False)
+    print(f"📊 정답 후 {up:.3f}, 오답 후 {down:.3f} (초기 {tracker.p_init})")
+    assert down < tracker.p_init < up
+
+    for _ in range(10):
+        tracker.update(1, "1.4", True)
+    assert tracker.mastery_of(1, ["1.4"])["1.4"] > 0.95
+    print("✅ 연속 정답 시 숙련도 수렴")
+
+def test_apply_attempts_and_vectors():
+    print("=== 채점 기록 반영 / 숙련도 벡터 테스트 ===")
+
+    tracker = MasteryTracker(capacity=1)
+    attempts = [attempt(user, f"unit{u}", (user + u) % 3 != 0, user * 10 + u)
+                for user in range(100) for u in range(20)]
+    attempts.append({"userld": None, "unitid": "unit0", "isCorrect": True})
+    applied = tracker.apply_attempts(attempts)
+
+    assert applied == 2000
+    assert len(tracker.users) == 100 and len(tracker.concepts) == 20
+    assert tracker.checkpoint == START + timedelta(minutes=99 * 10 + 19)
+
+    vector = tracker.mastery_vector(5)
+    assert vector.shape == (20,)
+    weak = tracker.weak_concepts(5)
+    assert weak and all(vector[tracker.concepts[name]] < 0.6 for name in weak)
+    assert np.all(tracker.mastery_vector("unknown") == np.float32(tracker.p_init))
+    print(f"✅ 사용자 {len(tracker.users)}명 × 개념 {len(tracker.concepts)}개, 사용자 5 취약 개념 {weak}")
+
+def test_save_load_and_resume():
+    print("=== 상태 저장 후 이어서 반영 테스트 ===")
+
+    attempts = [attempt(user, f"unit{i % 4}", i % 3 == 0, i) for i, user in enumerate([7, 8, "guest"] * 10)]
+    full = MasteryTracker()
+    full.apply_attempts(attempts)
+
+    partial = MasteryTracker()
+    partial.apply_attempts(attempts[:12])
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "mastery_state.npz")
+        partial.save(path)
+        resumed = MasteryTracker.load(path)
+    assert resumed.checkpoint == attempts[11]["scoredAt"]
+    resumed.apply_attempts(a for a in attempts if a["scoredAt"] > resumed.checkpoint)
+
+    for user in (7, 8, "guest"):
+        assert np.allclose(list(resumed.mastery_of(user, full.concept_names).values()),
+                           list(full.mastery_of(user, full.concept_names).values()))
+    print("✅ 저장/로드 후 이어서 반영한 결과가 전체 재계산과 일치")
+
+class FakeAttemptCollection:
+    """find(_id 조건).sort("_id").batch_size()만 흉내내는 answer_attempt 컬렉션"""
+
+    def __init__(self, docs):
+        self.docs = list(docs)
+        self.queries = []
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+        floor = query.get("_id", {}).get("$gte")
+        rows = sorted((doc for doc in self.docs if floor is None or doc["_id"] >= floor), key=lambda d: d["_id"])
+        return FakeCursor(rows)
+
+class FakeCursor(list):
+    def sort(self, *args):
+        return self
+
+    def batch_size(self, size):
+        return self
+
+def id_floor(last_id):
+    return f"{int(last_id) - 2:04d}"
+
+def test_sync_by_insert_order():
+    print("=== 삽입 순서(_id) 기준 이어 읽기 테스트 ===")
+
+    docs = [{**attempt(1, "unit0", True, 10), "_id": "0001"},
+            {**attempt(2, "unit0", False, 10), "_id": "0002"}]
+    collection = FakeAttemptCollection(docs)
+    tracker = MasteryTracker()
+    assert sync_from_answer_attempts(tracker, collection, id_floor=id_floor) == 2
+
+    # 같은 scoredAt 기록과 scoredAt이 과거인 늦은 기록도 반영, 이미 반영한 기록은 다시 반영하지 않음
+    collection.docs.append({**attempt(3, "unit0", True, 10), "_id": "0003"})
+    collection.docs.append({**attempt(4, "unit1", True, -60), "_id": "0004"})
+    assert sync_from_answer_attempts(tracker, collection, id_floor=id_floor) == 2
+    assert collection.queries[-1] == {"_id": {"$gte": "0000"}}
+    assert set(tracker.users) == {1, 2, 3, 4}
+    assert int(tracker.attempts[tracker.users[1], tracker.concepts["unit0"]]) == 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "mastery_state.npz")
+        tracker.save(path)
+        resumed = MasteryTracker.load(path)
+    assert resumed.last_id == "0004" and "0003" in resumed.applied_ids
+    assert sync_from_answer_attempts(resumed, collection, id_floor=id_floor) == 0
+    assert set(resumed.applied_ids) == {"0002", "0003", "0004"}
+    print("✅ 같은 시각/늦게 도착한 기록 반영, 중복 없이 이어 읽기")
+
+if __name__ == "__main__":
+    test_update_direction()
+    test_apply_attempts_and_vectors()
+    test_save_load_and_resume()
+    test_sync_by_insert_order()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""LLM 응답 캐시 키 정규화 및 LRU 동작 테스트"""
+
+import os
+import sys
+import asyncio
+import threading
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from llm_cache import LLMAnswerCache, make_cache_key, normalize_question
+
+def test_cache_key_normalization():
+    print("=== 캐시 키 정규화 테스트 ===")
+
+    # 공백/문장부호만 다른 질문은 같은 키
+    key1 = make_cache_key("P001", "solve_prompt_v1", "prompt", "gpt-4o", "이 문제를 풀어주세요")
+    key2 = make_cache_key("P001", "solve_prompt_v1", "prompt", "gpt-4o", "  이 문제를   풀어주세요?! ")
+    assert normalize_question("  이 문제를   풀어주세요?! ") == "이 문제를 풀어주세요"
+    assert key1 == key2
+
+    # 프롬프트 파일 내용이 바뀌면 다른 키 (자동 무효화)
+    key3 = make_cache_key("P001", "solve_prompt_v1", "prompt (수정됨)", "gpt-4o", "이 문제를 풀어주세요")
+    assert key1 != key3
+
+    # 문제/모델이 다르면 다른 키
+    assert key1 != make_cache_key("P002", "solve_prompt_v1", "prompt", "gpt-4o", "이 문제를 풀어주세요")
+    assert key1 != make_cache_key("P001", "solve_prompt_v1", "prompt", "gpt-4o-mini", "이 문제를 풀어주세요")
+    print("✅ 캐시 키 정규화 정상")
+
+def test_memory_lru_and_stats():
+    print("=== 메모리 LRU 캐시 테스트 ===")
+
+    cache = LLMAnswerCache(max_memory_items=2)
+    cache.set("a", {"answer": 1})
+    cache.set("b", {"answer": 2})
+    assert cache.get("a") == {"answer": 1}  # a를 최근 사용으로 갱신
+    cache.set("c", {"answer": 3})           # b가 제거되어야 함
+
+    assert cache.get("b") is None
+    assert cache.get("c") == {"answer": 3}
+
+    stats = cache.get_stats()
+    print(f"📊 캐시 통계: {stats}")
+    assert stats["memory_hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["evictions"] == 1
+    print("✅ LRU 제거 및 통계 정상")
+
+def test_memory_ttl():
+    print("=== 메모리 TTL 만료 테스트 ===")
+
+    cache = LLMAnswerCache(memory_ttl=-1)
+    cache.set("a", {"answer": 1})
+    assert cache.get("a") is None
+    print("✅ TTL 만료 정상")
+
+class FakeCacheCollection:
+    """find_one / replace_one을 호출한 스레드를 기록하는 컬렉션"""
+
+    def __init__(self, count=0):
+        self.docs = {}
+        self.count = count
+        self.threads = []
+        self.evicted = threading.Event()
+
+    def find_one(self, query, projection=None):
+        self.threads.append(threading.get_ident())
+        doc = self.docs.get(query["key"])
+        return {"answer": doc["answer"]} if doc else None
+
+    def replace_one(self, query, doc, upsert=False):
+        self.threads.append(threading.get_ident())
+        self.docs[query["key"]] = doc
+
+    def create_index(self, *args, **kwargs):
+        pass
+
+    def estimated_document_count(self):
+        self.threads.append(threading.get_ident())
+        self.evicted.set()
+        return self.count
+
+def test_async_access_off_event_loop():
+    print("=== 비동기 조회/저장 스레드 테스트 ===")
+
+    collection = FakeCacheCollection(count=0)
+    cache = LLMAnswerCache(collection=collection, eviction_check_interval=1)
+
+    async def scenario():
+        loop_thread = threading.get_ident()
+        assert await cache.aget("a") is None
+        await cache.aset("a", {"answer": 1})
+        cache.clear_memory()
+        assert await cache.aget("a") == {"answer": 1}
+        return loop_thread
+
+    loop_thread = asyncio.run(scenario())
+    assert collection.evicted.wait(1)
+    assert collection.threads and loop_thread not in collection.threads
+    print("✅ MongoDB 조회/저장/정리는 이벤트 루프 밖에서 실행")
+
+if __name__ == "__main__":
+    test_cache_key_normalization()
+    test_memory_lru_and_stats()
+    test_memory_ttl()
+    test_async_access_off_event_loop()
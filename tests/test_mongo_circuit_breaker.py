@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""MongoDB 회로 차단기 상태 전이 테스트"""
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from mongo_pool import CircuitBreaker, MongoPool
+
+def test_circuit_breaker_transitions():
+    print("=== 회로 차단기 상태 전이 테스트 ===")
+
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.0)
+    assert breaker.allow_request()
+
+    # 연속 실패가 임계치에 도달하면 open
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    print(f"🔴 연속 실패 2회 후 상태: {breaker.state}")
+
+    # reset_timeout이 지나면 시험 요청 허용 (half_open)
+    assert breaker.allow_request()
+    assert breaker.state == "half_open"
+
+    # half_open에서 실패하면 바로 다시 open
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    # 성공하면 closed로 복구
+    breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+    print("✅ 회로 차단기 정상")
+
+def test_circuit_breaker_blocks_while_open():
+    print("=== 회로 차단기 차단 테스트 ===")
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60.0)
+    breaker.record_failure()
+    assert not breaker.allow_request()
+    print("✅ open 상태에서 요청 즉시 차단")
+
+def test_half_open_allows_single_trial_request():
+    print("=== half_open 시험 요청 테스트 ===")
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure()
+
+    # 시험 요청 하나만 통과, 결과가 기록될 때까지 나머지는 차단
+    assert not breaker.blocking()
+    assert breaker.allow_request()
+    assert breaker.state == "half_open"
+    assert breaker.blocking()
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow_request() and breaker.allow_request()
+    print("✅ half_open에서 시험 요청 하나만 허용")
+
+def test_guard_records_success_after_trial():
+    print("=== guard 성공 기록 테스트 ===")
+
+    pool = MongoPool()
+    pool.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    pool.breaker.record_failure()
+
+    # 시험 요청이 성공하면 closed로 복구
+    with pool.guard():
+        assert pool.breaker.state == "half_open"
+    assert pool.breaker.state == "closed"
+
+    # 연결과 무관한 오류는 시험 요청 자리만 반환
+    pool.breaker.record_failure()
+    try:
+        with pool.guard():
+            raise KeyError("problemId")
+    except KeyError:
+        pass
+    assert pool.breaker.state == "half_open"
+    assert pool.breaker.allow_request()
+    print("✅ guard가 시험 요청 결과를 회로 차단기에 기록")
+
+if __name__ == "__main__":
+    test_circuit_breaker_transitions()
+    test_circuit_breaker_blocks_while_open()
+    test_half_open_allows_single_trial_request()
+    test_guard_records_success_after_trial()
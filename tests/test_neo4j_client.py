@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""run_cypher 읽기 캐시 테스트 (Neo4j 없이 실행 계층만 대체)"""
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from neo4j_client import (CypherQueryCache, GRAPH_VERSION_QUERY, Neo4jClient, is_precedes_type, is_write_query,
+                          make_query_key)
+
+class FakeNeo4jClient(Neo4jClient):
+    """_execute 호출을 기록하고 고정 결과를 돌려주는 클라이언트"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = []
+        self.graph_version = 1
+
+    def _execute(self, query, params, read):
+        if query == GRAPH_VERSION_QUERY:
+            return [{"version": self.graph_version}]
+        self.calls.append((query, params, read))
+        return [{"concept": "1.4 절댓값", "params": dict(params or {})}]
+
+def test_query_key_normalization():
+    print("=== 쿼리 키 정규화 테스트 ===")
+
+    a = make_query_key("MATCH (c:Concept {concept: $name})\n    RETURN c", {"name": "1.4 절댓값", "limit": 5})
+    b = make_query_key("MATCH (c:Concept {concept: $name}) RETURN c", {"limit": 5, "name": "1.4 절댓값"})
+    assert a == b
+    assert is_write_query("MATCH (a), (b) MERGE (a)-[:PRECEDES]->(b)")
+    assert not is_write_query("MATCH (c:Concept) RETURN c SKIP 10")
+    print("✅ 공백/파라미터 순서가 달라도 같은 키")
+
+def test_read_cache_and_invalidation():
+    print("=== run_cypher 읽기 캐시 테스트 ===")
+
+    client = FakeNeo4jClient(version_check_interval=0)
+    query = "MATCH (c:Concept {concept: $name}) RETURN c.concept as concept"
+    first = client.run_cypher(query, {"name": "1.4 절댓값"})
+    first[0]["concept"] = "수정됨"
+    second = client.run_cypher(query, {"name": "1.4 절댓값"})
+    assert len(client.calls) == 1
+    assert second[0]["concept"] == "1.4 절댓값"
+
+    client.run_cypher(query, {"name": "1.3 정수와 유리수"})
+    assert len(client.calls) == 2
+
+    # 그래프 버전 스탬프가 바뀌면 다시 조회
+    client.graph_version = 2
+    client.run_cypher(query, {"name": "1.4 절댓값"})
+    assert len(client.calls) == 3
+
+    # 쓰기 쿼리는 캐시하지 않고 캐시를 비움
+    client.run_cypher("MATCH (c:Concept {concept: $name}) SET c.grade = 1", {"name": "1.4 절댓값"})
+    assert client.calls[-1][2] is False
+    client.run_cypher(query, {"name": "1.4 절댓값"})
+    assert len(client.calls) == 5
+    print(f"📊 {client.cache.get_stats()}")
+    print("✅ 캐시 적중 / 버전 무효화 / 쓰기 무효화 정상")
+
+def test_cache_eviction():
+    print("=== 캐시 크기 제한 테스트 ===")
+
+    cache = CypherQueryCache(max_items=2, ttl=60)
+    for i in range(3):
+        cache.set(f"q{i}", [{"i": i}])
+    assert cache.get("q0") is None
+    assert cache.get("q2") == [{"i": 2}]
+    assert cache.get_stats()["evictions"] == 1
+
+    expired = CypherQueryCache(max_items=2, ttl=-1)
+    expired.set("q", [])
+    assert expired.get("q") is None
+    print("✅ LRU / TTL 만료 정상")
+
+def test_precedes_type_ignores_case():
+    print("=== PRECEDES 관계 타입 비교 테스트 ===")
+
+    # rebuild_neo4j(소문자 CSV)와 sync_neo4j가 같은 관계를 선택해야 함
+    assert is_precedes_type("precedes") and is_precedes_type("PRECEDES") and is_precedes_type(" Precedes ")
+    assert not is_precedes_type("related") and not is_precedes_type(None)
+    print("✅ 대소문자와 관계없이 같은 관계 선택")
+
+def test_write_detection_ignores_names_and_literals():
+    print("=== 쓰기 쿼리 판별 테스트 ===")
+
+    # 속성/레이블/파라미터/맵 키/문자열/주석 안의 키워드는 읽기 쿼리
+    assert not is_write_query("MATCH (n) RETURN n.set")
+    assert not is_write_query("MATCH (n:Set) RETURN n")
+    assert not is_write_query("MATCH (n {name: 'create set'}) RETURN n, {delete: $delete}")
+    assert not is_write_query("MATCH (n) // delete later\nRETURN n.`create`")
+    # 실제 쓰기 절
+    assert is_write_query("MATCH (n) SET n.x = 1")
+    assert is_write_query("MATCH (n) DETACH DELETE n")
+    print("✅ 키워드가 절로 쓰일 때만 쓰기 쿼리로 판별")
+
+if __name__ == "__main__":
+    test_query_key_normalization()
+    test_read_cache_and_invalidation()
+    test_cache_eviction()
+    test_precedes_type_ignores_case()
+    test_write_detection_ignores_names_and_literals()
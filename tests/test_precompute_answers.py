@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""AI 응답 사전 생성 배치 체크포인트/재개/저장 테스트"""
+
+import os
+import sys
+import json
+import asyncio
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from llm_cache import make_cache_key
+from precompute_answers import AnswerPrecomputer
+
+PROMPTS = {"solve_prompt_v1": "solve prompt", "concept_prompt_v1": "concept prompt"}
+
+class FakeCollection:
+    def __init__(self, docs=None):
+        self.docs = docs or []
+
+    def find(self, query=None, projection=None):
+        return iter(list(self.docs))
+
+    def create_index(self, *args, **kwargs):
+        pass
+
+class FakeDB:
+    def __init__(self):
+        self.problems = FakeCollection([
+            {"problemId": f"P{i}", "unitId": "U1", "content": {"question": f"문제 {i}"}} for i in range(1, 4)
+        ])
+        self.unit = FakeCollection([{"unitId": "U1", "title": {"ko": "정수와 유리수"}}])
+        self.precomputed_answers = FakeCollection()
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+class RecordingPrecomputer(AnswerPrecomputer):
+    """MongoDB bulk_write 대신 저장된 문서를 기록"""
+
+    def __init__(self, checkpoint_path, saved, fail_saves=False, fail_problems=(), **kwargs):
+        super().__init__(list(PROMPTS), concurrency=2, batch_size=1, checkpoint_path=checkpoint_path,
+                         generate=self.fake_generate, model="gpt-test", **kwargs)
+        self.db = FakeDB()
+        self.prompt_texts = dict(PROMPTS)
+        self.saved = saved
+        self.fail_saves = fail_saves
+        self.fail_problems = set(fail_problems)
+        self.calls = []
+
+    async def fake_generate(self, prompt_name, prompt_text, problem, question):
+        self.calls.append((problem["problemId"], prompt_name, question))
+        if problem["problemId"] in self.fail_problems:
+            raise RuntimeError("LLM 요청 실패")
+        return json.dumps({"answer": f"{problem['problemId']} {prompt_name}"})
+
+    def save(self, docs):
+        if self.fail_saves:
+            raise RuntimeError("bulk_write 실패")
+        self.saved.extend(docs)
+
+def run_batch(precomputer):
+    precomputer.prepare()
+    return asyncio.run(precomputer.run())
+
+def test_resume_after_interrupted_run():
+    print("=== 중단 후 재개 테스트 ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint = os.path.join(tmp, "checkpoint.jsonl")
+        saved = []
+
+        # 첫 실행: P3 요청이 실패해 중단된 것처럼 체크포인트에 P1, P2만 남음
+        first = RecordingPrecomputer(checkpoint, saved, fail_problems={"P3"})
+        assert not run_batch(first)
+        with open(checkpoint, encoding="utf-8") as f:
+            done = {(entry["problemId"], entry["prompt"]) for entry in map(json.loads, f)}
+        assert done == {(p, prompt) for p in ("P1", "P2") for prompt in PROMPTS}
+
+        # 재개: 체크포인트 항목은 건너뛰고 실패한 P3만 다시 생성
+        second = RecordingPrecomputer(checkpoint, saved)
+        assert run_batch(second)
+        assert {(problem_id, prompt) for problem_id, prompt, _ in second.calls} == {("P3", p) for p in PROMPTS}
+        assert second.stats["skipped"] == 4 and second.stats["generated"] == 2
+
+        # fresh 실행은 체크포인트를 지우고 처음부터 생성
+        fresh = RecordingPrecomputer(checkpoint, [], resume=False)
+        assert run_batch(fresh)
+        assert fresh.stats["generated"] == 6
+    print("✅ 체크포인트 이후 항목만 다시 생성")
+
+def test_failed_flush_is_retried_next_run():
+    print("=== 저장 실패 재시도 테스트 ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint = os.path.join(tmp, "checkpoint.jsonl")
+
+        # 저장에 실패하면 체크포인트를 남기지 않음
+        failing = RecordingPrecomputer(checkpoint, [], fail_saves=True)
+        assert not run_batch(failing)
+        assert failing.stats["unsaved"] == 6
+        assert not os.path.exists(checkpoint)
+
+        # 다음 실행에서 전체 다시 생성
+        saved = []
+        retry = RecordingPrecomputer(checkpoint, saved)
+        assert run_batch(retry)
+        assert retry.stats["generated"] == 6 and retry.stats["skipped"] == 0
+        assert len({doc["key"] for doc in saved}) == len(saved)
+    print("✅ 저장 실패 항목은 다음 실행에서 재생성")
+
+def test_concept_answers_keyed_by_requested_concept():
+    print("=== 개념 설명 키 테스트 ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        saved = []
+        precomputer = RecordingPrecomputer(os.path.join(tmp, "checkpoint.jsonl"), saved)
+        assert run_batch(precomputer)
+
+    # 개념 설명은 단원 제목(concept_name)으로 생성하고 빈 입력은 별칭으로 저장
+    assert ("P1", "concept_prompt_v1", "정수와 유리수") in precomputer.calls
+    keys = {doc["key"] for doc in saved}
+    for concept_name in ("정수와 유리수", "  정수와 유리수? ", ""):
+        assert make_cache_key("P1", "concept_prompt_v1", PROMPTS["concept_prompt_v1"], "gpt-test", concept_name) in keys
+    print("✅ 실제 요청의 concept_name으로 사전 생성 응답 조회 가능")
+
+if __name__ == "__main__":
+    test_resume_after_interrupted_run()
+    test_failed_flush_is_retried_next_run()
+    test_concept_answers_keyed_by_requested_concept()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""여러 개념 선행/후행 개념 일괄 조회 테스트"""
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from concept_graph import ConceptGraphSnapshot
+from prerequisite_lookup import lookup_prerequisites
+from test_concept_graph import EDGES, NODES, FakeRunCypher
+
+def test_snapshot_batch_lookup():
+    print("=== 스냅샷 일괄 조회 테스트 ===")
+
+    graph = ConceptGraphSnapshot.from_run_cypher(FakeRunCypher(NODES, EDGES))
+    found = lookup_prerequisites(["1.4 절댓값", "1.5 정수와 유리수의 덧셈, 뺄셈", "없는 개념", "1.4 절댓값"],
+                                 max_hops=2, snapshot=graph)
+
+    assert list(found) == ["1.4 절댓값", "1.5 정수와 유리수의 덧셈, 뺄셈"]
+    abs_value = found["1.4 절댓값"]
+    assert [n["concept"] for n in abs_value["predecessors"]] == ["1.3 정수와 유리수"]
+    assert [n["concept"] for n in abs_value["successors"]] == ["1.5 정수와 유리수의 덧셈, 뺄셈"]
+    assert [(n["concept"], n["hops"]) for n in abs_value["ancestors"]] == [
+        ("1.3 정수와 유리수", 1), ("1.1 소인수분해", 2)
+    ]
+    addition = found["1.5 정수와 유리수의 덧셈, 뺄셈"]
+    assert {n["concept"] for n in addition["predecessors"]} == {"1.3 정수와 유리수", "1.4 절댓값"}
+    print("✅ 개념 2개의 관계를 스냅샷 한 번으로 조회")
+
+def test_cypher_batch_lookup():
+    print("=== UNWIND 쿼리 일괄 조회 테스트 ===")
+
+    calls = []
+
+    def run_cypher(query, params=None):
+        calls.append((query, params))
+        return [{
+            "concept": "1.4 절댓값", "unit": "1단원", "grade": 1,
+            "predecessors": [{"concept": "1.3 정수와 유리수", "unit": "1단원", "grade": 1}],
+            "successors": [],
+            "ancestors": [
+                {"concept": "1.1 소인수분해", "unit": "1단원", "grade": 1, "hops": 2},
+                {"concept": "1.3 정수와 유리수", "unit": "1단원", "grade": 1, "hops": 1},
+            ],
+        }]
+
+    found = lookup_prerequisites(["1.4 절댓값", "1.6 정수와 유리수의 곱셈, 나눗셈"], max_hops=3, run_cypher=run_cypher)
+    assert len(calls) == 1
+    assert "PRECEDES*1..3" in calls[0][0]
+    assert calls[0][1] == {"names": ["1.4 절댓값", "1.6 정수와 유리수의 곱셈, 나눗셈"]}
+    assert [n["hops"] for n in found["1.4 절댓값"]["ancestors"]] == [1, 2]
+
+    for bad_hops in (0, 11):
+        try:
+            lookup_prerequisites(["1.4 절댓값"], max_hops=bad_hops, run_cypher=run_cypher)
+            assert False, "max_hops 범위 검증 실패"
+        except ValueError:
+            pass
+    print("✅ 개념 여러 개를 쿼리 한 번으로 조회")
+
+if __name__ == "__main__":
+    test_snapshot_batch_lookup()
+    test_cypher_batch_lookup()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""문제 데이터 병렬 일괄 upsert 테스트 (MongoDB 없이 배치 구성과 오류 요약 확인)"""
+
+import json
+import os
+import sys
+import threading
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from problem_bulk_loader import bulk_upsert, parse_problem_line, summarize_errors, validate_parallel
+
+def problem(i, **overrides):
+    doc = {"problemId": f"P{i}", "unitId": "unit_01_01", "grade": "1", "chapter": 1, "context": {},
+           "cognitiveType": "이해", "level": "중", "diagnosticTest": 0, "type": "객관식", "tags": ["정수"],
+           "content": {"korean": {"stem": "1+1"}}, "correctAnswer": 2, "explanation": {},
+           "createdAt": "2025-08-28T06:14:18Z", "updatedAt": "2025-08-28T06:14:18Z"}
+    doc.update(overrides)
+    return doc
+
+class BulkWriteFailure(Exception):
+    def __init__(self, details):
+        super().__init__("batch op errors occurred")
+        self.details = details
+
+class FakeCollection:
+    def __init__(self, fail_keys=()):
+        self.docs = {}
+        self.batches = []
+        self.fail_keys = set(fail_keys)
+        self.lock = threading.Lock()
+
+    def bulk_write(self, ops, ordered=True):
+        assert not ordered
+        with self.lock:
+            self.batches.append(len(ops))
+        upserted = matched = 0
+        errors = []
+        for index, (key, doc, overwrite) in enumerate(ops):
+            if doc["problemId"] in self.fail_keys:
+                errors.append({"index": index, "errmsg": "E11000 duplicate key"})
+                continue
+            with self.lock:
+                if doc["problemId"] in self.docs:
+                    matched += 1
+                    if overwrite:
+                        self.docs[doc["problemId"]] = doc
+                else:
+                    upserted += 1
+                    self.docs[doc["problemId"]] = doc
+        if errors:
+            raise BulkWriteFailure({"writeErrors": errors, "nUpserted": upserted, "nMatched": matched, "nModified": 0})
+        return type("Result", (), {"upserted_count": upserted, "matched_count": matched, "modified_count": matched})()
+
+def make_op(key, doc, overwrite):
+    return key, doc, overwrite
+
+def test_parallel_validation():
+    print("=== 프로세스 풀 검증 테스트 ===")
+
+    lines = [json.dumps(problem(i), ensure_ascii=False) for i in range(50)]
+    lines[3] = "{broken"
+    lines[7] = json.dumps({"problemId": "P7"})
+    lines[9] = json.dumps(problem(9, grade="일"), ensure_ascii=False)
+    items = [(f"라인 {n}", line) for n, line in enumerate(lines, 1)]
+
+    docs, errors = validate_parallel(items, parse_problem_line, workers=2, chunk_size=8)
+    assert (docs, errors) == validate_parallel(items, parse_problem_line, workers=1)
+    assert len(docs) == 47 and docs[0]["grade"] == 1 and docs[0]["correctAnswer"] == "2"
+    assert docs[0]["createdAt"].year == 2025
+    assert [location for location, _ in errors] == ["라인 4", "라인 8", "라인 10"]
+    print(f"⚠️ 검증 오류: {errors}")
+    print("✅ 병렬/순차 결과 일치, 줄 번호별 오류 수집")
+
+def test_bulk_upsert_batches():
+    print("=== 일괄 upsert 배치 테스트 ===")
+
+    collection = FakeCollection(fail_keys={"P5"})
+    collection.docs["P0"] = {"problemId": "P0", "old": True}
+    docs = [parse_problem_line(json.dumps(problem(i))) for i in range(25)] + [parse_problem_line(json.dumps(problem(1)))]
+
+    report = bulk_upsert(collection, docs, batch_size=10, workers=3, overwrite=False, make_op=make_op)
+    print(f"📊 {report}")
+    assert sorted(collection.batches) == [5, 10, 10]
+    assert report["total"] == 25 and report["duplicates"] == 1
+    assert report["upserted"] == 23 and report["matched"] == 1
+    assert report["errors"] == [("P5", "E11000 duplicate key")]
+    assert collection.docs["P0"] == {"problemId": "P0", "old": True}
+
+    summary = summarize_errors([("라인 1", "a"), ("라인 2", "b"), ("라인 3", "a")])
+    assert summary == [("a", 2, ["라인 1", "라인 3"]), ("b", 1, ["라인 2"])]
+    print("✅ 배치 분할 / 입력 중복 제거 / 기존 문서 유지 / 쓰기 오류 매핑")
+
+if __name__ == "__main__":
+    test_parallel_validation()
+    test_bulk_upsert_batches()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""문제 문서 캐시 다건 조회/무효화 테스트"""
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from problem_cache import ProblemCache
+
+class FakeProblemCollection:
+    """$or + $in 쿼리만 처리하는 가짜 problem 컬렉션"""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = 0
+
+    def find(self, query):
+        self.queries += 1
+        ids_by_field = {list(cond.keys())[0]: list(cond.values())[0]["$in"] for cond in query["$or"]}
+        return [doc for doc in self.docs
+                if any(doc.get(field) in ids for field, ids in ids_by_field.items())]
+
+def test_problem_cache_batch():
+    print("=== 문제 캐시 다건 조회 테스트 ===")
+
+    collection = FakeProblemCollection([
+        {"_id": "oid-1", "problem_id": "P001", "content": {"question": "1+1"}},
+        {"_id": "oid-2", "problem_id": "P002", "content": {"question": "2+2"}},
+        {"_id": "P003", "content": {"question": "3+3"}},
+    ])
+    cache = ProblemCache(collection)
+
+    # problem_id, _id 혼합 조회도 쿼리 한 번
+    found = cache.get_many(["P001", "P002", "P003", "P404"])
+    print(f"📄 조회 결과: {sorted(found.keys())}")
+    assert sorted(found.keys()) == ["P001", "P002", "P003"]
+    assert collection.queries == 1
+
+    # 두 번째 조회는 캐시에서 처리
+    assert cache.get("P001")["content"]["question"] == "1+1"
+    assert collection.queries == 1
+
+    # 무효화 후에는 다시 조회
+    cache.invalidate(["P001"])
+    cache.get("P001")
+    assert collection.queries == 2
+
+    print(f"📊 캐시 통계: {cache.get_stats()}")
+    print("✅ 문제 캐시 정상")
+
+if __name__ == "__main__":
+    test_problem_cache_batch()
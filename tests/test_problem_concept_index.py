@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""문제 → 단원 → 개념 해석 인덱스 테스트"""
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from problem_concept_index import ProblemConceptIndex, ProblemConceptIndexStore, extract_unit_code
+
+CONCEPT_NAMES = ["1.3 정수와 유리수", "1.4 절댓값", "1.5 정수와 유리수의 덧셈, 뺄셈"]
+UNITS = [
+    {"_id": 1, "unitId": "U001", "title": {"ko": "정수와 유리수"}, "grade": 1, "chapter": 1, "orderInGrade": 3},
+    {"_id": 2, "unitId": "U002", "title": {"ko": "절대값"}, "grade": 1, "chapter": 1, "orderInGrade": 4},
+    {"_id": 3, "unitId": "U003", "title": {"ko": "없는 단원"}, "grade": 3, "chapter": 9, "orderInGrade": 9},
+]
+PROBLEMS = [
+    {"_id": 1, "problemId": "P001", "unitId": "U001"},
+    {"_id": 2, "problemId": "P002", "unitId": "U002"},
+    {"_id": 3, "problemId": "P003", "unitId": "U003"},
+]
+CONCEPTS = [{"_id": 1, "conceptId": "C001", "unitId": "U001"}]
+
+class FakeCollection:
+    """find / find_one / estimated_document_count만 흉내내는 컬렉션"""
+
+    def __init__(self, docs):
+        self.docs = list(docs)
+        self.find_calls = 0
+
+    def find(self, query=None, projection=None):
+        self.find_calls += 1
+        return [dict(doc) for doc in self.docs]
+
+    def find_one(self, query=None, projection=None, sort=None):
+        field = sort[0][0] if sort else "_id"
+        docs = [doc for doc in self.docs if field in doc]
+        return max(docs, key=lambda d: d[field]) if docs else None
+
+    def estimated_document_count(self):
+        return len(self.docs)
+
+class FakeDB:
+    def __init__(self):
+        self.problem = FakeCollection(PROBLEMS)
+        self.unit = FakeCollection(UNITS)
+        self.concept = FakeCollection(CONCEPTS)
+
+def test_resolve_many():
+    print("=== 답안 목록 일괄 해석 테스트 ===")
+
+    index = ProblemConceptIndex(PROBLEMS, UNITS, CONCEPTS, CONCEPT_NAMES)
+    resolved = index.resolve_many(["P001", "P002", "P003", "1.5-017", "P001"])
+    for item in resolved:
+        print(f"  - {item['problemId']} → {item['concept']} ({item['source']})")
+
+    # 제목 일치
+    assert resolved[0]["concept"] == "1.3 정수와 유리수" and resolved[0]["conceptIds"] == ["C001"]
+    # 제목이 달라도 챕터.순서 단원 코드로 연결
+    assert resolved[1]["concept"] == "1.4 절댓값"
+    # 연결 가능한 개념 없음
+    assert resolved[2]["concept"] is None and resolved[2]["unitId"] == "U003"
+    # 문제 ID의 단원 코드로 대체 해석
+    assert resolved[3]["concept"] == "1.5 정수와 유리수의 덧셈, 뺄셈" and resolved[3]["source"] == "problem_code"
+    assert resolved[4] == resolved[0]
+    assert extract_unit_code("1.5 정수와 유리수의 덧셈, 뺄셈") == "1.5"
+    print("✅ 제목 / 단원 코드 / 문제 ID 코드 순서로 해석")
+
+def test_store_refresh():
+    print("=== 원본 변경 시 재컴파일 테스트 ===")
+
+    db = FakeDB()
+    store = ProblemConceptIndexStore(db, lambda: CONCEPT_NAMES, refresh_interval=0)
+    first = store.get()
+    assert store.get() is first
+    assert db.problem.find_calls == 1
+
+    db.problem.docs.append({"_id": 4, "problemId": "P004", "unitId": "U002"})
+    second = store.get()
+    assert second is not first
+    assert second.resolve("P004")["concept"] == "1.4 절댓값"
+
+    # _id와 문서 수를 유지한 내용 변경 (해시 비교 재적재가 syncedAt만 갱신)
+    db.unit.docs[1] = {**db.unit.docs[1], "title": {"ko": "1.5 정수와 유리수의 덧셈, 뺄셈"}, "syncedAt": 1}
+    third = store.get()
+    assert third is not second
+    assert third.resolve("P004")["concept"] == "1.5 정수와 유리수의 덧셈, 뺄셈"
+
+    store.invalidate()
+    assert store.get() is not third
+    print("✅ 문서 추가 / 내용 변경 / 명시적 무효화 시 재컴파일")
+
+if __name__ == "__main__":
+    test_resolve_many()
+    test_store_refresh()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""추천 학습 경로 메모이제이션 테스트"""
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from recommended_path_cache import RecommendedPathCache, accuracy_band, path_signature
+
+def test_signature():
+    print("=== 시그니처 정규화 테스트 ===")
+
+    assert accuracy_band(65.0) == 60 and accuracy_band(69.99) == 60
+    assert accuracy_band(100.0) == 90 and accuracy_band(-5) == 0 and accuracy_band(None) is None
+    assert path_signature(["함수", "문자와 식", "함수"], 62.5, 3) == path_signature(["문자와 식", "함수"], 68.0, 3)
+    assert path_signature(["함수"], 62.5, 3) != path_signature(["함수"], 72.5, 3)
+    assert path_signature(["함수"], 62.5, 3) != path_signature(["함수"], 62.5, 4)
+    print("✅ 순서/중복 무시, 정답률 구간과 그래프 버전 구분")
+
+def test_lru_and_hit_rate():
+    print("=== LRU 제거 및 적중률 테스트 ===")
+
+    cache = RecommendedPathCache(max_items=2)
+    computed = []
+
+    def compute(name):
+        def run():
+            computed.append(name)
+            return [{"unitTitle": name, "priority": 1}]
+        return run
+
+    first = cache.get_or_compute("a", compute("a"))
+    first[0]["priority"] = 99
+    assert cache.get_or_compute("a", compute("a")) == [{"unitTitle": "a", "priority": 1}]
+    cache.get_or_compute("b", compute("b"))
+    cache.get_or_compute("a", compute("a"))
+    cache.get_or_compute("c", compute("c"))
+    cache.get_or_compute("b", compute("b"))
+
+    stats = cache.get_stats()
+    print(f"📊 {stats}")
+    assert computed == ["a", "b", "c", "b"]
+    assert stats["hits"] == 2 and stats["misses"] == 4 and stats["evictions"] == 2
+    assert stats["items"] == 2 and stats["hit_rate"] == round(2 / 6, 4)
+    print("✅ 최근에 쓰지 않은 항목부터 제거, 반환값 수정이 캐시에 영향 없음")
+
+if __name__ == "__main__":
+    test_signature()
+    test_lru_and_hit_rate()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Neo4j 증분 동기화 diff 계산 테스트"""
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from sync_neo4j import GraphDiff
+
+LIVE_NODES = [
+    {"concept": "1.1 소인수분해", "unit": "1단원", "grade": 1},
+    {"concept": "1.3 정수와 유리수", "unit": "1단원", "grade": 1},
+    {"concept": "1.4 절댓값", "unit": "2단원", "grade": 1},
+    {"concept": "9.9 삭제될 개념", "unit": "9단원", "grade": 3},
+]
+LIVE_EDGES = [
+    ("1.1 소인수분해", "1.3 정수와 유리수"),
+    ("1.1 소인수분해", "1.3 정수와 유리수"),
+    ("1.1 소인수분해", "1.4 절댓값"),
+    ("1.4 절댓값", "9.9 삭제될 개념"),
+]
+
+def test_graph_diff():
+    print("=== 그래프 diff 계산 테스트 ===")
+
+    # pandas에서 읽은 값처럼 grade가 float인 경우도 같은 값으로 취급
+    desired_nodes = [
+        {"concept": "1.1 소인수분해", "unit": "1단원", "grade": 1.0},
+        {"concept": "1.3 정수와 유리수", "unit": "1단원", "grade": 1},
+        {"concept": "1.4 절댓값", "unit": "1단원", "grade": 1},
+        {"concept": "1.5 정수와 유리수의 덧셈, 뺄셈", "unit": "1단원", "grade": float("nan")},
+    ]
+    desired_edges = [
+        ("1.1 소인수분해", "1.3 정수와 유리수"),
+        ("1.3 정수와 유리수", "1.4 절댓값"),
+        ("1.4 절댓값", "1.5 정수와 유리수의 덧셈, 뺄셈"),
+        ("1.4 절댓값", "없는 개념"),
+    ]
+
+    diff = GraphDiff(desired_nodes, desired_edges, LIVE_NODES, LIVE_EDGES)
+    print(f"📊 {diff.summary()}")
+
+    assert diff.nodes_added == ["1.5 정수와 유리수의 덧셈, 뺄셈"]
+    assert diff.nodes_updated == ["1.4 절댓값"]
+    assert diff.nodes_removed == ["9.9 삭제될 개념"]
+    assert {"concept": "1.5 정수와 유리수의 덧셈, 뺄셈", "unit": "1단원", "grade": None} in diff.node_rows
+    assert diff.edges_added == [("1.3 정수와 유리수", "1.4 절댓값"), ("1.4 절댓값", "1.5 정수와 유리수의 덧셈, 뺄셈")]
+    # 삭제될 노드의 관계는 DETACH DELETE에 맡김
+    assert diff.edges_removed == [("1.1 소인수분해", "1.4 절댓값")]
+    assert diff.edges_duplicated == [("1.1 소인수분해", "1.3 정수와 유리수")]
+    print("✅ 추가/수정/삭제/중복 관계 계산 정상")
+
+def test_graph_diff_noop():
+    print("=== 변경 없는 그래프 diff 테스트 ===")
+
+    live_edges = list(dict.fromkeys(LIVE_EDGES))
+    diff = GraphDiff(LIVE_NODES, live_edges, LIVE_NODES, live_edges)
+    assert diff.is_empty()
+    print("✅ 변경 사항 없음")
+
+if __name__ == "__main__":
+    test_graph_diff()
+    test_graph_diff_noop()